@@ -0,0 +1,63 @@
+"""Compare the cost to the caller of synchronous and queued logging.
+
+Records are written as JSON to a file in a temporary directory, so the
+application log is not touched.
+
+    uv run benchmarks/bench_logging.py [records]
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from directors_reimbursements import logger
+from directors_reimbursements.async_log import (
+    disable_async_logging, enable_async_logging, json_formatter)
+
+RECORDS = 20_000
+
+
+def _log_to(path: Path) -> logging.Handler:
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    handler = logging.FileHandler(path, encoding='utf-8')
+    handler.setFormatter(json_formatter())
+    root_logger.addHandler(handler)
+    return handler
+
+
+def _time_calls(records: int) -> float:
+    start = time.perf_counter()
+    for index in range(records):
+        logger.info('Email sent', recipient=f'director{index}@example.com')
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else RECORDS
+    disable_async_logging()
+    with tempfile.TemporaryDirectory() as directory:
+        handler = _log_to(Path(directory, 'sync.log'))
+        sync_time = _time_calls(records)
+        handler.close()
+
+        handler = _log_to(Path(directory, 'async.log'))
+        async_logging = enable_async_logging(queue_size=records)
+        async_time = _time_calls(records)
+        start = time.perf_counter()
+        disable_async_logging()
+        drain_time = time.perf_counter() - start
+        handler.close()
+
+    print(f'{records} records')
+    print(f'synchronous: {sync_time / records * 1e6:8.2f} us per call')
+    print(f'queued:      {async_time / records * 1e6:8.2f} us per call '
+          f'(drained in {drain_time:.3f} s, '
+          f'{async_logging.handler.dropped} dropped)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+"""An append-only, compressed archive of every statement issued to file.
+
+Each email, and each statement document attached to it, is appended to
+``statements.gz`` as a gzip member of its own; the file as a whole is
+still a valid gzip stream. A SQLite index records where each member is,
+by director, email address, period and run, so any past statement is
+read back with one seek. Search it with:
+
+    python -m directors_reimbursements.archive --director AB --period 2025
+"""
+
+import argparse
+import gzip
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+from directors_reimbursements.constants import (
+    USER_DATA_DIR, ARCHIVE_DIR, ARCHIVE_FILE, ARCHIVE_INDEX_FILE)
+from directors_reimbursements.process import Director
+from directors_reimbursements import logger
+
+COMPRESS_LEVEL = 9
+PERIOD_FORMAT = '%Y-%m-%d'
+RUN_FORMAT = '%Y-%m-%dT%H:%M:%S'
+LIKE_ESCAPE = '!'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS statements (
+    id INTEGER PRIMARY KEY,
+    run_at TEXT NOT NULL,
+    period TEXT NOT NULL,
+    initials TEXT NOT NULL,
+    name TEXT NOT NULL,
+    username TEXT,
+    email TEXT,
+    dollars REAL NOT NULL,
+    text_offset INTEGER NOT NULL,
+    text_length INTEGER NOT NULL,
+    document_name TEXT,
+    document_offset INTEGER,
+    document_length INTEGER
+);
+CREATE INDEX IF NOT EXISTS statements_initials ON statements (initials);
+CREATE INDEX IF NOT EXISTS statements_username ON statements (username);
+CREATE INDEX IF NOT EXISTS statements_email ON statements (email);
+CREATE INDEX IF NOT EXISTS statements_period ON statements (period);
+CREATE INDEX IF NOT EXISTS statements_run_at ON statements (run_at);
+"""
+
+COLUMNS = ('id', 'run_at', 'period', 'initials', 'name', 'username',
+           'email', 'dollars', 'text_offset', 'text_length',
+           'document_name', 'document_offset', 'document_length')
+
+
+class ArchivedStatement(NamedTuple):
+    """An index entry: who a statement was for and where it is stored."""
+    id: int
+    run_at: str
+    period: str
+    initials: str
+    name: str
+    username: str | None
+    email: str | None
+    dollars: float
+    text_offset: int
+    text_length: int
+    document_name: str | None
+    document_offset: int | None
+    document_length: int | None
+
+    def __str__(self) -> str:
+        return (f'{self.run_at}  {self.period}  {self.initials:<4} '
+                f'{self.name:<20} {self.email or "":<30} '
+                f'BBO${self.dollars:g}')
+
+
+class StatementArchive():
+    """The archive file and its index, in one directory."""
+    def __init__(self,
+                 directory: Path = Path(USER_DATA_DIR, ARCHIVE_DIR)) -> None:
+        self.directory = Path(directory)
+        self.path = Path(self.directory, ARCHIVE_FILE)
+        self.index_path = Path(self.directory, ARCHIVE_INDEX_FILE)
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def add_run(self, start_date: datetime,
+                statements: list[tuple[Director, str, tuple | None]],
+                run_at: datetime | None = None) -> int:
+        """Append one run's (director, email text, (file name, document))
+        statements; return the number added."""
+        run_at = (run_at or datetime.now()).strftime(RUN_FORMAT)
+        period = start_date.strftime(PERIOD_FORMAT)
+        rows = []
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'ab') as f_archive:
+                for director, text, document in statements:
+                    text_member = _append(f_archive, text.encode('utf-8'))
+                    document_name, document_member = None, (None, None)
+                    if document:
+                        document_name = document[0]
+                        document_member = _append(f_archive, document[1])
+                    rows.append((
+                        run_at, period, director.initials, director.name,
+                        director.username, director.email,
+                        float(director.dollars),
+                        *text_member, document_name, *document_member))
+                f_archive.flush()
+                os.fsync(f_archive.fileno())
+            # The members are on disk before they are indexed, so an
+            # interrupted run leaves at worst unindexed bytes behind.
+            with closing(self._connect()) as connection, connection:
+                connection.executemany(
+                    f'INSERT INTO statements ({", ".join(COLUMNS[1:])}) '
+                    f'VALUES ({", ".join("?" * (len(COLUMNS) - 1))})',
+                    rows)
+        logger.info(f'Archived {len(rows)} statements for {period}')
+        return len(rows)
+
+    def find(self, director: str = '', email: str = '', period: str = '',
+             run: str = '', exact: bool = False) -> list[ArchivedStatement]:
+        """Return the statements matching every filter given, oldest first.
+
+        director matches initials or username exactly, or any part of the
+        name, so a short director (e.g. 'an') can match many names; with
+        exact it must match the whole name. period and run match a
+        prefix, e.g. '2025' or '2025-03'. '%' and '_' match themselves.
+        """
+        if not self.index_path.is_file():
+            return []
+        clauses, params = [], []
+        if director:
+            name_clause = ('name = ? COLLATE NOCASE' if exact
+                           else f"name LIKE ? ESCAPE '{LIKE_ESCAPE}'")
+            clauses.append(
+                '(initials = ? COLLATE NOCASE OR username = ? COLLATE NOCASE'
+                f' OR {name_clause})')
+            params += [director, director,
+                       director if exact else f'%{_like(director)}%']
+        if email:
+            clauses.append('email = ? COLLATE NOCASE')
+            params.append(email)
+        if period:
+            clauses.append(f"period LIKE ? ESCAPE '{LIKE_ESCAPE}'")
+            params.append(f'{_like(period)}%')
+        if run:
+            clauses.append(f"run_at LIKE ? ESCAPE '{LIKE_ESCAPE}'")
+            params.append(f'{_like(run)}%')
+        where = f'WHERE {" AND ".join(clauses)}' if clauses else ''
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                f'SELECT {", ".join(COLUMNS)} FROM statements {where} '
+                'ORDER BY run_at, id', params).fetchall()
+        return [ArchivedStatement(*row) for row in rows]
+
+    def text(self, entry: ArchivedStatement) -> str:
+        """Return the email text of an archived statement."""
+        return self._read(entry.text_offset, entry.text_length).decode(
+            'utf-8')
+
+    def document(self, entry: ArchivedStatement) -> bytes | None:
+        """Return the statement document attached to the email, if any."""
+        if entry.document_offset is None:
+            return None
+        return self._read(entry.document_offset, entry.document_length)
+
+    def _read(self, offset: int, length: int) -> bytes:
+        with open(self.path, 'rb') as f_archive:
+            f_archive.seek(offset)
+            return gzip.decompress(f_archive.read(length))
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.index_path)
+        if not self._schema_ready:
+            connection.executescript(SCHEMA)
+            self._schema_ready = True
+        return connection
+
+
+def _like(text: str) -> str:
+    """Escape text so LIKE matches it literally."""
+    for character in (LIKE_ESCAPE, '%', '_'):
+        text = text.replace(character, LIKE_ESCAPE + character)
+    return text
+
+
+def _append(f_archive: object, data: bytes) -> tuple[int, int]:
+    """Write data as a gzip member; return its (offset, length)."""
+    member = gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+    offset = f_archive.tell()
+    f_archive.write(member)
+    return offset, len(member)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Find statements in the archive.')
+    parser.add_argument('--director', default='',
+                        help='initials, username or part of the name')
+    parser.add_argument('--exact', action='store_true',
+                        help='match the whole name, not part of it')
+    parser.add_argument('--email', default='')
+    parser.add_argument('--period', default='',
+                        help='period start, e.g. 2025 or 2025-01')
+    parser.add_argument('--run', default='',
+                        help='when the run was, e.g. 2025-04')
+    parser.add_argument('--show', action='store_true',
+                        help='print each email in full')
+    parser.add_argument('--save', type=Path, metavar='DIRECTORY',
+                        help='write the statement documents into DIRECTORY')
+    args = parser.parse_args()
+
+    archive = StatementArchive()
+    entries = archive.find(args.director, args.email, args.period, args.run,
+                           args.exact)
+    for entry in entries:
+        print(entry)
+        if args.show:
+            print(archive.text(entry))
+        if args.save and entry.document_name:
+            args.save.mkdir(parents=True, exist_ok=True)
+            Path(args.save, entry.document_name).write_bytes(
+                archive.document(entry))
+    print(f'{len(entries)} statements found.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Move log output off the calling thread.
+
+The handlers installed by psi_logger are moved behind a QueueListener;
+the root logger is left with one QueueHandler that only puts records on a
+bounded queue. If the queue is full the record is dropped and counted
+rather than blocking the GUI or the send loop. The queue is flushed when
+the process exits.
+
+Importing the package leaves logging alone: the entry points call
+start_logging, which enables this if async_logging is set in config.
+"""
+
+import atexit
+import copy
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+import structlog
+
+DEFAULT_QUEUE_SIZE = 10_000
+
+
+class BoundedQueueHandler(QueueHandler):
+    """A QueueHandler that drops records, counting them, when full."""
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # structlog passes its event dict as record.msg for the
+        # ProcessorFormatter; keep it rather than formatting it here.
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room rather than fail if the queue is full at exit
+        self.queue.put(self._sentinel)
+
+
+class AsyncLogging():
+    """The queue handler and its background listener."""
+    def __init__(self, handler: BoundedQueueHandler,
+                 listener: QueueListener) -> None:
+        self.handler = handler
+        self.listener = listener
+        self._running = True
+
+    def stop(self) -> None:
+        """Write out the records still queued and stop the listener."""
+        if not self._running:
+            return
+        self._running = False
+        root_logger = logging.getLogger()
+        self.listener.stop()
+        root_logger.removeHandler(self.handler)
+        for handler in self.listener.handlers:
+            root_logger.addHandler(handler)
+        if self.handler.dropped:
+            root_logger.warning(
+                f'{self.handler.dropped} log records dropped: '
+                'the log queue was full')
+
+
+_async_logging: AsyncLogging | None = None
+
+
+def enable_async_logging(queue_size: int = DEFAULT_QUEUE_SIZE,
+                         json_output: bool = False) -> AsyncLogging:
+    """Route the root logger's handlers through a background thread."""
+    global _async_logging  # pylint: disable=global-statement
+    if _async_logging is not None:
+        return _async_logging
+
+    root_logger = logging.getLogger()
+    handlers = list(root_logger.handlers)
+    if json_output:
+        for handler in handlers:
+            handler.setFormatter(json_formatter())
+
+    handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size))
+    listener = _Listener(
+        handler.queue, *handlers, respect_handler_level=True)
+    for existing in handlers:
+        root_logger.removeHandler(existing)
+    root_logger.addHandler(handler)
+    listener.start()
+
+    _async_logging = AsyncLogging(handler, listener)
+    return _async_logging
+
+
+def start_logging(config: object) -> AsyncLogging | None:
+    """Enable async logging if config asks for it."""
+    # pylint: disable=no-member)
+    if not config.async_logging:
+        return None
+    return enable_async_logging(
+        config.log_queue_size, config.log_format == 'json')
+
+
+@atexit.register
+def disable_async_logging() -> None:
+    """Flush the queue and hand the handlers back to the root logger."""
+    global _async_logging  # pylint: disable=global-statement
+    if _async_logging is not None:
+        _async_logging.stop()
+        _async_logging = None
+
+
+def json_formatter() -> logging.Formatter:
+    """Return a formatter that renders each record as one JSON object."""
+    return structlog.stdlib.ProcessorFormatter(
+        processor=structlog.processors.JSONRenderer(),
+        foreign_pre_chain=[structlog.processors.TimeStamper(fmt='iso')],
+    )
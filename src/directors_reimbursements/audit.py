@@ -0,0 +1,84 @@
+"""Audit the rota against the run history for sessions paid twice or never.
+
+Changing period_start_month or period_months can leave paid periods that
+overlap, or gaps between them. The paid periods form an interval index
+that is swept once against the rota's sorted session dates; a heap holds
+the periods open at each date.
+"""
+
+import heapq
+from datetime import datetime
+from typing import NamedTuple
+
+from directors_reimbursements.constants import DATE_FORMAT
+from directors_reimbursements.history import PaidPeriod, RunHistory
+from directors_reimbursements.rota import load_rota, rota_path
+from directors_reimbursements import logger
+
+PAID_TWICE = 'Paid twice'
+NEVER_PAID = 'Never paid'
+
+
+class AuditFinding(NamedTuple):
+    date: str
+    director: str
+    issue: str
+    periods: str
+
+
+def audit_sessions(
+        sessions: list[tuple[datetime, str]],
+        periods: list[PaidPeriod]) -> list[AuditFinding]:
+    """Return the sessions covered by more than one paid period, or by none.
+
+    sessions must be sorted by date. As in the calculation, a period
+    covers start_date <= date < end_date. Sessions before the first paid
+    period or after the last are not yet due, so are not reported.
+    """
+    if not periods:
+        return []
+    intervals = sorted((period.start_date, period.end_date)
+                       for period in periods)
+    first_start = intervals[0][0]
+    last_end = max(end for _, end in intervals)
+
+    findings = []
+    open_periods = []  # heap of (end, start)
+    next_interval = 0
+    for date, director in sessions:
+        if date < first_start:
+            continue
+        if date >= last_end:
+            break
+        while (next_interval < len(intervals)
+               and intervals[next_interval][0] <= date):
+            start, end = intervals[next_interval]
+            heapq.heappush(open_periods, (end, start))
+            next_interval += 1
+        while open_periods and open_periods[0][0] <= date:
+            heapq.heappop(open_periods)
+
+        if not open_periods:
+            findings.append(AuditFinding(
+                date.strftime(DATE_FORMAT), director, NEVER_PAID, ''))
+        elif len(open_periods) > 1:
+            findings.append(AuditFinding(
+                date.strftime(DATE_FORMAT), director, PAID_TWICE,
+                _periods_text(open_periods)))
+
+    logger.info(f'Audited {len(sessions)} sessions against '
+                f'{len(periods)} paid periods: {len(findings)} findings')
+    return findings
+
+
+def _periods_text(open_periods: list[tuple[datetime, datetime]]) -> str:
+    return ', '.join(
+        f'{start.strftime(DATE_FORMAT)} to {end.strftime(DATE_FORMAT)}'
+        for end, start in sorted(open_periods, key=lambda item: item[1]))
+
+
+def audit_rota() -> list[AuditFinding]:
+    """Audit the rota defined in config against the run history."""
+    rota = load_rota(rota_path())
+    return audit_sessions(
+        rota.period_preview().sessions(), RunHistory().periods)
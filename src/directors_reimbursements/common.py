@@ -1,5 +1,6 @@
 """Utilities for Phoenix Director's payments."""
 
+from functools import lru_cache
 from typing import NamedTuple
 from datetime import datetime
 from dateutil import relativedelta
@@ -19,12 +20,20 @@ class Dates(NamedTuple):
 def get_period_dates(today: datetime.date) -> Dates:
     """Return period dates as a Dates object."""
     # pylint: disable=no-member)
-    payment_month = today.month
-    period = config.period_months
-    while (payment_month - config.period_start_month) % period != 0:
+    return _period_dates(
+        today.year, today.month, config.period_start_month,
+        config.period_months)
+
+
+@lru_cache(maxsize=256)
+def _period_dates(year: int, month: int,
+                  period_start_month: int, period_months: int) -> Dates:
+    """Return the period dates, memoised on everything they depend on."""
+    payment_month = month
+    while (payment_month - period_start_month) % period_months != 0:
         payment_month -= 1
 
-    payment_date = datetime(today.year, payment_month, 1)
+    payment_date = datetime(year, payment_month, 1)
     end_date = payment_date - DateDelta(days=1)
-    start_date = payment_date - DateDelta(months=config.period_months)
+    start_date = payment_date - DateDelta(months=period_months)
     return Dates(start_date, end_date, payment_date)
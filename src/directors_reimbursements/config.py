@@ -13,17 +13,38 @@ from directors_reimbursements.constants import (
 DEFAULT_CONFIG = {
     'send_emails': True,
     'emails_to_file': True,
+    'spool_emails': False,
+    'attach_statements': False,
+    'statement_format': 'pdf',
+    'archive_statements': True,
     'email_file_prefix': 'emails',
     'data_directory': USER_DATA_DIR,
     'email_template': Path(USER_DATA_DIR, 'reimbursement_email_template.txt'),
     'email_subject': 'Phoenix Bridge Club - Director\'s playing fees',
     'period_start_month': 1,
     'payment_bbo':  3,
+    'payment_rates': {},
     'period_months':  3,
     'workbook_path': Path(DOWNLOADS, 'directors-rota.xlsx'),
     'geometry': {},
+    'session_mode': False,
     'workbook_dir': Path(get_downloads_dir()),
     'workbook_file_name': 'directors-rota.xlsx',
+    'scan_engine': 'python',
+    'xlsx_reader': 'native',
+    'session_sheet_pattern': 'Main',
+    'server_host': '127.0.0.1',
+    'server_port': 8765,
+    'server_workers': 8,
+    'async_logging': True,
+    'log_queue_size': 10_000,
+    'log_format': 'console',
+    'smtp_rate': 1.0,
+    'smtp_burst': 5,
+    'smtp_connect_timeout': 15,
+    'smtp_command_timeout': 30,
+    'smtp_max_retries': 5,
+    'smtp_backoff': 2.0,
 }
 
 
@@ -35,6 +56,16 @@ def read_config() -> TomlConfig:
     return toml_config
 
 
+def refresh_config() -> TomlConfig:
+    """Read the config file again into the shared config object.
+
+    The object is updated in place, so every module that imported it sees
+    the change without the app being restarted.
+    """
+    config.__dict__.update(read_config().__dict__)
+    return config
+
+
 def save_config(toml_config: TomlConfig) -> TomlConfig | None:
     result = toml_config.save()
     if result != toml_config.STATUS_OK:
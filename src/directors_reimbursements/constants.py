@@ -12,6 +12,13 @@ APP_AUTHOR = 'psionman'
 CONFIG_PATH = Path(user_config_dir(APP_NAME, APP_AUTHOR), 'config.toml')
 USER_DATA_DIR = user_data_dir(APP_NAME, APP_AUTHOR)
 REPORTS_DIRECTORY = 'reports'
+OUTBOX_DIR = 'outbox'
+FINGERPRINT_DIR = 'fingerprints'
+HISTORY_FILE = 'run_history.json'
+ROTA_INDEX_FILE = 'rota_index.json'
+ARCHIVE_DIR = 'archive'
+ARCHIVE_FILE = 'statements.gz'
+ARCHIVE_INDEX_FILE = 'statements.sqlite'
 DOWNLOADS = get_downloads_dir()
 
 # Application specific
@@ -32,9 +39,21 @@ XLS_FILE_TYPES = (
     ('xlsx files', '*.xlsx'),
     ('All files', '*.*')
 )
+EXPORT_FILE_TYPES = (
+    ('csv files', '*.csv'),
+    ('All files', '*.*')
+)
+ROTA_FILE_TYPES = (
+    ('Rota files', '*.xlsx *.ods *.csv'),
+    ('xlsx files', '*.xlsx'),
+    ('ods files', '*.ods'),
+    ('csv files', '*.csv'),
+    ('All files', '*.*')
+)
 
 # Sheet variables
 SHEET_NAME = 'Main'
+DIRECTORS_SHEET = 'Directors'
 
 INITIALS_COL = 0
 NAME_COL = 1
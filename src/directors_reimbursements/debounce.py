@@ -0,0 +1,97 @@
+"""Debounce noisy tk event handlers so they do not hit the disk each time."""
+
+import os
+import time
+import tkinter as tk
+from pathlib import Path
+
+from psiutils.utilities import window_resize
+
+RESIZE_DELAY_MS = 400
+CHANGE_DELAY_MS = 150
+FILE_CHECK_TTL = 2.0  # seconds
+FILE_CHECK_LIMIT = 256
+
+
+class Debouncer():
+    """Call func once, delay_ms after the last call in a burst of calls.
+
+    The arguments of the last call are passed on to func.
+    """
+    def __init__(self, widget: tk.Misc, delay_ms: int, func: callable):
+        self.widget = widget
+        self.delay_ms = delay_ms
+        self.func = func
+        self._job = None
+        self._args = ()
+
+    def __call__(self, *args) -> None:
+        self._args = args
+        self.cancel()
+        self._job = self.widget.after(self.delay_ms, self._fire)
+
+    def cancel(self) -> None:
+        if self._job:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def flush(self) -> None:
+        """Call func now if a call is pending."""
+        if self._job:
+            self.cancel()
+            self.func(*self._args)
+
+    def _fire(self) -> None:
+        self._job = None
+        self.func(*self._args)
+
+
+class GeometrySaver():
+    """A <Configure> handler that saves a form's geometry once it settles.
+
+    <Configure> is reported for every widget in the window, and for every
+    pixel of a drag; only the window's own events are considered and the
+    geometry is written only if it has changed.
+    """
+    def __init__(self, form: object, file: str) -> None:
+        self.form = form
+        self.file = file
+        self._saved = None
+        self._debouncer = Debouncer(form.root, RESIZE_DELAY_MS, self._save)
+
+    def __call__(self, event: tk.Event = None) -> None:
+        if event is not None and event.widget is not self.form.root:
+            return
+        self._debouncer()
+
+    def flush(self) -> None:
+        self._debouncer.flush()
+
+    def _save(self) -> None:
+        geometry = self.form.root.geometry()
+        if geometry != self._saved:
+            window_resize(self.form, self.file)
+            self._saved = geometry
+
+
+_file_checks: dict[str, tuple[float, bool]] = {}
+
+
+def is_file(path: str | Path) -> bool:
+    """Return os.path.isfile(path), stat-ing each path at most every
+    FILE_CHECK_TTL seconds."""
+    key = str(path)
+    now = time.monotonic()
+    checked = _file_checks.get(key)
+    if checked and now - checked[0] < FILE_CHECK_TTL:
+        return checked[1]
+    result = os.path.isfile(key)
+    if len(_file_checks) >= FILE_CHECK_LIMIT:
+        _file_checks.clear()
+    _file_checks[key] = (now, result)
+    return result
+
+
+def forget_file(path: str | Path) -> None:
+    """Check path again on the next is_file, e.g. once it is deleted."""
+    _file_checks.pop(str(path), None)
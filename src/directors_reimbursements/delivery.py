@@ -0,0 +1,167 @@
+"""Deliver emails over SMTP at a rate the provider will accept.
+
+One connection is kept open for a batch. Sends are throttled with a token
+bucket; transient failures (4xx replies, timeouts and dropped connections)
+are retried with exponential backoff and halve the send rate, which then
+recovers as messages go through. Other failures are not retried.
+
+Only a 5xx reply to the recipients or the message itself is a permanent
+failure of that message. Failures to connect, resolve the server, log in
+or be accepted as the sender stop the batch and leave its messages to be
+sent later.
+"""
+
+import random
+import smtplib
+import socket
+import time
+from email.message import Message
+
+from directors_reimbursements.config import env, read_config
+from directors_reimbursements import logger
+
+MIN_RATE = 0.05  # messages per second
+RATE_RECOVERY = 1.1
+
+
+class DeliveryError(Exception):
+    """A message could not be delivered."""
+    def __init__(self, message: str, permanent: bool) -> None:
+        super().__init__(message)
+        self.permanent = permanent
+
+
+class TokenBucket():
+    """Allow `rate` sends per second on average, in bursts of up to `burst`.
+
+    The rate can be reduced while the provider is pushing back and recovers
+    towards the configured rate as sends succeed.
+    """
+    def __init__(self, rate: float, burst: int) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def acquire(self) -> None:
+        """Wait until a send is allowed and take a token."""
+        self._refill()
+        if self.tokens < 1:
+            time.sleep((1 - self.tokens) / self.rate)
+            self._refill()
+        self.tokens -= 1
+
+    def slow_down(self) -> None:
+        self.rate = max(MIN_RATE, self.rate / 2)
+
+    def speed_up(self) -> None:
+        self.rate = min(self.max_rate, self.rate * RATE_RECOVERY)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class SmtpDelivery():
+    """Send messages over a single, throttled SMTP connection.
+
+    Use as a context manager so the connection is closed after the batch.
+    """
+    def __init__(self, config: object = None) -> None:
+        # pylint: disable=no-member)
+        config = config or read_config()
+        self.connect_timeout = float(config.smtp_connect_timeout)
+        self.command_timeout = float(config.smtp_command_timeout)
+        self.max_retries = int(config.smtp_max_retries)
+        self.backoff = float(config.smtp_backoff)
+        self.bucket = TokenBucket(
+            float(config.smtp_rate), int(config.smtp_burst))
+        self._server = None
+
+    def __enter__(self) -> 'SmtpDelivery':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def send(self, msg: Message) -> None:
+        """Send msg, retrying transient failures; raise DeliveryError."""
+        recipient = msg['To']
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                self._connection().sendmail(
+                    env['email_sender'], recipient, msg.as_string())
+            except smtplib.SMTPAuthenticationError:
+                # Not a DeliveryError: the whole batch must stop
+                self.close()
+                raise
+            except (smtplib.SMTPException, OSError) as error:
+                permanent = _is_permanent(error)
+                if (permanent or not _is_transient(error)
+                        or attempt == self.max_retries):
+                    raise DeliveryError(
+                        f'Email to {recipient} failed: {error}',
+                        permanent) from error
+                self._retry_after(error, attempt)
+                continue
+            self.bucket.speed_up()
+            logger.info(f"Email sent to {recipient}")
+            return
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._server is None:
+            server = smtplib.SMTP_SSL(
+                env['smtp_server'], env['smtp_port'],
+                timeout=self.connect_timeout)
+            server.sock.settimeout(self.command_timeout)
+            server.login(env['email_sender'], env['email_key'])
+            self._server = server
+        return self._server
+
+    def _retry_after(self, error: Exception, attempt: int) -> None:
+        delay = self.backoff * 2 ** attempt
+        delay += random.uniform(0, delay / 2)
+        logger.warning(
+            f'Transient email failure, retrying in {delay:.1f}s: {error}')
+        if not isinstance(error, smtplib.SMTPResponseException):
+            # The connection is unusable after a timeout or disconnect
+            self.close()
+        self.bucket.slow_down()
+        time.sleep(delay)
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Return True if the server will never accept this message (a 5xx
+    reply to its recipients or its data)."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return all(500 <= code < 600 for code in codes)
+    if isinstance(error, smtplib.SMTPDataError):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+def _is_transient(error: Exception) -> bool:
+    """Return True if the send may succeed if it is tried again soon."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return not _is_permanent(error)
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    # A DNS failure means the machine is offline or misconfigured
+    if isinstance(error, socket.gaierror):
+        return False
+    return isinstance(error, (smtplib.SMTPServerDisconnected, socket.timeout,
+                              ConnectionError))
@@ -0,0 +1,284 @@
+"""Render each director's email once and deliver it to every chosen sink.
+
+The emails are rendered in one pass over the directors, before any is
+delivered. Each sink (the emails file, SMTP, the outbox) is then given
+them in its own thread, so a slow mail server does not hold up the
+others. A sink stops at its first error; the others carry on.
+"""
+
+import smtplib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from email.message import Message
+from pathlib import Path
+from typing import NamedTuple
+
+from psiutils.errors import ErrorMsg
+
+from directors_reimbursements.archive import StatementArchive
+from directors_reimbursements.config import read_config
+from directors_reimbursements.delivery import DeliveryError, SmtpDelivery
+from directors_reimbursements.emails import (
+    email_template, email_body, create_message, file_entry, email_file_path,
+    save_emails, send_message, setup_error)
+from directors_reimbursements.fingerprints import (
+    StatementFingerprints, SENT, FILED)
+from directors_reimbursements.outbox import Outbox, start_delivery
+from directors_reimbursements.process import Director
+from directors_reimbursements.statements import (
+    render_statements, save_statements)
+from directors_reimbursements import logger
+
+TRANSPORT_ERRORS = (OSError, smtplib.SMTPException, DeliveryError)
+
+
+class RenderedEmail(NamedTuple):
+    """A director's email, ready for any sink."""
+    director: Director
+    text: str
+    message: Message
+    statement: tuple[str, bytes] | None
+
+
+class SinkResult(NamedTuple):
+    """What one sink did with the emails."""
+    name: str
+    delivered: int
+    error: ErrorMsg | None = None
+
+    def __str__(self) -> str:
+        if self.error:
+            return (f'{self.name}: stopped after {self.delivered} emails. '
+                    f'{self.error.message}')
+        return f'{self.name}: {self.delivered} emails'
+
+
+class Sink():
+    """Somewhere rendered emails are delivered.
+
+    Subclasses set name and kind, and implement deliver; open and finish
+    are called before the first email and after the last.
+    """
+    name = ''
+    kind = SENT
+
+    def __init__(self, start_date: datetime) -> None:
+        self.start_date = start_date
+        self.fingerprints = StatementFingerprints(start_date, self.kind)
+
+    def wants(self, director: Director, changed_only: bool) -> bool:
+        """Return True if the director's email should go to this sink."""
+        return not changed_only or self.fingerprints.changed(director)
+
+    def open(self, config: object) -> None:
+        pass
+
+    def deliver(self, email: RenderedEmail) -> ErrorMsg | None:
+        raise NotImplementedError
+
+    def finish(self) -> ErrorMsg | None:
+        return None
+
+
+class FileSink(Sink):
+    """The emails file and, if attached, the statements beside it.
+
+    The emails and statements are also added to the archive, if it is
+    enabled in config.
+    """
+    name = 'Emails file'
+    kind = FILED
+
+    def __init__(self, start_date: datetime,
+                 email_file: Path | None = None,
+                 archive: StatementArchive | None = None) -> None:
+        super().__init__(start_date)
+        self.email_file = email_file
+        self.archive = archive
+        self._emails = []
+
+    def open(self, config: object) -> None:
+        # pylint: disable=no-member)
+        self.email_file = self.email_file or email_file_path(config)
+        if config.archive_statements:
+            self.archive = self.archive or StatementArchive()
+
+    def deliver(self, email: RenderedEmail) -> ErrorMsg | None:
+        self._emails.append(email)
+        return None
+
+    def finish(self) -> ErrorMsg | None:
+        # A changed-only run that selected nobody leaves the day's file
+        if not self._emails:
+            return None
+        output = ''.join(email.text for email in self._emails)
+        if not save_emails(self.email_file, output):
+            return ErrorMsg(
+                header='File error',
+                message=f'Emails not saved: {self.email_file}.',
+            )
+        statements = {email.director.initials: email.statement
+                      for email in self._emails if email.statement}
+        if statements:
+            save_statements(
+                statements,
+                self.email_file.with_name(
+                    f'{self.email_file.stem}_statements'))
+        if self.archive:
+            self.archive.add_run(self.start_date, [
+                (email.director, email.text, email.statement)
+                for email in self._emails])
+        return None
+
+
+class SmtpSink(Sink):
+    """Send the emails now, over one SMTP connection."""
+    name = 'Email'
+
+    def __init__(self, start_date: datetime) -> None:
+        super().__init__(start_date)
+        self.delivery = None
+
+    def open(self, config: object) -> None:
+        self.delivery = SmtpDelivery(config)
+
+    def deliver(self, email: RenderedEmail) -> ErrorMsg | None:
+        response = send_message(self.delivery, email.message)
+        if isinstance(response, ErrorMsg):
+            return response
+        return None
+
+    def finish(self) -> ErrorMsg | None:
+        if self.delivery:
+            self.delivery.close()
+        return None
+
+
+class SpoolSink(Sink):
+    """Add the emails to the outbox, for the delivery worker to send."""
+    name = 'Outbox'
+
+    def __init__(self, start_date: datetime,
+                 outbox: Outbox | None = None) -> None:
+        super().__init__(start_date)
+        self.outbox = outbox or Outbox()
+
+    def deliver(self, email: RenderedEmail) -> ErrorMsg | None:
+        self.outbox.add(email.message)
+        return None
+
+    def finish(self) -> ErrorMsg | None:
+        start_delivery(self.outbox)
+        return None
+
+
+def dispatch(start_date: datetime,
+             directors: dict[Director],
+             sinks: list[Sink],
+             changed_only: bool = False,
+             config: object = None) -> list[SinkResult] | ErrorMsg:
+    """Deliver the directors' emails to each sink; return their results.
+
+    If changed_only, each sink is given only the directors whose statement
+    differs from the one it last had for the period.
+    """
+    # pylint: disable=no-member)
+    config = config or read_config()
+    template = email_template(config.email_template)
+    if isinstance(template, ErrorMsg):
+        return template
+
+    wanted = {
+        id(sink): {
+            director.initials for key, director in directors.items()
+            if key and director.dollars > 0
+            and sink.wants(director, changed_only)}
+        for sink in sinks
+    }
+    payable = [director for director in directors.values()
+               if any(director.initials in initials
+                      for initials in wanted.values())]
+    statements = (render_statements(payable, start_date)
+                  if config.attach_statements and payable else {})
+
+    # Every email is rendered before any is delivered, so a setup error
+    # cannot leave some sent and others not
+    try:
+        emails = [
+            _render(template, director, start_date, config.email_subject,
+                    statements.get(director.initials))
+            for director in payable
+        ]
+    except TypeError:
+        return setup_error()
+
+    with ThreadPoolExecutor(max_workers=max(1, len(sinks)),
+                            thread_name_prefix='sink') as executor:
+        futures = [
+            executor.submit(
+                _run_sink, sink, config,
+                [email for email in emails
+                 if email.director.initials in wanted[id(sink)]])
+            for sink in sinks
+        ]
+        results = [future.result() for future in futures]
+
+    for result in results:
+        logger.info(f'Dispatch {result}')
+    return results
+
+
+def _render(template: str, director: Director, start_date: datetime,
+            subject: str,
+            statement: tuple[str, bytes] | None) -> RenderedEmail:
+    body = email_body(template, director, start_date)
+    return RenderedEmail(
+        director=director,
+        text=file_entry(director.email, subject, body),
+        message=create_message(subject, body, director.email, statement),
+        statement=statement,
+    )
+
+
+def _run_sink(sink: Sink, config: object,
+              emails: list[RenderedEmail]) -> SinkResult:
+    """Deliver the emails to sink, stopping at the first error.
+
+    If finishing fails (e.g. the emails file cannot be written) nothing
+    has been delivered. A transport error raised by the sink is reported
+    as its error, so the other sinks' results are still returned.
+    """
+    delivered = []
+    error = None
+    try:
+        sink.open(config)
+        for email in emails:
+            error = sink.deliver(email)
+            if error:
+                break
+            delivered.append(email.director)
+    except TRANSPORT_ERRORS as exception:
+        error = _sink_failed(sink, exception)
+    try:
+        finish_error = sink.finish()
+    except TRANSPORT_ERRORS as exception:
+        finish_error = _sink_failed(sink, exception)
+    if finish_error:
+        error = error or finish_error
+        delivered = []
+
+    for director in delivered:
+        sink.fingerprints.record(director)
+    try:
+        sink.fingerprints.save()
+    except OSError as exception:
+        error = error or _sink_failed(sink, exception)
+    return SinkResult(sink.name, len(delivered), error)
+
+
+def _sink_failed(sink: Sink, exception: Exception) -> ErrorMsg:
+    logger.error(f'{sink.name} failed: {exception!r}')
+    return ErrorMsg(
+        header='Email error',
+        message=f'{sink.name} failed: {exception}',
+    )
@@ -1,45 +1,42 @@
-"""Send and or save emails."""
+"""Build, send and save the reimbursement emails."""
 
 from pathlib import Path
 from datetime import datetime
+from email.message import Message
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from smtplib import SMTPAuthenticationError
-import smtplib
 
 from psiutils.errors import ErrorMsg
 from directors_reimbursements.constants import USER_DATA_DIR, DATE_FORMAT
 from directors_reimbursements.process import Director
-from directors_reimbursements.config import read_config, env
+from directors_reimbursements.config import env
+from directors_reimbursements.delivery import DeliveryError, SmtpDelivery
+from directors_reimbursements.rota_index import file_signature
 from directors_reimbursements import logger
 
+_templates: dict[Path, tuple[tuple, str]] = {}
 
-def send_emails(start_date: datetime,
-                directors: dict[Director]) -> int | ErrorMsg:
-    """Send Emails for the directors."""
-    # pylint: disable=no-member)
-    config = read_config()
-    template = _email_template(config.email_template)
-    if isinstance(template, ErrorMsg):
-        return template
-
-    emails_sent = 0
-    for key, director in directors.items():
-        if key and director.dollars > 0:
-            response = _create_email(
-                template, director, start_date, config.email_subject)
-            if isinstance(response, ErrorMsg):
-                return response
-            emails_sent += 1
-    return emails_sent
-
-
-def _email_template(email_template_path: str) -> str | ErrorMsg:
-    email_template = Path(USER_DATA_DIR, email_template_path)
-    template = _get_email_template(email_template)
+
+def email_template(email_template_path: str) -> str | ErrorMsg:
+    """Return the text of the email template.
+
+    The text is kept between calls and read again only when the file
+    changes, so a session processing several periods reads it once.
+    """
+    template_path = Path(USER_DATA_DIR, email_template_path)
+    signature = file_signature(template_path)
+    cached = _templates.get(template_path)
+    if cached and signature and cached[0] == signature:
+        return cached[1]
+    template = _get_email_template(template_path)
+    if template and signature:
+        _templates[template_path] = (signature, template)
     if not template:
         return ErrorMsg(
             header='File error',
-            message=f'Email template not found at: {email_template}.',
+            message=f'Email template not found at: {template_path}.',
         )
     return template
 
@@ -53,35 +50,39 @@ def _get_email_template(email_template: Path) -> str:
         return ''
 
 
-def _create_email(
-        base_content: str,
-        director: Director,
-        start_date: datetime,
-        email_subject: str,
-        ) -> str:
-    body = _email_body(base_content, director, start_date)
+def send_message(delivery: SmtpDelivery, msg: Message) -> bool | ErrorMsg:
+    """Send msg; return True, or an ErrorMsg if it could not be sent."""
     try:
-        _send_email(
-            email_subject,
-            body,
-            director.email,)
+        delivery.send(msg)
     except SMTPAuthenticationError:
         logger.error('Email authentication error.')
         return ErrorMsg(
             header='Email error',
             message='Email authentication error.',
         )
-    except TypeError:
-        logger.error('Email setup error.')
+    except DeliveryError as error:
+        logger.error(str(error))
         return ErrorMsg(
             header='Email error',
-            message='Email setup error.',
+            message=str(error),
         )
+    except TypeError:
+        return setup_error()
     return True
 
 
-def _email_body(base_content: str, director: Director,
-                start_date: datetime) -> str:
+def setup_error() -> ErrorMsg:
+    """Log and return the error for an email that cannot be built."""
+    logger.error('Email setup error.')
+    return ErrorMsg(
+        header='Email error',
+        message='Email setup error.',
+    )
+
+
+def email_body(base_content: str, director: Director,
+               start_date: datetime) -> str:
+    """Return the template completed for the director."""
     content = base_content
     content = content.replace('<first name>', director.first_name)
     content = content.replace('<dollars>', str(director.dollars))
@@ -90,60 +91,48 @@ def _email_body(base_content: str, director: Director,
     return content.replace('<dates>', ', '.join(director.dates))
 
 
-def _send_email(subject, body, recipient):
-    msg = MIMEText(body)
+def create_message(subject: str, body: str, recipient: str,
+                   attachment: tuple[str, bytes] | None = None) -> Message:
+    """Return the email for recipient, with the (file name, data)
+    attachment if one is given."""
+    if attachment:
+        file_name, data = attachment
+        msg = MIMEMultipart()
+        msg.attach(MIMEText(body))
+        if file_name.endswith('.html'):
+            part = MIMEText(data.decode('utf-8'), 'html')
+        else:
+            part = MIMEApplication(data, 'pdf')
+        part.add_header(
+            'Content-Disposition', 'attachment', filename=file_name)
+        msg.attach(part)
+    else:
+        msg = MIMEText(body)
     msg['Subject'] = subject
     msg['From'] = env['email_sender']
     msg['To'] = recipient
-    # recipient = env['email_sender']
-    with smtplib.SMTP_SSL(env['smtp_server'], env['smtp_port']) as smtp_server:
-        smtp_server.login(env['email_sender'], env['email_key'])
-        smtp_server.sendmail(env['email_sender'], recipient, msg.as_string())
-    logger.info(f"Email sent to {recipient}")
+    return msg
+
 
+def file_entry(recipient: str, subject: str, body: str) -> str:
+    """Return an email as it is written to the emails file."""
+    return (f'{recipient}\n'
+            f'{subject}\n\n'
+            f'{body}\n'
+            f'{"-"*50}\n\n')
 
-def emails_to_file(
-        start_date: datetime, directors: dict[Director]) -> int | ErrorMsg:
-    """Send Emails for the directors to file."""
+
+def email_file_path(config: object) -> Path:
+    """Return the path of today's emails file."""
     # pylint: disable=no-member)
-    config = read_config()
-    template = _email_template(config.email_template)
-    if isinstance(template, ErrorMsg):
-        return template
-
-    output = ''.join(
-        _email_as_text(template, director, start_date, config.email_subject)
-        for key, director in directors.items()
-        if key and director.dollars > 0
-    )
     date_str = datetime.now().strftime("%Y%m%d")
-    email_file = Path(
+    return Path(
         USER_DATA_DIR,
         'emails',
         f'{config.email_file_prefix}_{date_str}.txt')
-    response = _save_emails(email_file, output)
-    if not response:
-        return ErrorMsg(
-            header='File error',
-            message=f'Emails not saved: {email_file}.',
-        )
-    return True
-
-
-def _email_as_text(
-        base_content: str,
-        director: Director,
-        start_date: datetime,
-        email_subject: str,
-        ) -> str:
-    body = _email_body(base_content, director, start_date)
-    return (f'{director.email}\n'
-            f'{email_subject}\n\n'
-            f'{body}\n'
-            f'{"-"*50}\n\n')
 
 
-def _save_emails(email_file: Path, output: str) -> None:
+def save_emails(email_file: Path, output: str) -> bool:
     try:
         email_file.parent.mkdir(parents=True, exist_ok=True)
         with open(email_file, 'w', encoding='utf-8') as f_email:
@@ -0,0 +1,57 @@
+"""Fingerprints of the statements issued to each director, per period.
+
+They let a corrected rota be re-issued to only the directors whose
+statement (dates directed and dollars) has changed.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from directors_reimbursements.constants import USER_DATA_DIR, FINGERPRINT_DIR
+from directors_reimbursements.process import Director
+from directors_reimbursements import logger
+
+SENT = 'sent'
+FILED = 'file'
+
+
+def statement_fingerprint(director: Director) -> str:
+    """Return a digest of the director's statement."""
+    statement = json.dumps([director.dates, str(director.dollars)])
+    return hashlib.sha256(statement.encode('utf-8')).hexdigest()
+
+
+class StatementFingerprints():
+    """The fingerprints stored for one period and one kind of output."""
+    def __init__(self, start_date: datetime, kind: str,
+                 directory: Path = Path(USER_DATA_DIR, FINGERPRINT_DIR)):
+        self.path = Path(directory, f'{kind}_{start_date:%Y%m%d}.json')
+        self.fingerprints = self._read()
+
+    def changed(self, director: Director) -> bool:
+        """Return True if the statement differs from the one stored."""
+        stored = self.fingerprints.get(director.initials)
+        return stored != statement_fingerprint(director)
+
+    def record(self, director: Director) -> None:
+        self.fingerprints[director.initials] = statement_fingerprint(director)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f_fingerprints:
+            json.dump(self.fingerprints, f_fingerprints, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _read(self) -> dict[str, str]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f_fingerprints:
+                return json.load(f_fingerprints)
+        except FileNotFoundError:
+            return {}
+        except json.decoder.JSONDecodeError:
+            logger.warning(f'Invalid fingerprint file: {self.path}')
+            return {}
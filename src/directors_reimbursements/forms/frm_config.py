@@ -1,4 +1,3 @@
-import os
 import tkinter as tk
 from tkinter import ttk, filedialog
 from pathlib import Path
@@ -6,10 +5,12 @@ from pathlib import Path
 from psiutils.buttons import ButtonFrame, IconButton
 from psiutils.constants import PAD
 from psiutils.widgets import clickable_widget, separator_frame
-from psiutils.utilities import window_resize, geometry
+from psiutils.utilities import geometry
 
-from directors_reimbursements.constants import TXT_FILE_TYPES, XLS_FILE_TYPES
+from directors_reimbursements.constants import TXT_FILE_TYPES, ROTA_FILE_TYPES
 from directors_reimbursements.config import read_config
+from directors_reimbursements.debounce import (
+    CHANGE_DELAY_MS, Debouncer, GeometrySaver, forget_file, is_file)
 from directors_reimbursements.text import Text
 from directors_reimbursements import logger
 
@@ -18,6 +19,7 @@ txt = Text()
 FIELDS = {
     "send_emails": tk.BooleanVar,
     "emails_to_file": tk.BooleanVar,
+    "spool_emails": tk.BooleanVar,
     "email_file_prefix": tk.StringVar,
     "data_directory": tk.StringVar,
     "email_template": tk.StringVar,
@@ -34,6 +36,7 @@ class ConfigFrame():
 
     send_emails: tk.BooleanVar
     emails_to_file: tk.BooleanVar
+    spool_emails: tk.BooleanVar
     email_file_prefix: tk.StringVar
     data_directory: tk.StringVar
     email_template: tk.StringVar
@@ -49,6 +52,10 @@ class ConfigFrame():
         self.parent = parent
         config = read_config()
         self.config = config
+        self._value_changed = Debouncer(
+            self.root, CHANGE_DELAY_MS, self._check_value_changed)
+        self._workbook_path_changed = Debouncer(
+            self.root, CHANGE_DELAY_MS, self.on_workbook_path_change)
 
         # tk variables
 
@@ -66,22 +73,22 @@ class ConfigFrame():
 
     def _stringvar(self, value: str) -> tk.StringVar:
         stringvar = tk.StringVar(value=value)
-        stringvar.trace_add('write', self._check_value_changed)
+        stringvar.trace_add('write', self._value_changed)
         return stringvar
 
     def _intvar(self, value: int) -> tk.IntVar:
         intvar = tk.IntVar(value=value)
-        intvar.trace_add('write', self._check_value_changed)
+        intvar.trace_add('write', self._value_changed)
         return intvar
 
     def _doublevar(self, value: int) -> tk.IntVar:
         doublevar = tk.DoubleVar(value=value)
-        doublevar.trace_add('write', self._check_value_changed)
+        doublevar.trace_add('write', self._value_changed)
         return doublevar
 
     def _boolvar(self, value: bool) -> tk.BooleanVar:
         boolvar = tk.BooleanVar(value=value)
-        boolvar.trace_add('write', self._check_value_changed)
+        boolvar.trace_add('write', self._value_changed)
         return boolvar
 
     def _show(self) -> None:
@@ -92,8 +99,8 @@ class ConfigFrame():
 
         root.bind('<Control-x>', self._dismiss)
         root.bind('<Control-s>', self._save_config)
-        root.bind('<Configure>',
-                  lambda event, arg=None: window_resize(self, __file__))
+        self.geometry_saver = GeometrySaver(self, __file__)
+        root.bind('<Configure>', self.geometry_saver)
 
         root.rowconfigure(1, weight=1)
         root.columnconfigure(0, weight=1)
@@ -120,7 +127,7 @@ class ConfigFrame():
         workbook_file_name = ttk.Entry(frame, textvariable=self.workbook_path)
         workbook_file_name.grid(row=workbook_row+1, column=0, columnspan=2,
                                 sticky=tk.EW, padx=PAD, pady=PAD)
-        self.workbook_path.trace_add('write', self.on_workbook_path_change)
+        self.workbook_path.trace_add('write', self._workbook_path_changed)
 
         select = IconButton(frame, txt.OPEN, 'open', self._set_workbook_path)
         select.grid(row=workbook_row+1, column=2)
@@ -204,6 +211,11 @@ class ConfigFrame():
                                       variable=self.emails_to_file)
         check_button.grid(row=file_row+4, column=0, sticky=tk.W)
 
+        check_button = tk.Checkbutton(
+            frame, text='Send emails in the background',
+            variable=self.spool_emails)
+        check_button.grid(row=file_row+5, column=0, sticky=tk.W)
+
         return frame
 
     def _button_frame(self, master: tk.Frame) -> tk.Frame:
@@ -245,7 +257,7 @@ class ConfigFrame():
             title='Workbook',
             initialdir=str(Path(self.workbook_path.get()).parent),
             initialfile=str(Path(self.workbook_path.get()).name),
-            filetypes=XLS_FILE_TYPES
+            filetypes=ROTA_FILE_TYPES
         )
 
         if workbook_file_name:
@@ -253,13 +265,14 @@ class ConfigFrame():
             self.config.workbook_file_name = workbook_file_name
 
     def on_workbook_path_change(self, *args) -> None:
+        forget_file(self.workbook_path.get())
         self.set_file_message()
 
     def set_file_message(self) -> None:
         # pylint: disable=no-member)
         message = ''
-        email_template = os.path.isfile(self.config.email_template)
-        directors_rota = os.path.isfile(self.workbook_path.get())
+        email_template = is_file(self.config.email_template)
+        directors_rota = is_file(self.workbook_path.get())
         config_text = 'Click on Menu > Defaults to define.'
         if not email_template and not directors_rota:
             message = (f'{txt.DIRECTORS} rota and email template not valid. '
@@ -300,4 +313,5 @@ class ConfigFrame():
         }
 
     def _dismiss(self, *args) -> None:
+        self.geometry_saver.flush()
         self.root.destroy()
@@ -1,6 +1,5 @@
 """Main screen for Phoenix Director's payments."""
 
-import os
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
@@ -11,20 +10,33 @@ from dateutil.parser import parse as date_parse
 from psiutils.constants import PAD, LARGE_FONT
 from psiutils.buttons import ButtonFrame, IconButton
 from psiutils.widgets import clickable_widget, separator_frame
-from psiutils.utilities import window_resize, geometry
+from psiutils.utilities import geometry
 
-from directors_reimbursements.config import read_config
-from directors_reimbursements.constants import MONTH_FORMAT, XLS_FILE_TYPES
+from directors_reimbursements.config import read_config, refresh_config
+from directors_reimbursements.constants import MONTH_FORMAT, ROTA_FILE_TYPES
 from directors_reimbursements.common import get_period_dates
 from directors_reimbursements.process import calculate
+from directors_reimbursements.rates import RateTimeline
+from directors_reimbursements.validation import RotaValidationError
+from directors_reimbursements.readers import rota_exists
+from directors_reimbursements.rota import (
+    prewarm_rota, cached_rota, preload_error, rota_path)
+from directors_reimbursements.watcher import WorkbookWatcher, follow_rota
+from directors_reimbursements.outbox import start_delivery
+from directors_reimbursements.debounce import (
+    CHANGE_DELAY_MS, Debouncer, GeometrySaver, forget_file, is_file)
 from directors_reimbursements.text import Text
 
 from directors_reimbursements.forms.frm_report import ReportFrame
+from directors_reimbursements.forms.frm_problems import ProblemsFrame
 from directors_reimbursements.main_menu import MainMenu
 
 txt = Text()
 DateDelta = relativedelta.relativedelta
 
+PREVIEW_RETRY_MS = 500
+PREVIEW_RETRIES = 120  # a minute, then the preview gives up
+
 
 class MainFrame():
     """Define the frame."""
@@ -38,11 +50,26 @@ class MainFrame():
         payment_month = dates.payment_date.strftime(MONTH_FORMAT)
         self.payment_month = tk.StringVar(value=payment_month)
         self.pay_months = tk.StringVar(value=self._pay_months())
+        self.period_summary = tk.StringVar(value='')
         self.workbook_path = tk.StringVar(value=self.config.workbook_path)
+        self.session_mode = tk.BooleanVar(value=self.config.session_mode)
+        self.session_mode.trace_add('write', self._session_mode_changed)
+
+        self._workbook_path_changed = Debouncer(
+            self.root, CHANGE_DELAY_MS, self.on_workbook_path_change)
+        self.workbook_path.trace_add('write', self._workbook_path_changed)
+
+        # Parse the workbook off the UI thread whenever it is saved
+        self.watcher = WorkbookWatcher(rota_path(), prewarm_rota)
+        self.watcher.start()
+        self._preview_job = None
 
-        self.workbook_path.trace_add('write', self.on_workbook_path_change)
+        # Deliver anything left in the outbox by an earlier session
+        if self.config.spool_emails:
+            start_delivery()
 
         self._show()
+        self._update_preview()
 
     def _show(self) -> None:
         root = self.root
@@ -51,8 +78,8 @@ class MainFrame():
 
         root.bind('<Control-q>', self._dismiss)
         root.bind('<Control-g>', self._process)
-        root.bind('<Configure>',
-                  lambda event, arg=None: window_resize(self, __file__))
+        self.geometry_saver = GeometrySaver(self, __file__)
+        root.bind('<Configure>', self.geometry_saver)
 
         main_menu = MainMenu(self)
         main_menu.create()
@@ -107,10 +134,24 @@ class MainFrame():
                    sticky=tk.W, padx=PAD, pady=PAD)
 
         row += 1
-        pay = f'{self.config.payment_bbo:.2f}'
+        label = ttk.Label(frame, textvariable=self.period_summary)
+        label.grid(row=row, column=0, columnspan=4,
+                   sticky=tk.W, padx=PAD, pady=PAD)
+
+        row += 1
+        rates = RateTimeline(
+            self.config.payment_rates, self.config.payment_bbo)
+        pay = f'{rates.rate(datetime.now()):.2f}'
         label = ttk.Label(frame, text=f'The payment per session is: ${pay}')
         label.grid(row=row, column=0, columnspan=2, sticky=tk.W, padx=PAD)
 
+        row += 1
+        check_button = tk.Checkbutton(
+            frame, text='Stay open after Build for the next period',
+            variable=self.session_mode)
+        check_button.grid(row=row, column=0, columnspan=4, sticky=tk.W,
+                          padx=PAD)
+
         # Workbook
         row += 1
         separator = separator_frame(frame, 'Director\'s rota workbook')
@@ -170,6 +211,40 @@ class MainFrame():
         payment_month = dates.payment_date.strftime(MONTH_FORMAT)
         self.payment_month.set(payment_month)
         self.pay_months.set(self._pay_months())
+        self._update_preview()
+
+    def _update_preview(self, retry: int = 0) -> None:
+        """Show what the selected period will cost.
+
+        Only a workbook that is already loaded is used; while the watcher is
+        (re)loading it the preview is retried, so the UI never blocks. If
+        the load failed, or does not finish in time, that is shown instead.
+        """
+        if self._preview_job:
+            self.root.after_cancel(self._preview_job)
+            self._preview_job = None
+
+        rota = cached_rota(rota_path())
+        if not rota:
+            message = ''
+            error = preload_error(rota_path())
+            if error:
+                message = f'Cannot read workbook: {error}'
+            elif retry >= PREVIEW_RETRIES:
+                message = 'Workbook not loaded'
+            elif rota_exists(rota_path()):
+                message = f'Loading workbook{txt.ELLIPSIS}'
+                self._preview_job = self.root.after(
+                    PREVIEW_RETRY_MS, self._update_preview, retry + 1)
+            self.period_summary.set(message)
+            return
+
+        dates = get_period_dates(date_parse(self.payment_month.get()))
+        summary = rota.period_preview(dates).summary(dates)
+        self.period_summary.set(
+            f'{summary.sessions} sessions, '
+            f'{summary.directors} directors paid, '
+            f'total ${summary.dollars:.2f}')
 
     def _get_workbook_path(self) -> None:
         """Set the workbook path"""
@@ -177,22 +252,25 @@ class MainFrame():
             title='Workbook',
             initialdir=str(Path(self.workbook_path.get()).parent),
             initialfile=str(Path(self.workbook_path.get()).name),
-            filetypes=XLS_FILE_TYPES
+            filetypes=ROTA_FILE_TYPES
         )
 
         if workbook_path:
             self.workbook_path.set(workbook_path)
-            self.config.workbook_path = workbook_path
+            self.config.config['workbook_path'] = workbook_path
+            self.config.save()
+            self.config_changed()
 
     def on_workbook_path_change(self, *args) -> None:
+        forget_file(self.workbook_path.get())
         self.set_file_message()
 
     def set_file_message(self) -> None:
         # pylint: disable=no-member)
         message = ''
         config_text = 'Click on Menu > Defaults to define.'
-        email_template = os.path.isfile(self.config.email_template)
-        directors_rota = os.path.isfile(self.workbook_path.get())
+        email_template = is_file(self.config.email_template)
+        directors_rota = is_file(self.workbook_path.get())
         if not email_template and not directors_rota:
             message = (f'Director\'s rota and email template not valid. '
                        f'{config_text}')
@@ -204,27 +282,57 @@ class MainFrame():
             self.button_frame.enable(False)
 
     def _process(self, *args) -> None:
-        if not Path(self.workbook_path.get()).is_file():
+        if not rota_exists(rota_path()):
             messagebox.showwarning(
                 '', f'No workbook: {Path(self.workbook_path.get()).name}')
             return
         payment_date = date_parse(self.payment_month.get())
         dates = get_period_dates(payment_date)
 
-        (directors, formatted_report, csv_report, output) = calculate(dates)
+        try:
+            (directors, formatted_report, csv_report, output) = calculate(
+                dates)
+        except RotaValidationError as error:
+            dlg = ProblemsFrame(self, error.problems)
+            self.root.wait_window(dlg.root)
+            return
         if formatted_report:
             dlg = ReportFrame(
                 self, directors, formatted_report, csv_report, dates, output)
             self.root.wait_window(dlg.root)
-            self._dismiss()
+            if self.session_mode.get():
+                self.next_period_click()
+            else:
+                self._dismiss()
+
+    def _session_mode_changed(self, *args) -> None:
+        self.config.config['session_mode'] = self.session_mode.get()
+        self.config.save()
+        refresh_config()
+
+    def config_changed(self) -> None:
+        """Use the config just saved, keeping the session open.
+
+        The shared config is refreshed so processing uses it too, and the
+        watcher follows the workbook if its path has changed.
+        """
+        self.config = refresh_config()
+        self.workbook_path.set(self.config.workbook_path)
+        self.watcher = follow_rota(self.watcher, rota_path())
+        self._update_preview()
 
     def _delete_workbook(self, *args) -> None:
         path = Path(self.workbook_path.get())
         if path.exists():
             path.unlink()
+            forget_file(path)
             print(f"Deleted {path}")
         else:
             print(f"File {path} does not exist")
 
     def _dismiss(self, *args) -> None:
+        if self._preview_job:
+            self.root.after_cancel(self._preview_job)
+        self.watcher.stop()
+        self.geometry_saver.flush()
         self.root.destroy()
@@ -1,19 +1,31 @@
 """Tkinter frame for displaying reimbursement output."""
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
 from clipboard import copy
 
 from psiutils.constants import PAD
-from psiutils.buttons import ButtonFrame
-from psiutils.utilities import window_resize, geometry
+from psiutils.buttons import ButtonFrame, IconButton
+from psiutils.errors import ErrorMsg
+from psiutils.utilities import geometry
 
 from directors_reimbursements.config import read_config
+from directors_reimbursements.constants import EXPORT_FILE_TYPES
+from directors_reimbursements.debounce import GeometrySaver
+from directors_reimbursements.reconcile import read_transactions, reconcile
 from directors_reimbursements.text import Text
 from directors_reimbursements import logger
 
+from directors_reimbursements.forms.frm_reconcile import ReconcileFrame
+from directors_reimbursements.forms.report_grid import GridColumn, ReportGrid
+
 txt = Text()
 
+COLUMNS = [
+    GridColumn('username', 10),
+    GridColumn('BBO$', 6, tk.E),
+]
+
 
 class OutputFrame():
     def __init__(self, parent: tk.Frame) -> None:
@@ -25,6 +37,9 @@ class OutputFrame():
 
         # tk Variables
         self.csv_report = tk.StringVar(value=self.output)
+        self.filter_text = tk.StringVar()
+
+        self.filter_text.trace_add('write', self._filter_changed)
 
         self._show()
 
@@ -35,8 +50,8 @@ class OutputFrame():
 
         root.bind('<Control-x>', self._dismiss)
         root.bind('<Control-c>', self._copy)
-        root.bind('<Configure>',
-                  lambda event, arg=None: window_resize(self, __file__))
+        self.geometry_saver = GeometrySaver(self, __file__)
+        root.bind('<Configure>', self.geometry_saver)
 
         root.rowconfigure(0, weight=1)
         root.columnconfigure(0, weight=1)
@@ -53,20 +68,29 @@ class OutputFrame():
 
     def _main_frame(self, master: tk.Frame) -> ttk.Frame:
         frame = ttk.Frame(master)
-        frame.rowconfigure(0, weight=1)
-        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(1, weight=1)
+        frame.columnconfigure(1, weight=1)
 
-        text_box = tk.Text(frame)
-        output = [f'{item[0]:<10} {item[1]:>6}' for item in self.output]
-        text_box.insert('1.0', '\n'.join(output))
-        text_box.grid(row=0, column=0, sticky=tk.NSEW)
+        label = ttk.Label(frame, text='Filter')
+        label.grid(row=0, column=0, sticky=tk.W, padx=PAD, pady=PAD)
+        entry = ttk.Entry(frame, textvariable=self.filter_text)
+        entry.grid(row=0, column=1, sticky=tk.EW, pady=PAD)
+
+        self.report_grid = ReportGrid(frame, COLUMNS, self.output)
+        self.report_grid.grid(row=1, column=0, columnspan=2, sticky=tk.NSEW)
 
         return frame
 
+    def _filter_changed(self, *args) -> None:
+        self.report_grid.set_filter(self.filter_text.get())
+
     def _button_frame(self, master: tk.Frame) -> tk.Frame:
         frame = ButtonFrame(master, tk.HORIZONTAL)
+        reconcile_button = IconButton(
+            frame, txt.RECONCILE, 'compare', self._reconcile)
         frame.buttons = [
             frame.icon_button('copy_clipboard', self._copy),
+            reconcile_button,
             frame.icon_button('exit', self._dismiss),
         ]
         return frame
@@ -76,5 +100,26 @@ class OutputFrame():
         output = [f'{item[0]},{item[1]}' for item in self.output]
         copy('\n'.join(output))
 
+    def _reconcile(self, *args) -> None:
+        """Check the payouts against a BBO transaction export."""
+        export_path = filedialog.askopenfilename(
+            title='BBO transaction export',
+            filetypes=EXPORT_FILE_TYPES,
+            parent=self.root,
+        )
+        if not export_path:
+            return
+
+        transactions = read_transactions(export_path)
+        if isinstance(transactions, ErrorMsg):
+            transactions.show_message(self.root)
+            return
+        discrepancies = reconcile(
+            self.output, self.parent.directors, transactions,
+            self.parent.dates)
+        dlg = ReconcileFrame(self, discrepancies)
+        self.root.wait_window(dlg.root)
+
     def _dismiss(self, *args):
+        self.geometry_saver.flush()
         self.root.destroy()
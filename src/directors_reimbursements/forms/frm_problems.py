@@ -0,0 +1,83 @@
+"""Tkinter frame for displaying the problems found in the rota."""
+
+import tkinter as tk
+from tkinter import ttk
+
+from psiutils.constants import PAD
+from psiutils.buttons import ButtonFrame
+from psiutils.utilities import geometry
+
+from directors_reimbursements.config import read_config
+from directors_reimbursements.debounce import GeometrySaver
+from directors_reimbursements.validation import RotaProblem
+from directors_reimbursements.text import Text
+
+from directors_reimbursements.forms.report_grid import GridColumn, ReportGrid
+
+txt = Text()
+
+
+COLUMNS = [
+    GridColumn('Sheet', 24),
+    GridColumn('Row', 6, tk.E),
+    GridColumn('Problem', 50),
+]
+
+
+class ProblemsFrame():
+    def __init__(self, parent: tk.Frame,
+                 problems: list[RotaProblem]) -> None:
+        self.root = tk.Toplevel(parent.root)
+        self.parent = parent
+        self.problems = problems
+        self.config = read_config()
+
+        self._show()
+
+    def _show(self) -> None:
+        root = self.root
+        root.geometry(geometry(self.config, __file__))
+        root.title(f'{txt.TITLE} -  Rota problems')
+
+        root.bind('<Control-x>', self._dismiss)
+        self.geometry_saver = GeometrySaver(self, __file__)
+        root.bind('<Configure>', self.geometry_saver)
+
+        root.rowconfigure(0, weight=1)
+        root.columnconfigure(0, weight=1)
+
+        main_frame = self._main_frame(root)
+        main_frame.grid(row=0, column=0, sticky=tk.NSEW, padx=PAD, pady=PAD)
+
+        self.button_frame = self._button_frame(root)
+        self.button_frame.grid(row=8, column=0, columnspan=9,
+                               sticky=tk.EW, padx=PAD, pady=PAD)
+
+        sizegrip = ttk.Sizegrip(root)
+        sizegrip.grid(sticky=tk.SE)
+
+    def _main_frame(self, master: tk.Frame) -> ttk.Frame:
+        frame = ttk.Frame(master)
+        frame.rowconfigure(0, weight=1)
+        frame.columnconfigure(0, weight=1)
+
+        self.report_grid = ReportGrid(frame, COLUMNS, self.problems)
+        self.report_grid.grid(row=0, column=0, sticky=tk.NSEW)
+
+        message = (f'{len(self.problems)} problems must be corrected in '
+                   'the rota before it can be calculated.')
+        label = ttk.Label(frame, text=message)
+        label.grid(row=1, column=0, sticky=tk.W, pady=PAD)
+
+        return frame
+
+    def _button_frame(self, master: tk.Frame) -> tk.Frame:
+        frame = ButtonFrame(master, tk.HORIZONTAL)
+        frame.buttons = [
+            frame.icon_button('exit', self._dismiss),
+        ]
+        return frame
+
+    def _dismiss(self, *args):
+        self.geometry_saver.flush()
+        self.root.destroy()
@@ -0,0 +1,84 @@
+"""Tkinter frame for displaying a BBO payout reconciliation."""
+
+import tkinter as tk
+from tkinter import ttk
+
+from psiutils.constants import PAD
+from psiutils.buttons import ButtonFrame
+from psiutils.utilities import geometry
+
+from directors_reimbursements.config import read_config
+from directors_reimbursements.debounce import GeometrySaver
+from directors_reimbursements.reconcile import Discrepancy
+from directors_reimbursements.text import Text
+
+from directors_reimbursements.forms.report_grid import GridColumn, ReportGrid
+
+txt = Text()
+
+COLUMNS = [
+    GridColumn('Issue', 12),
+    GridColumn('username', 20),
+    GridColumn('Expected', 8, tk.E),
+    GridColumn('Paid', 8, tk.E),
+    GridColumn('Export lines', 20),
+]
+
+
+class ReconcileFrame():
+    def __init__(self, parent: tk.Frame,
+                 discrepancies: list[Discrepancy]) -> None:
+        self.root = tk.Toplevel(parent.root)
+        self.parent = parent
+        self.discrepancies = discrepancies
+        self.config = read_config()
+
+        self._show()
+
+    def _show(self) -> None:
+        root = self.root
+        root.geometry(geometry(self.config, __file__))
+        root.title(f'{txt.TITLE} -  {txt.RECONCILE}')
+
+        root.bind('<Control-x>', self._dismiss)
+        self.geometry_saver = GeometrySaver(self, __file__)
+        root.bind('<Configure>', self.geometry_saver)
+
+        root.rowconfigure(0, weight=1)
+        root.columnconfigure(0, weight=1)
+
+        main_frame = self._main_frame(root)
+        main_frame.grid(row=0, column=0, sticky=tk.NSEW, padx=PAD, pady=PAD)
+
+        self.button_frame = self._button_frame(root)
+        self.button_frame.grid(row=8, column=0, columnspan=9,
+                               sticky=tk.EW, padx=PAD, pady=PAD)
+
+        sizegrip = ttk.Sizegrip(root)
+        sizegrip.grid(sticky=tk.SE)
+
+    def _main_frame(self, master: tk.Frame) -> ttk.Frame:
+        frame = ttk.Frame(master)
+        frame.rowconfigure(0, weight=1)
+        frame.columnconfigure(0, weight=1)
+
+        self.report_grid = ReportGrid(frame, COLUMNS, self.discrepancies)
+        self.report_grid.grid(row=0, column=0, sticky=tk.NSEW)
+
+        message = (f'{len(self.discrepancies)} discrepancies'
+                   if self.discrepancies else 'All payouts reconciled.')
+        label = ttk.Label(frame, text=message)
+        label.grid(row=1, column=0, sticky=tk.W, pady=PAD)
+
+        return frame
+
+    def _button_frame(self, master: tk.Frame) -> tk.Frame:
+        frame = ButtonFrame(master, tk.HORIZONTAL)
+        frame.buttons = [
+            frame.icon_button('exit', self._dismiss),
+        ]
+        return frame
+
+    def _dismiss(self, *args):
+        self.geometry_saver.flush()
+        self.root.destroy()
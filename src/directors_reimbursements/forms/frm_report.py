@@ -2,25 +2,46 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+from datetime import datetime
 from clipboard import copy
 
 from psiutils.constants import PAD
 from psiutils.errors import ErrorMsg
 from psiutils.buttons import ButtonFrame, IconButton
 from psiutils.widgets import WaitCursor
-from psiutils.utilities import window_resize, geometry
+from psiutils.utilities import geometry
 
-from directors_reimbursements.emails import send_emails, emails_to_file
+from directors_reimbursements.dispatch import (
+    Sink, FileSink, SmtpSink, SpoolSink, dispatch)
 from directors_reimbursements.common import Dates
-from directors_reimbursements.config import read_config
+from directors_reimbursements.constants import DATE_FORMAT
+from directors_reimbursements.process import create_report_rows
+from directors_reimbursements.history import RunHistory
+from directors_reimbursements.debounce import GeometrySaver
 from directors_reimbursements.text import Text
 from directors_reimbursements import logger
 
 from directors_reimbursements.forms.frm_output import OutputFrame
+from directors_reimbursements.forms.report_grid import GridColumn, ReportGrid
 
 txt = Text()
 
 
+def _first_date(dates: str) -> datetime:
+    if not dates:
+        return datetime.min
+    return datetime.strptime(dates.split(', ')[0], DATE_FORMAT)
+
+
+COLUMNS = [
+    GridColumn('Name', 20),
+    GridColumn('username', 10),
+    GridColumn('Sessions', 8, tk.E),
+    GridColumn('BBO$', 6, tk.E),
+    GridColumn('Dates directed', 60, sort_key=_first_date),
+]
+
+
 class ReportFrame():
     def __init__(self, parent: tk.Frame,
                  directors: dict,
@@ -36,14 +57,17 @@ class ReportFrame():
         self.directors = directors
         self.dates = dates
         self.output = output
-        self.config = read_config()
+        self.config = parent.config
 
         # tk Variables
         self.send_emails = tk.BooleanVar(value=self.config.send_emails)
         self.emails_to_file = tk.BooleanVar(value=self.config.emails_to_file)
+        self.changed_only = tk.BooleanVar(value=False)
+        self.filter_text = tk.StringVar()
 
         self.send_emails.trace_add('write', self._check_button_enable)
         self.emails_to_file.trace_add('write', self._check_button_enable)
+        self.filter_text.trace_add('write', self._filter_changed)
 
         self._show()
         self._enable_buttons()
@@ -56,8 +80,8 @@ class ReportFrame():
         root.bind('<Control-x>', self._dismiss)
         root.bind('<Control-c>', self._copy)
         root.bind('<Control-e>', self._emails)
-        root.bind('<Configure>',
-                  lambda event, arg=None: window_resize(self, __file__))
+        self.geometry_saver = GeometrySaver(self, __file__)
+        root.bind('<Configure>', self.geometry_saver)
 
         root.rowconfigure(0, weight=1)
         root.columnconfigure(0, weight=1)
@@ -77,15 +101,27 @@ class ReportFrame():
 
     def _main_frame(self, master: tk.Frame) -> ttk.Frame:
         frame = ttk.Frame(master)
-        frame.rowconfigure(0, weight=1)
-        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(1, weight=1)
+        frame.columnconfigure(1, weight=1)
 
-        text_box = tk.Text(frame)
-        text_box.insert('1.0', '\n'.join(self.formatted_report))
-        text_box.grid(row=0, column=0, sticky=tk.NSEW)
+        label = ttk.Label(frame, text='Filter')
+        label.grid(row=0, column=0, sticky=tk.W, padx=PAD, pady=PAD)
+        entry = ttk.Entry(frame, textvariable=self.filter_text)
+        entry.grid(row=0, column=1, sticky=tk.EW, pady=PAD)
+
+        rows = create_report_rows(self.directors)
+        self.report_grid = ReportGrid(frame, COLUMNS, rows)
+        self.report_grid.grid(row=1, column=0, columnspan=2, sticky=tk.NSEW)
+
+        total = sum(row[3] for row in rows)
+        label = ttk.Label(frame, text=f'Total dollars: {total}')
+        label.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=PAD)
 
         return frame
 
+    def _filter_changed(self, *args) -> None:
+        self.report_grid.set_filter(self.filter_text.get())
+
     def _options_frame(self, master: tk.Frame) -> tk.Frame:
         frame = ttk.Frame(master)
         frame.rowconfigure(0, weight=1)
@@ -98,6 +134,10 @@ class ReportFrame():
                                       variable=self.emails_to_file)
         check_button.grid(row=0, column=1)
 
+        check_button = tk.Checkbutton(frame, text='Changed statements only',
+                                      variable=self.changed_only)
+        check_button.grid(row=0, column=2)
+
         return frame
 
     def _button_frame(self, master: tk.Frame) -> tk.Frame:
@@ -114,24 +154,30 @@ class ReportFrame():
 
     def _emails(self, *args) -> None:
         with WaitCursor(self.root):
-
-            if self.emails_to_file.get():
-                response = emails_to_file(
-                    self.parent.start_date, self.directors)
-                if isinstance(response, ErrorMsg):
-                    response.show_message(self.root)
-                    self.root.config(cursor='')
-                    return
-
-            if self.send_emails.get():
-                response = send_emails(self.dates.start_date, self.directors)
-                if isinstance(response, ErrorMsg):
-                    response.show_message(self.root)
-                    self.root.config(cursor='')
-                    return
-                messagebox .showinfo(
-                    'Emails', f'{response} emails sent.', parent=self.root)
+            results = dispatch(
+                self.dates.start_date, self.directors, self._sinks(),
+                self.changed_only.get(), self.config)
             self.root.config(cursor='')
+            if isinstance(results, ErrorMsg):
+                results.show_message(self.root)
+                return
+            report = '\n'.join(str(result) for result in results)
+            if any(result.error for result in results):
+                messagebox.showerror('Emails', report, parent=self.root)
+                return
+            messagebox.showinfo('Emails', report, parent=self.root)
+            RunHistory().record(self.dates)
+
+    def _sinks(self) -> list[Sink]:
+        start_date = self.dates.start_date
+        sinks = []
+        if self.emails_to_file.get():
+            sinks.append(FileSink(start_date))
+        if self.send_emails.get() and self.config.spool_emails:
+            sinks.append(SpoolSink(start_date))
+        elif self.send_emails.get():
+            sinks.append(SmtpSink(start_date))
+        return sinks
 
     def _copy(self, *args) -> None:
         logger.info("Copied csv report to clipboard")
@@ -150,4 +196,5 @@ class ReportFrame():
         self.root.wait_window(dlg.root)
 
     def _dismiss(self, *args):
+        self.geometry_saver.flush()
         self.root.destroy()
@@ -0,0 +1,224 @@
+"""A virtualised, sortable and filterable table for report output.
+
+Only the rows that fit in the window are drawn: scrolling re-uses a fixed
+pool of canvas text items. Sorting and filtering work on an in-memory index
+of row numbers, kept by GridView, so neither re-renders the report.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from tkinter import font as tkfont
+from typing import NamedTuple
+
+ROW_PADDING = 4
+SORT_UP = ' ▲'
+SORT_DOWN = ' ▼'
+
+
+class GridColumn(NamedTuple):
+    """A column in the ReportGrid."""
+    heading: str
+    width: int  # characters
+    anchor: str = tk.W
+    sort_key: callable = None
+
+
+class GridView():
+    """The row numbers a ReportGrid shows, sorted and filtered.
+
+    Each sort order is built once, and a filter that extends the previous
+    one searches only the rows that already matched.
+    """
+    def __init__(self, columns: list[GridColumn], rows: list[tuple]) -> None:
+        self.columns = columns
+        self.rows = rows
+        self._search_keys = [
+            ' '.join(str(value) for value in row).lower() for row in rows]
+        self._sort_orders = {}
+        self.sort_column = None
+        self.reverse = False
+        self._filter = ''
+        self._matches = list(range(len(rows)))
+        self.indexes = self._matches
+
+    def sort(self, column: int, reverse: bool = False) -> None:
+        """Sort the rows by column."""
+        self.sort_column = column
+        self.reverse = reverse
+        self._apply()
+
+    def set_filter(self, text: str) -> None:
+        """Keep only rows containing text (case insensitive)."""
+        text = text.lower()
+        candidates = range(len(self.rows))
+        if self._filter and text.startswith(self._filter):
+            candidates = self._matches
+        self._matches = [index for index in candidates
+                         if text in self._search_keys[index]]
+        self._filter = text
+        self._apply()
+
+    def _apply(self) -> None:
+        order = self._sort_order()
+        if len(self._matches) == len(self.rows):
+            self.indexes = order
+        else:
+            matched = set(self._matches)
+            self.indexes = [index for index in order if index in matched]
+
+    def _sort_order(self) -> list[int]:
+        """Return row numbers in sort order; each order is built once."""
+        key = (self.sort_column, self.reverse)
+        if key not in self._sort_orders:
+            if self.sort_column is None:
+                order = list(range(len(self.rows)))
+            else:
+                sort_key = self._value_key(self.sort_column)
+                order = sorted(
+                    range(len(self.rows)),
+                    key=lambda index: sort_key(self.rows[index]),
+                    reverse=self.reverse)
+            self._sort_orders[key] = order
+        return self._sort_orders[key]
+
+    def _value_key(self, column: int) -> callable:
+        custom_key = self.columns[column].sort_key
+        if custom_key:
+            return lambda row: custom_key(row[column])
+        return lambda row: _default_key(row[column])
+
+
+class ReportGrid(ttk.Frame):
+    """Display rows of values; click a heading to sort by that column."""
+    def __init__(self, master: tk.Frame, columns: list[GridColumn],
+                 rows: list[tuple]) -> None:
+        super().__init__(master)
+        self.columns = columns
+        self.rows = rows
+        self.view = GridView(columns, rows)
+        self._first = 0
+        self._items = []
+
+        self._font = tkfont.nametofont('TkDefaultFont')
+        self._row_height = self._font.metrics('linespace') + ROW_PADDING
+        self._x_positions = self._column_positions()
+
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.header = tk.Canvas(
+            self, height=self._row_height, highlightthickness=0)
+        self.header.grid(row=0, column=0, sticky=tk.EW)
+        self._draw_header()
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, background='white')
+        self.canvas.grid(row=1, column=0, sticky=tk.NSEW)
+        self.scrollbar = ttk.Scrollbar(
+            self, orient=tk.VERTICAL, command=self._yview)
+        self.scrollbar.grid(row=1, column=1, sticky=tk.NS)
+
+        self.canvas.bind('<Configure>', self._redraw)
+        for widget in (self.canvas, self.header):
+            widget.bind('<MouseWheel>', self._on_mousewheel)
+            widget.bind('<Button-4>', lambda event: self._scroll(-3))
+            widget.bind('<Button-5>', lambda event: self._scroll(3))
+
+    @property
+    def visible_rows(self) -> list[tuple]:
+        """Return the rows in the current sort order and filter."""
+        return [self.rows[index] for index in self.view.indexes]
+
+    def sort(self, column: int, reverse: bool = False) -> None:
+        """Sort the grid by column."""
+        self.view.sort(column, reverse)
+        self._first = 0
+        self._redraw()
+        self._draw_header()
+
+    def set_filter(self, text: str) -> None:
+        """Show only rows containing text (case insensitive)."""
+        self.view.set_filter(text)
+        self._first = 0
+        self._redraw()
+
+    def _column_positions(self) -> list[int]:
+        char_width = self._font.measure('0')
+        positions = []
+        x_position = ROW_PADDING
+        for column in self.columns:
+            width = column.width * char_width
+            positions.append(
+                x_position + width if column.anchor == tk.E else x_position)
+            x_position += width + 2 * ROW_PADDING
+        return positions
+
+    def _draw_header(self) -> None:
+        self.header.delete(tk.ALL)
+        for index, column in enumerate(self.columns):
+            heading = column.heading
+            if index == self.view.sort_column:
+                heading += SORT_DOWN if self.view.reverse else SORT_UP
+            item = self.header.create_text(
+                self._x_positions[index], self._row_height // 2,
+                text=heading, anchor=column.anchor, font=self._font)
+            self.header.tag_bind(
+                item, '<Button-1>',
+                lambda event, column=index: self._on_heading_click(column))
+
+    def _on_heading_click(self, column: int) -> None:
+        reverse = column == self.view.sort_column and not self.view.reverse
+        self.sort(column, reverse)
+
+    def _page_size(self) -> int:
+        return max(1, self.canvas.winfo_height() // self._row_height)
+
+    def _redraw(self, *args) -> None:
+        page_size = self._page_size()
+        indexes = self.view.indexes
+        self._first = max(0, min(self._first, len(indexes) - page_size))
+        while len(self._items) < page_size:
+            y_position = len(self._items) * self._row_height
+            self._items.append([
+                self.canvas.create_text(
+                    x_position, y_position + ROW_PADDING // 2,
+                    anchor=tk.N + column.anchor, font=self._font)
+                for x_position, column in zip(self._x_positions,
+                                              self.columns)])
+
+        visible = indexes[self._first:self._first + page_size]
+        for slot, items in enumerate(self._items):
+            row = self.rows[visible[slot]] if slot < len(visible) else None
+            for column, item in enumerate(items):
+                text = '' if row is None else str(row[column])
+                self.canvas.itemconfigure(item, text=text)
+
+        if indexes:
+            top = self._first / len(indexes)
+            bottom = (self._first + page_size) / len(indexes)
+            self.scrollbar.set(top, min(bottom, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _yview(self, *args) -> None:
+        if args[0] == tk.MOVETO:
+            self._first = int(float(args[1]) * len(self.view.indexes))
+            self._redraw()
+        elif args[0] == tk.SCROLL:
+            step = int(args[1])
+            if args[2] == tk.PAGES:
+                step *= self._page_size()
+            self._scroll(step)
+
+    def _scroll(self, step: int) -> None:
+        self._first += step
+        self._redraw()
+
+    def _on_mousewheel(self, event: tk.Event) -> None:
+        self._scroll(-3 if event.delta > 0 else 3)
+
+
+def _default_key(value: object) -> tuple:
+    """Sort numbers before text and compare text case-insensitively."""
+    if isinstance(value, (int, float)):
+        return (0, value, '')
+    return (1, 0, str(value).lower())
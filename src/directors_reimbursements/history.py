@@ -0,0 +1,79 @@
+"""A history of the periods for which reimbursements have been issued."""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+from directors_reimbursements.common import Dates
+from directors_reimbursements.config import config
+from directors_reimbursements.constants import USER_DATA_DIR, HISTORY_FILE
+from directors_reimbursements import logger
+
+
+class PaidPeriod(NamedTuple):
+    """A period that has been paid, and the config it was paid under."""
+    start_date: datetime
+    end_date: datetime
+    period_start_month: int
+    period_months: int
+    issued: datetime
+
+
+class RunHistory():
+    """The paid periods, one per distinct (start, end) period."""
+    def __init__(self, path: Path = Path(USER_DATA_DIR, HISTORY_FILE)):
+        self.path = Path(path)
+        self.periods = self._read()
+
+    def record(self, dates: Dates) -> None:
+        """Record that the period has been paid, and save the history."""
+        # pylint: disable=no-member)
+        period = PaidPeriod(
+            dates.start_date, dates.end_date, config.period_start_month,
+            config.period_months, datetime.now())
+        self.periods = [
+            item for item in self.periods
+            if (item.start_date, item.end_date) != (
+                period.start_date, period.end_date)
+        ]
+        self.periods.append(period)
+        self.periods.sort()
+        self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        periods = [
+            {
+                'start_date': period.start_date.isoformat(),
+                'end_date': period.end_date.isoformat(),
+                'period_start_month': period.period_start_month,
+                'period_months': period.period_months,
+                'issued': period.issued.isoformat(),
+            }
+            for period in self.periods
+        ]
+        with open(tmp_path, 'w', encoding='utf-8') as f_history:
+            json.dump(periods, f_history, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _read(self) -> list[PaidPeriod]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f_history:
+                periods = json.load(f_history)
+            return sorted(
+                PaidPeriod(
+                    datetime.fromisoformat(period['start_date']),
+                    datetime.fromisoformat(period['end_date']),
+                    period['period_start_month'],
+                    period['period_months'],
+                    datetime.fromisoformat(period['issued']))
+                for period in periods)
+        except FileNotFoundError:
+            return []
+        except (json.decoder.JSONDecodeError, KeyError, TypeError,
+                ValueError):
+            logger.warning(f'Invalid run history file: {self.path}')
+            return []
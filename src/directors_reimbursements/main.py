@@ -2,12 +2,16 @@
 
 from root import Root
 
+from directors_reimbursements.async_log import start_logging
+from directors_reimbursements.config import config
+
 from psiutils.icecream_init import ic_init
 ic_init()
 
 
 def main():
     """Call the GUI loop."""
+    start_logging(config)
     Root()
 
 
@@ -9,7 +9,9 @@ from directors_reimbursements.constants import AUTHOR, APP_TITLE, USER_DATA_DIR
 from directors_reimbursements._version import __version__
 from directors_reimbursements.text import Text
 
+from directors_reimbursements.audit import audit_rota
 from directors_reimbursements.forms.frm_config import ConfigFrame
+from directors_reimbursements.forms.frm_audit import AuditFrame
 
 txt = Text()
 
@@ -38,6 +40,7 @@ class MainMenu():
         # pylint: disable=no-member)
         return [
             MenuItem(f'{txt.CONFIG}{txt.ELLIPSIS}', self._show_config_frame),
+            MenuItem(f'Audit payments{txt.ELLIPSIS}', self._show_audit_frame),
             MenuItem(txt.EXIT, self.dismiss),
         ]
 
@@ -45,6 +48,18 @@ class MainMenu():
         """Display the config frame."""
         dlg = ConfigFrame(self)
         self.root.wait_window(dlg.root)
+        self.parent.config_changed()
+
+    def _show_audit_frame(self):
+        """Display the sessions paid twice or never."""
+        try:
+            findings = audit_rota()
+        except (OSError, ValueError) as error:
+            messagebox.showerror(
+                title='Audit', message=f'Cannot read the rota: {error}')
+            return
+        dlg = AuditFrame(self, findings)
+        self.root.wait_window(dlg.root)
 
     def _help_menu_items(self) -> list:
         # pylint: disable=no-member)
@@ -0,0 +1,160 @@
+"""Vectorised session scan for very large rotas.
+
+NumPy is optional: if it is not installed ``numpy_available`` returns False
+and the caller should use the row by row scan in ``process``.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from directors_reimbursements.common import Dates
+from directors_reimbursements.constants import (
+    MON_DATE_COL, WED_DATE_COL, DATE_FORMAT)
+from directors_reimbursements.rates import RateTimeline, payment_rates
+from directors_reimbursements.validation import RotaProblem, is_heading
+from directors_reimbursements import logger
+
+DATE_COLS = (MON_DATE_COL, WED_DATE_COL)
+BLANK = 0
+
+
+def numpy_available() -> bool:
+    """Return True if the NumPy engine can be used."""
+    return np is not None
+
+
+class SessionArrays():
+    """The session cells of the Main sheet held as NumPy arrays.
+
+    There is one element per (row, date column) cell, in sheet order, so
+    that the dates appended to each director are in the same order as the
+    row by row scan. Initials are integer coded; code 0 is a blank cell.
+    Cells the row by row scan would report as not a date are collected in
+    problems, and left out of the arrays.
+    """
+    def __init__(self, numbered_rows: object) -> None:
+        self.initials = [None]
+        self.problems = []
+        codes = {}
+        stamps, ordinals, dir_codes, alt_codes = [], [], [], []
+
+        for sheet, number, row in numbered_rows:
+            if not isinstance(row[0], datetime):
+                if (row[MON_DATE_COL] and row[MON_DATE_COL + 1]
+                        and not is_heading(row[MON_DATE_COL])):
+                    self.problems.append(RotaProblem(
+                        sheet, number, f'Not a date: {row[MON_DATE_COL]!r}'))
+                continue
+            for date_col in DATE_COLS:
+                date = row[date_col]
+                if not (row[date_col + 1] and date):
+                    continue
+                if not isinstance(date, datetime):
+                    self.problems.append(RotaProblem(
+                        sheet, number, f'Not a date: {date!r}'))
+                    continue
+                stamps.append(date)
+                ordinals.append(date.toordinal())
+                dir_codes.append(self._code(codes, row[date_col + 1]))
+                alt_codes.append(self._code(codes, row[date_col + 2]))
+
+        self.stamps = np.array(stamps, dtype='datetime64[us]')
+        self.ordinals = np.array(ordinals, dtype=np.int64)
+        self.dir_codes = np.array(dir_codes, dtype=np.int64)
+        self.alt_codes = np.array(alt_codes, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def _code(self, codes: dict, initials: str) -> int:
+        if not initials:
+            return BLANK
+        if initials not in codes:
+            codes[initials] = len(self.initials)
+            self.initials.append(initials)
+        return codes[initials]
+
+
+def get_dates_directed(
+        dates: Dates,
+        sessions: SessionArrays,
+        directors: dict[str, object],
+        rates: RateTimeline | None = None) -> dict[str, list[str]]:
+    """Return a dict of directors and the dates they've directed.
+
+    Identical in effect to ``process._get_dates_directed``: each Director
+    has the dates of the sessions they directed appended to `dates` and
+    the rate for each in `amounts`.
+    """
+    if rates is None:
+        rates = payment_rates()
+    in_period = ((sessions.stamps >= np.datetime64(dates.start_date))
+                 & (sessions.stamps < np.datetime64(dates.end_date)))
+    selected = np.flatnonzero(in_period)
+    dir_codes = sessions.dir_codes[selected]
+    alt_codes = sessions.alt_codes[selected]
+    ordinals = sessions.ordinals[selected]
+
+    _check_initials(sessions.initials, directors, dir_codes, alt_codes)
+    resolved = np.where(alt_codes != BLANK, alt_codes, dir_codes)
+
+    date_strings, amounts = _date_strings(ordinals, rates)
+    for code, group in _group_by_code(resolved, len(sessions.initials)):
+        director = directors[sessions.initials[code]]
+        director.dates.extend(date_strings[index] for index in group)
+        director.amounts.extend(amounts[index] for index in group)
+
+    directed = {
+        sessions.initials[code]: [date_strings[index] for index in group]
+        for code, group in _group_by_code(dir_codes, len(sessions.initials))
+    }
+
+    logger.info(f"Retrieved {len(directed)} directed date records")
+    return directed
+
+
+def _check_initials(
+        initials: list[str],
+        directors: dict[str, object],
+        dir_codes: object,
+        alt_codes: object) -> None:
+    """Raise KeyError for the first unknown initials, as the row scan does."""
+    known = np.array([code == BLANK or initials[code] in directors
+                      for code in range(len(initials))], dtype=bool)
+    unknown = ~known[dir_codes] | ~known[alt_codes]
+    if unknown.any():
+        index = np.argmax(unknown)
+        code = dir_codes[index]
+        if known[code]:
+            code = alt_codes[index]
+        raise KeyError(initials[code])
+
+
+def _date_strings(ordinals: object,
+                  rates: RateTimeline) -> tuple[list[str], list[Decimal]]:
+    """Return the formatted date and rate of each ordinal, formatting and
+    pricing each day once."""
+    days, inverse = np.unique(ordinals, return_inverse=True)
+    days = [datetime.fromordinal(int(day)) for day in days]
+    formatted = [day.strftime(DATE_FORMAT) for day in days]
+    day_rates = [rates.rate(day) for day in days]
+    return ([formatted[index] for index in inverse],
+            [day_rates[index] for index in inverse])
+
+
+def _group_by_code(codes: object, size: int) -> object:
+    """Yield each code present with the indexes of its sessions.
+
+    Sessions are counted with bincount and grouped with a stable sort, so
+    the indexes for each code stay in sheet order.
+    """
+    counts = np.bincount(codes, minlength=size)
+    order = np.argsort(codes, kind='stable')
+    ends = np.cumsum(counts)
+    for code in np.flatnonzero(counts):
+        yield int(code), order[ends[code] - counts[code]:ends[code]]
@@ -0,0 +1,151 @@
+"""A maildir style outbox of rendered emails waiting to be delivered.
+
+Rendered messages are written to ``tmp`` and renamed into ``new``, so the
+outbox never holds a partly written message. A delivery worker sends each
+message in ``new`` and moves it to ``cur``, or to ``failed`` if the server
+rejects it permanently. Delivered messages get maildir's "seen" flag after
+a ``!`` rather than a ``:``, which Windows does not allow in file names.
+Anything not delivered (e.g. because the app was closed) is sent when
+delivery is next started, either by the app or with:
+
+    python -m directors_reimbursements.outbox
+"""
+
+import email
+import os
+import socket
+import threading
+import time
+from email.message import Message
+from itertools import count
+from pathlib import Path
+from smtplib import SMTPAuthenticationError
+
+from directors_reimbursements.constants import USER_DATA_DIR, OUTBOX_DIR
+from directors_reimbursements.delivery import DeliveryError, SmtpDelivery
+from directors_reimbursements import logger
+
+_sequence = count()
+DELIVERED_SUFFIX = '!2,S'
+
+
+class Outbox():
+    """The outbox directory, with tmp, new and cur sub-directories."""
+    def __init__(self, directory: Path = Path(USER_DATA_DIR, OUTBOX_DIR)):
+        self.directory = Path(directory)
+        self.tmp = Path(self.directory, 'tmp')
+        self.new = Path(self.directory, 'new')
+        self.cur = Path(self.directory, 'cur')
+        self.failed = Path(self.directory, 'failed')
+
+    def add(self, msg: Message) -> Path:
+        """Store msg in the outbox and return its path."""
+        for directory in (self.tmp, self.new, self.cur, self.failed):
+            directory.mkdir(parents=True, exist_ok=True)
+        name = (f'{time.time_ns()}.P{os.getpid()}Q{next(_sequence)}.'
+                f'{socket.gethostname()}')
+        tmp_path = Path(self.tmp, name)
+        with open(tmp_path, 'wb') as f_message:
+            f_message.write(msg.as_bytes())
+            f_message.flush()
+            os.fsync(f_message.fileno())
+        new_path = Path(self.new, name)
+        os.rename(tmp_path, new_path)
+        return new_path
+
+    def pending(self) -> list[Path]:
+        """Return the messages waiting to be delivered, oldest first."""
+        if not self.new.is_dir():
+            return []
+        return sorted(self.new.iterdir())
+
+    def read(self, path: Path) -> Message:
+        with open(path, 'rb') as f_message:
+            return email.message_from_binary_file(f_message)
+
+    def delivered(self, path: Path) -> None:
+        """Move a delivered message out of new."""
+        os.rename(path, Path(self.cur, f'{path.name}{DELIVERED_SUFFIX}'))
+
+    def rejected(self, path: Path) -> None:
+        """Move a message the server will never accept out of new."""
+        os.rename(path, Path(self.failed, path.name))
+
+
+def deliver_pending(outbox: Outbox | None = None) -> tuple[int, int]:
+    """Deliver the messages in the outbox; return (sent, still pending).
+
+    Permanently rejected messages are moved to failed. Delivery stops at
+    any other failure, leaving that message and those after it in the
+    outbox for the next attempt.
+    """
+    outbox = outbox or Outbox()
+    pending = outbox.pending()
+    done = 0
+    sent = 0
+    with SmtpDelivery() as delivery:
+        for path in pending:
+            try:
+                delivery.send(outbox.read(path))
+            except DeliveryError as error:
+                if not error.permanent:
+                    logger.error(f'Outbox delivery stopped: {error}')
+                    break
+                logger.error(str(error))
+                outbox.rejected(path)
+            except (SMTPAuthenticationError, TypeError) as error:
+                logger.error(f'Outbox delivery stopped: {error}')
+                break
+            else:
+                outbox.delivered(path)
+                sent += 1
+            done += 1
+    return sent, len(pending) - done
+
+
+_worker_lock = threading.Lock()
+_worker: threading.Thread | None = None
+
+
+def start_delivery(outbox: Outbox | None = None) -> threading.Thread | None:
+    """Drain the outbox in a background thread, if there is anything to do.
+
+    Only one delivery thread runs at a time; if one is running it will pick
+    up the newly spooled messages.
+    """
+    global _worker  # pylint: disable=global-statement
+    outbox = outbox or Outbox()
+    with _worker_lock:
+        if _worker:
+            return _worker
+        if not outbox.pending():
+            return None
+        _worker = threading.Thread(
+            target=_drain, args=(outbox,), name='outbox-delivery',
+            daemon=True)
+        _worker.start()
+        return _worker
+
+
+def _drain(outbox: Outbox) -> None:
+    global _worker  # pylint: disable=global-statement
+    try:
+        while True:
+            _, unsent = deliver_pending(outbox)
+            with _worker_lock:
+                if unsent or not outbox.pending():
+                    _worker = None
+                    return
+    except Exception:
+        with _worker_lock:
+            _worker = None
+        raise
+
+
+def main() -> None:
+    sent, pending = deliver_pending()
+    print(f'{sent} emails sent, {pending} still in the outbox.')
+
+
+if __name__ == '__main__':
+    main()
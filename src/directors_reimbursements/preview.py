@@ -0,0 +1,64 @@
+"""Per-period session aggregates for previewing a period before Build."""
+
+from bisect import bisect_left
+from datetime import datetime
+from decimal import Decimal
+from typing import NamedTuple
+
+from directors_reimbursements.common import Dates
+from directors_reimbursements.constants import MON_DATE_COL, WED_DATE_COL
+from directors_reimbursements.rates import RateTimeline, payment_rates
+
+
+class PeriodSummary(NamedTuple):
+    """What a period will cost."""
+    sessions: int
+    directors: int
+    dollars: Decimal
+
+
+class PeriodPreview():
+    """Sessions in a rota indexed by date, for instant period summaries.
+
+    The Main sheet is scanned once with the same rules as the calculation
+    (alternates replace the rostered director); each period is then a
+    bisect of the sorted session dates. Summaries are memoised per period
+    and set of rates, so a change to the rates in config is shown.
+    """
+    def __init__(self, rows: object) -> None:
+        sessions = []
+        for row in rows:
+            if not isinstance(row[0], datetime):
+                continue
+            for date_col in [MON_DATE_COL, WED_DATE_COL]:
+                date = row[date_col]
+                if row[date_col + 1] and isinstance(date, datetime):
+                    director = row[date_col + 2] or row[date_col + 1]
+                    sessions.append((date, director))
+        sessions.sort(key=lambda item: item[0])
+
+        self._dates = [session[0] for session in sessions]
+        self._directors = [session[1] for session in sessions]
+        self._summaries = {}
+
+    def sessions(self) -> list[tuple[datetime, str]]:
+        """Return every session as (date, director), in date order."""
+        return list(zip(self._dates, self._directors))
+
+    def summary(self, dates: Dates) -> PeriodSummary:
+        """Return the summary for the period at the rates in config."""
+        rates = payment_rates()
+        key = (dates.start_date, dates.end_date, rates.key)
+        if key not in self._summaries:
+            self._summaries[key] = self._summarise(dates, rates)
+        return self._summaries[key]
+
+    def _summarise(self, dates: Dates, rates: RateTimeline) -> PeriodSummary:
+        start = bisect_left(self._dates, dates.start_date)
+        end = bisect_left(self._dates, dates.end_date)
+        directors = self._directors[start:end]
+        return PeriodSummary(
+            sessions=len(directors),
+            directors=len(set(directors)),
+            dollars=sum(rates.rate(date) for date in self._dates[start:end]),
+        )
@@ -1,28 +1,34 @@
 """Perform reimbursement calculations and return output."""
 
-import os
-from pathlib import Path
 from datetime import datetime
-from openpyxl import load_workbook
 
 from directors_reimbursements.common import Dates
 from directors_reimbursements.config import config
-from directors_reimbursements import logger
+from directors_reimbursements.rates import RateTimeline, payment_rates
+from directors_reimbursements.readers import RotaReader
+from directors_reimbursements.rota import LoadedRota, load_rota, rota_path
+from directors_reimbursements.validation import (
+    RotaProblem, RotaValidationError, is_heading)
+from directors_reimbursements import logger, numpy_scan
 
 from directors_reimbursements.constants import (
-    SHEET_NAME, INITIALS_COL, NAME_COL, EMAIL_COL, USERNAME_COL, MON_DATE_COL,
+    INITIALS_COL, NAME_COL, EMAIL_COL, USERNAME_COL, MON_DATE_COL,
     WED_DATE_COL, ACTIVE_COL, DATE_FORMAT)
 
 HEADING = ('Name', 'username', 'BBO$', 'Dates directed', 'Total dollars')
 
 
 class Director():
-    def __init__(self, initials, name, email, username, dates, active):
+    def __init__(self, initials, name, email, username, dates, active,
+                 amounts=None):
+        # pylint: disable=no-member)
         self.initials = initials
         self.name = name
         self.email = email
         self.dates = dates
-        self._dollars = 0
+        if amounts is None:
+            amounts = [config.payment_bbo] * len(dates)
+        self.amounts = amounts
         self.first_name = self._get_first_name()
         self.username = username
         self.active = active
@@ -32,23 +38,32 @@ class Director():
 
     @property
     def dollars(self):
-        # pylint: disable=no-member)
-        return len(self.dates) * config.payment_bbo
+        return sum(self.amounts)
 
     def _get_first_name(self):
         return self.name.split(' ')[0]
 
 
 def calculate(dates: Dates) -> None:
+    """Calculate the reimbursements for the period.
+
+    Raises RotaValidationError with every problem found in the rota and
+    the payment rates.
+    """
     # pylint: disable=no-member)
     date_from = dates.start_date.strftime('%d %b %Y')
     date_to = dates.end_date.strftime('%d %b %Y')
     logger.info(f'Calculation started for {date_from} to {date_to}')
-    workbook_path = Path(os.path.expanduser('~'), config.workbook_path)
-    workbook = load_workbook(filename=workbook_path, data_only=True)
-
-    directors = _get_directors(workbook)
-    _get_dates_directed(dates, workbook, directors)
+    rota = load_rota(rota_path())
+
+    # An invalid rate in config stops the calculation as the rota would
+    rates = payment_rates()
+    problems = list(rates.problems)
+    directors = _get_directors(rota.reader, dates, problems)
+    _scan_sessions(dates, rota, directors, problems, rates)
+    if problems:
+        logger.warning(f'{len(problems)} problems found in the rota')
+        raise RotaValidationError(problems)
     csv_report = _create_csv_report(directors)
     formatted_report = _create_formatted_report(directors)
     output = _create_output(directors)
@@ -74,6 +89,16 @@ def _create_formatted_report(directors: dict[str, Director]) -> list[str]:
     return report
 
 
+def create_report_rows(directors: dict[str, Director]) -> list[tuple]:
+    """Return the report as (name, username, sessions, dollars, dates)."""
+    return [
+        (director.name, director.username, len(director.dates),
+         director.dollars, ', '.join(director.dates))
+        for director in directors.values()
+        if director.active and director.dollars
+    ]
+
+
 def _create_csv_report(directors: dict[str, Director]) -> list[str]:
     (name, username, bbo_dollars, dates, total) = HEADING
     total_dollars = 0
@@ -101,40 +126,110 @@ def _create_output(directors: dict[str, Director]) -> list[str]:
     return output
 
 
+def _scan_sessions(
+        dates: Dates,
+        rota: LoadedRota,
+        directors: dict[str, Director],
+        problems: list[RotaProblem],
+        rates: RateTimeline) -> dict[str: str]:
+    """Run the session scan with the engine selected in config.
+
+    If the NumPy engine finds any problem the rota is scanned again by the
+    python engine, so the problems reported do not depend on the engine.
+    """
+    # pylint: disable=no-member)
+    if config.scan_engine == 'numpy':
+        if numpy_scan.numpy_available():
+            sessions = rota.session_arrays(dates)
+            if sessions.problems:
+                logger.info(f'{len(sessions.problems)} invalid session '
+                            'cells: rescanning to report every problem')
+            else:
+                try:
+                    return numpy_scan.get_dates_directed(
+                        dates, sessions, directors, rates)
+                except KeyError as error:
+                    logger.info(f'NumPy scan failed ({error!r}): '
+                                'rescanning to report every problem')
+        else:
+            logger.warning('NumPy is not installed: using the python scan')
+    return _get_dates_directed(
+        dates, rota.reader, directors, problems, rates)
+
+
 def _get_dates_directed(
         dates: Dates,
-        workbook: object,
-        directors: dict[str, Director]) -> dict[str: str]:
-    """Return a dict of directors and the dates they've directed."""
-    worksheet = workbook[SHEET_NAME]
+        reader: RotaReader,
+        directors: dict[str, Director],
+        problems: list[RotaProblem] | None = None,
+        rates: RateTimeline | None = None) -> dict[str: str]:
+    """Return a dict of directors and the dates they've directed.
+
+    Each session is priced at the rate in effect on its date.
+    Non-date session cells, and initials in the period that are not on the
+    Directors sheet, are added to problems and the session skipped.
+    """
     start_date, end_date = dates.start_date, dates.end_date
+    if problems is None:
+        problems = []
+    if rates is None:
+        rates = payment_rates()
 
     directed = {}
-    for row in worksheet.iter_rows(values_only=True):
-        if isinstance(row[0], datetime):
-            for date_col in [MON_DATE_COL, WED_DATE_COL]:
-                dir_col = date_col + 1
-                alt_dir_col = date_col + 2
-                if (row[dir_col] and row[date_col]
-                        and start_date <= row[date_col] < end_date):
-                    director = directors[row[dir_col]]
-                    if row[alt_dir_col]:
-                        director = directors[row[alt_dir_col]]
-                    director.dates.append(row[date_col].strftime(DATE_FORMAT))
-                    if row[dir_col] not in directed:
-                        directed[row[dir_col]] = []
-                    directed[row[dir_col]].append(
-                        row[date_col].strftime(DATE_FORMAT))
+    for sheet, number, row in reader.numbered_session_rows(dates):
+        if not isinstance(row[0], datetime):
+            if (row[MON_DATE_COL] and row[MON_DATE_COL + 1]
+                    and not is_heading(row[MON_DATE_COL])):
+                problems.append(RotaProblem(
+                    sheet, number, f'Not a date: {row[MON_DATE_COL]!r}'))
+            continue
+        for date_col in [MON_DATE_COL, WED_DATE_COL]:
+            dir_col = date_col + 1
+            alt_dir_col = date_col + 2
+            if not (row[dir_col] and row[date_col]):
+                continue
+            if not isinstance(row[date_col], datetime):
+                problems.append(RotaProblem(
+                    sheet, number, f'Not a date: {row[date_col]!r}'))
+                continue
+            if not start_date <= row[date_col] < end_date:
+                continue
+            unknown = [initials for initials in row[dir_col:alt_dir_col + 1]
+                       if initials and initials not in directors]
+            if unknown:
+                problems.extend(
+                    RotaProblem(sheet, number,
+                                f'Initials not in Directors: {initials}')
+                    for initials in unknown)
+                continue
+            director = directors[row[dir_col]]
+            if row[alt_dir_col]:
+                director = directors[row[alt_dir_col]]
+            director.dates.append(row[date_col].strftime(DATE_FORMAT))
+            director.amounts.append(rates.rate(row[date_col]))
+            if row[dir_col] not in directed:
+                directed[row[dir_col]] = []
+            directed[row[dir_col]].append(
+                row[date_col].strftime(DATE_FORMAT))
 
     logger.info(f"Retrieved {len(directed)} directed date records")
     return directed
 
 
-def _get_directors(workbook: object) -> dict[str, Director]:
-    """Return a dict of Directors."""
-    worksheet = workbook['Directors']
+def _get_directors(
+        reader: RotaReader,
+        dates: Dates | None = None,
+        problems: list[RotaProblem] | None = None) -> dict[str, Director]:
+    """Return a dict of Directors.
+
+    Initials repeated on a sheet, and active directors without an email
+    or username, are added to problems.
+    """
+    if problems is None:
+        problems = []
     directors = {}
-    for row in worksheet.iter_rows(values_only=True):
+    rows_seen = {}
+    for sheet, number, row in reader.numbered_director_rows(dates):
         if row[0] and row[0] != 'Initials':
             director = Director(initials=row[INITIALS_COL],
                                 name=row[NAME_COL],
@@ -142,6 +237,19 @@ def _get_directors(workbook: object) -> dict[str, Director]:
                                 username=row[USERNAME_COL],
                                 dates=[],
                                 active=row[ACTIVE_COL] is not None)
+            first_row = rows_seen.setdefault(
+                (sheet, director.initials), number)
+            if first_row != number:
+                problems.append(RotaProblem(
+                    sheet, number,
+                    f'Director {director.initials} is also on row '
+                    f'{first_row}'))
+            if director.active and not director.email:
+                problems.append(RotaProblem(
+                    sheet, number, f'No email for {director.initials}'))
+            if director.active and not director.username:
+                problems.append(RotaProblem(
+                    sheet, number, f'No username for {director.initials}'))
             directors[director.initials] = director
     logger.info(f"Retrieved {len(directors)} directors' records")
     return directors
@@ -0,0 +1,111 @@
+"""The payment per session, as it has changed over time.
+
+Rates are set in config under ``payment_rates``, keyed by the date they
+take effect, with an optional day for rates that apply to one session day:
+
+    [payment_rates]
+    2024-01-01 = 3
+    2025-04-01 = 3.5
+    2025-04-01_Wed = 4
+
+Sessions before the first effective date are paid ``payment_bbo``.
+Rates are read as Decimal, so sums of them are exact to the cent. A rate
+that is not a number, or is negative, is left out and reported as a
+problem, so that the calculation is not run with it missing.
+"""
+
+from bisect import bisect_right
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from directors_reimbursements.config import config
+from directors_reimbursements.validation import RotaProblem
+from directors_reimbursements import logger
+
+DAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+KEY_FORMAT = '%Y-%m-%d'
+RATES_TABLE = 'payment_rates'
+DEFAULT_KEY = 'payment_bbo'
+
+
+class RateTimeline():
+    """Effective dates and rates, with one timeline for each weekday.
+
+    A day's timeline holds the rates for every day and the rates for that
+    day, the day's rate winning on the same date, so that finding the rate
+    for a session is a single bisect.
+    """
+    def __init__(self, rates: dict[str, object], default: object) -> None:
+        self.problems = []
+        self.default = _money(default)
+        if self.default is None:
+            self._problem(
+                DEFAULT_KEY, 1, f'Invalid payment_bbo: {default!r}')
+            self.default = Decimal(0)
+        every_day, by_day = self._parse(rates)
+        self._timelines = []
+        for day in range(len(DAYS)):
+            merged = dict(every_day)
+            merged.update(by_day.get(day, {}))
+            effective = sorted(merged)
+            self._timelines.append(
+                (effective, [merged[date] for date in effective]))
+        # Equal for timelines that price every session the same
+        self.key = (self.default, tuple(
+            (tuple(effective), tuple(rates))
+            for effective, rates in self._timelines))
+
+    def rate(self, date: datetime) -> Decimal:
+        """Return the rate for a session on date."""
+        effective, rates = self._timelines[date.weekday()]
+        index = bisect_right(effective, date)
+        if index == 0:
+            return self.default
+        return rates[index - 1]
+
+    def _parse(self, rates: dict[str, object]) -> tuple[dict, dict]:
+        every_day, by_day = {}, {}
+        for number, (key, value) in enumerate(rates.items(), start=1):
+            date_text, _, day = str(key).partition('_')
+            try:
+                date = datetime.strptime(date_text, KEY_FORMAT)
+            except ValueError:
+                self._problem(RATES_TABLE, number,
+                              f'Invalid payment rate date: {key}')
+                continue
+            rate = _money(value)
+            if rate is None:
+                self._problem(RATES_TABLE, number,
+                              f'Invalid payment rate: {key} = {value!r}')
+            elif not day:
+                every_day[date] = rate
+            elif day[:3].title() in DAYS:
+                by_day.setdefault(DAYS.index(day[:3].title()), {})[date] = rate
+            else:
+                self._problem(RATES_TABLE, number,
+                              f'Invalid payment rate day: {key}')
+        return every_day, by_day
+
+    def _problem(self, table: str, number: int, message: str) -> None:
+        logger.warning(message)
+        self.problems.append(RotaProblem(table, number, message))
+
+
+def payment_rates() -> RateTimeline:
+    """Return the rate timeline set in config."""
+    # pylint: disable=no-member)
+    return RateTimeline(config.payment_rates, config.payment_bbo)
+
+
+def _money(value: object) -> Decimal | None:
+    """Return value as a Decimal, or None if it is not a valid rate."""
+    if isinstance(value, bool):
+        return None
+    try:
+        # str() so that a float from the config keeps its written digits
+        money = Decimal(str(value))
+    except InvalidOperation:
+        return None
+    if not money.is_finite() or money < 0:
+        return None
+    return money
@@ -0,0 +1,684 @@
+"""Readers that present a rota as rows of values, whatever its file format.
+
+The reader is chosen by the extension of the rota path:
+
+- ``.xlsx`` — an Excel workbook, read by NativeXlsxReader with openpyxl as
+  the fallback
+- ``.ods`` — an OpenDocument spreadsheet
+- ``.csv`` or a directory — the Directors and Main sheets as two CSV files,
+  e.g. ``directors-rota - Main.csv`` and ``directors-rota - Directors.csv``
+  as exported from a shared spreadsheet
+- a glob, or a directory of workbooks — a rota split into several
+  workbooks (e.g. one per year), read by MultiRotaReader
+
+Every reader yields tuples laid out as the workbook's sheets, with blank
+cells as None and dates as datetimes. The numbered_* methods yield each
+row as (sheet, row number, row) so that problems can be reported against
+the sheet.
+"""
+
+import csv
+import fnmatch
+import glob
+import heapq
+import posixpath
+import re
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from xml.etree.ElementTree import ParseError, iterparse
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+from directors_reimbursements.common import Dates
+from directors_reimbursements.config import config
+from directors_reimbursements.constants import (
+    SHEET_NAME, DIRECTORS_SHEET, ACTIVE_COL, MON_DATE_COL, WED_DATE_COL)
+from directors_reimbursements.rota_index import (
+    DateRangeIndex, file_signature, overlaps, shared_index)
+from directors_reimbursements import logger
+
+DIRECTOR_COLUMNS = ACTIVE_COL + 1
+SESSION_COLUMNS = WED_DATE_COL + 3
+SESSION_DATE_COLS = (MON_DATE_COL, WED_DATE_COL)
+CSV_DATE_FORMATS = ('%d/%m/%Y', '%d %b %Y', '%d-%b-%Y', '%d %B %Y')
+WORKBOOK_SUFFIXES = ('.xlsx', '.xlsm', '.ods')
+GLOB_CHARACTERS = re.compile(r'[*?[]')
+# What the native xlsx reader raises on a workbook laid out in a way it
+# does not follow; openpyxl reads it instead
+NATIVE_ERRORS = (zipfile.BadZipFile, KeyError, ParseError, ValueError)
+# What the readers raise on a file that is not a workbook they can read
+FORMAT_ERRORS = (zipfile.BadZipFile, ParseError, InvalidFileException)
+
+
+class RotaReader():
+    """The Directors and session sheets of a rota as rows of values."""
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.path})'
+
+    def director_rows(self, dates: Dates | None = None) -> object:
+        """Yield the rows of the Directors sheet.
+
+        dates is a hint, as for session_rows.
+        """
+        return (row for _, _, row in self.numbered_director_rows(dates))
+
+    def numbered_director_rows(self, dates: Dates | None = None) -> object:
+        # pylint: disable=unused-argument)
+        return self._numbered_rows(DIRECTORS_SHEET)
+
+    def session_rows(self, dates: Dates | None = None) -> object:
+        """Yield the rows of the session sheets.
+
+        The session sheets are those whose names match the configured
+        session_sheet_pattern (e.g. 'Main*' for 'Main 2024', 'Main 2025').
+        dates is a hint: a reader may skip rows outside the period, but
+        callers must still check each row's date. Where there are several
+        session sheets, those whose dates do not overlap the period are
+        skipped unread.
+        """
+        return (row for _, _, row in self.numbered_session_rows(dates))
+
+    def numbered_session_rows(self, dates: Dates | None = None) -> object:
+        for sheet in self.session_sources(dates):
+            yield from self._numbered_rows(sheet)
+
+    def session_sources(self, dates: Dates | None = None) -> tuple:
+        """Return the session sheets read for the period, in date order.
+
+        Periods with the same sources have the same session rows.
+        """
+        sheets = self.session_sheets()
+        if len(sheets) == 1:
+            return tuple(sheets)
+
+        ranges = self._sheet_ranges(sheets)
+        sheets.sort(key=lambda sheet: ranges[sheet] or (datetime.min,))
+        return tuple(
+            sheet for sheet in sheets
+            if dates is None or overlaps(
+                ranges[sheet], dates.start_date, dates.end_date))
+
+    def session_sheets(self) -> list[str]:
+        """Return the names of the sheets that hold sessions."""
+        # pylint: disable=no-member)
+        pattern = config.session_sheet_pattern
+        sheets = [name for name in self.sheet_names()
+                  if name != DIRECTORS_SHEET
+                  and fnmatch.fnmatchcase(name, pattern)]
+        return sheets or [SHEET_NAME]
+
+    def sheet_names(self) -> list[str]:
+        return [DIRECTORS_SHEET, SHEET_NAME]
+
+    def sheet_rows(self, name: str) -> object:
+        """Yield every row of the sheet from the first, blank rows
+        included, except those after the last row with a value."""
+        raise NotImplementedError
+
+    def sheet_signature(self, name: str) -> tuple | None:
+        """Return a tuple that changes whenever the sheet's rows may have.
+
+        Unless a reader can tell its sheets apart, this is the signature
+        of the whole file.
+        """
+        # pylint: disable=unused-argument)
+        return file_signature(self.path)
+
+    def _numbered_rows(self, sheet: str) -> object:
+        for number, row in enumerate(self.sheet_rows(sheet), start=1):
+            yield sheet, number, row
+
+    def _sheet_ranges(self, sheets: list[str]) -> dict:
+        index = shared_index()
+        ranges = {
+            sheet: index.date_range(
+                f'{self.path}|{sheet}', self.sheet_signature(sheet),
+                lambda sheet=sheet: self.sheet_rows(sheet))
+            for sheet in sheets
+        }
+        index.save()
+        return ranges
+
+
+class XlsxReader(RotaReader):
+    """An Excel workbook, parsed in full by openpyxl when opened."""
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.workbook = load_workbook(filename=self.path, data_only=True)
+
+    def sheet_names(self) -> list[str]:
+        return self.workbook.sheetnames
+
+    def sheet_rows(self, name: str) -> object:
+        return self.workbook[name].iter_rows(min_row=1, values_only=True)
+
+
+class CsvReader(RotaReader):
+    """The Directors and Main sheets exported as two CSV files.
+
+    The files are streamed on every read; only the session date columns are
+    converted, the rest of the values are left as strings.
+    """
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.sheet_paths = csv_sheet_paths(self.path)
+
+    def sheet_rows(self, name: str) -> object:
+        is_sessions = name == SHEET_NAME
+        width = SESSION_COLUMNS if is_sessions else DIRECTOR_COLUMNS
+        with open(self.sheet_paths[name], 'r', encoding='utf-8-sig',
+                  newline='') as f_csv:
+            for values in csv.reader(f_csv):
+                row = [value or None for value in values]
+                row.extend([None] * (width - len(row)))
+                if is_sessions:
+                    for date_col in SESSION_DATE_COLS:
+                        row[date_col] = _csv_date(row[date_col])
+                yield tuple(row)
+
+
+class OdsReader(RotaReader):
+    """An OpenDocument spreadsheet, read from its content.xml.
+
+    content.xml holds every sheet, so it is parsed once, when a sheet is
+    first asked for, and the rows of each sheet kept.
+    """
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self._tables = None
+
+    def sheet_names(self) -> list[str]:
+        return list(self._read())
+
+    def sheet_rows(self, name: str) -> object:
+        return iter(self._read()[name])
+
+    def _read(self) -> dict[str, list[tuple]]:
+        if self._tables is None:
+            with zipfile.ZipFile(self.path) as ods:
+                with ods.open('content.xml') as content:
+                    self._tables = _ods_tables(content)
+        return self._tables
+
+
+class NativeXlsxReader(RotaReader):
+    """An Excel workbook read straight from its zip archive.
+
+    Only the workbook index, shared strings, styles and the XML of the
+    sheets asked for are parsed; cells are converted to plain values,
+    Excel date serials becoming datetimes. A sheet is read in full and its
+    rows kept. If its XML cannot be read the sheet is read by openpyxl
+    instead.
+    """
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        with zipfile.ZipFile(self.path) as xlsx:
+            self.sheet_parts, self.epoch = _xlsx_sheets(xlsx)
+            self.shared_strings = _xlsx_shared_strings(xlsx)
+            self.date_styles = _xlsx_date_styles(xlsx)
+            self.sheet_signatures = _xlsx_sheet_signatures(
+                xlsx, self.sheet_parts, self.epoch)
+        self._rows = {}
+        self._fallback = None
+
+    def sheet_names(self) -> list[str]:
+        return list(self.sheet_parts)
+
+    def sheet_signature(self, name: str) -> tuple | None:
+        return self.sheet_signatures.get(name)
+
+    def sheet_rows(self, name: str) -> object:
+        if name not in self._rows:
+            self._rows[name] = self._read_sheet(name)
+        return iter(self._rows[name])
+
+    def _read_sheet(self, name: str) -> list[tuple]:
+        part = self.sheet_parts[name]
+        try:
+            with zipfile.ZipFile(self.path) as xlsx:
+                with xlsx.open(part) as sheet:
+                    return list(_xlsx_rows(sheet, self, _sheet_width(name)))
+        except NATIVE_ERRORS as error:
+            logger.warning(f'Native xlsx reader failed on {name}, '
+                           f'using openpyxl: {error!r}')
+        if self._fallback is None:
+            self._fallback = XlsxReader(self.path)
+        return list(self._fallback.sheet_rows(name))
+
+
+class MultiRotaReader(RotaReader):
+    """A rota split across several workbooks, e.g. one for each year.
+
+    Each workbook is indexed by the range of its session dates, so only
+    the workbooks that overlap a period are opened. Their session rows are
+    merged by date; rows without a session date stay after the row before
+    them. The Directors sheets are read oldest first, so the newest
+    workbook's details win.
+    """
+    def __init__(self, path: Path, index: DateRangeIndex | None = None):
+        super().__init__(path)
+        self.index = index or shared_index()
+        self.members = rota_members(self.path)
+        if not self.members:
+            raise FileNotFoundError(f'No rota workbooks match {self.path}')
+        self._readers = {}
+        self._ranges = {
+            member: self.index.date_range(
+                str(member), file_signature(member),
+                lambda member=member: self._reader(member).session_rows())
+            for member in self.members
+        }
+        self.index.save()
+        self.members.sort(key=self._start_date)
+
+    def numbered_director_rows(self, dates: Dates | None = None) -> object:
+        for member in self._overlapping(dates):
+            for sheet, number, row in self._reader(
+                    member).numbered_director_rows(dates):
+                yield f'{member.name}: {sheet}', number, row
+
+    def numbered_session_rows(self, dates: Dates | None = None) -> object:
+        members = self._overlapping(dates)
+        logger.info(f'Reading sessions from {len(members)} of '
+                    f'{len(self.members)} workbooks')
+        merged = heapq.merge(
+            *(self._dated_rows(member, dates) for member in members),
+            key=lambda item: item[0])
+        return (item[1:] for item in merged)
+
+    def session_sources(self, dates: Dates | None = None) -> tuple:
+        return tuple(
+            (member, self._reader(member).session_sources(dates))
+            for member in self._overlapping(dates))
+
+    def sheet_rows(self, name: str) -> object:
+        for member in self.members:
+            yield from self._reader(member).sheet_rows(name)
+
+    def _overlapping(self, dates: Dates | None) -> list[Path]:
+        if dates is None:
+            return self.members
+        return [member for member in self.members
+                if overlaps(self._ranges[member],
+                            dates.start_date, dates.end_date)]
+
+    def _dated_rows(self, member: Path, dates: Dates | None) -> object:
+        """Yield (sort date, sheet, number, row) for each session row.
+
+        Rows without a session date (headings, blanks and invalid dates)
+        are kept, for the scan to check, and sorted with the row before.
+        """
+        sort_date = datetime.min
+        for sheet, number, row in self._reader(
+                member).numbered_session_rows(dates):
+            if isinstance(row[MON_DATE_COL], datetime):
+                sort_date = row[MON_DATE_COL]
+            yield sort_date, f'{member.name}: {sheet}', number, row
+
+    def _reader(self, member: Path) -> RotaReader:
+        if member not in self._readers:
+            self._readers[member] = open_reader(member)
+        return self._readers[member]
+
+    def _start_date(self, member: Path) -> datetime:
+        date_range = self._ranges[member]
+        return date_range[0] if date_range else datetime.min
+
+
+def _sheet_width(name: str) -> int:
+    return DIRECTOR_COLUMNS if name == DIRECTORS_SHEET else SESSION_COLUMNS
+
+
+def open_reader(path: Path) -> RotaReader:
+    """Return the reader for the rota at path."""
+    # pylint: disable=no-member)
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if is_rota_set(path):
+        return MultiRotaReader(path)
+    if path.is_dir() or suffix == '.csv':
+        return CsvReader(path)
+    if suffix == '.ods':
+        return OdsReader(path)
+    if suffix in ('.xlsx', '.xlsm'):
+        if config.xlsx_reader == 'native':
+            try:
+                return NativeXlsxReader(path)
+            except NATIVE_ERRORS as error:
+                logger.warning(
+                    f'Native xlsx reader failed, using openpyxl: {error}')
+        return XlsxReader(path)
+    raise ValueError(f'Unsupported rota file: {path.name}')
+
+
+def is_rota_glob(path: Path) -> bool:
+    return bool(GLOB_CHARACTERS.search(str(path)))
+
+
+def is_rota_set(path: Path) -> bool:
+    """Return True if path is a glob of workbooks or a directory of them.
+
+    A directory holding Directors and Main CSV files is a CSV rota.
+    """
+    if is_rota_glob(path):
+        return True
+    if not path.is_dir():
+        return False
+    try:
+        csv_sheet_paths(path)
+        return False
+    except FileNotFoundError:
+        return bool(rota_members(path))
+
+
+def rota_members(path: Path) -> list[Path]:
+    """Return the workbooks in the rota set at path."""
+    if is_rota_glob(path):
+        paths = [Path(match) for match in glob.glob(str(path))]
+    else:
+        paths = list(Path(path).iterdir())
+    return sorted(
+        member for member in paths
+        if member.suffix.lower() in WORKBOOK_SUFFIXES
+        and not member.name.startswith(('~$', '.~lock')))
+
+
+def rota_exists(path: Path) -> bool:
+    """Return True if there is a rota to read at path."""
+    path = Path(path)
+    if is_rota_glob(path):
+        return bool(rota_members(path))
+    return path.exists()
+
+
+def rota_sources(path: Path) -> list[Path]:
+    """Return the files a rota at path is read from."""
+    path = Path(path)
+    if is_rota_set(path):
+        return rota_members(path)
+    if path.is_dir() or path.suffix.lower() == '.csv':
+        try:
+            return list(csv_sheet_paths(path).values())
+        except FileNotFoundError:
+            return [path]
+    return [path]
+
+
+def csv_sheet_paths(path: Path) -> dict[str, Path]:
+    """Return the Directors and Main CSV files for path.
+
+    path is a directory holding both files, or either one of the files; the
+    other is found by swapping the sheet name in the file name.
+    """
+    if path.is_dir():
+        sheet_paths = {}
+        for name in (DIRECTORS_SHEET, SHEET_NAME):
+            matches = sorted(path.glob(f'*{name}.csv'))
+            if not matches:
+                raise FileNotFoundError(f'No {name} CSV file in {path}')
+            sheet_paths[name] = matches[0]
+        return sheet_paths
+
+    if path.stem.endswith(DIRECTORS_SHEET):
+        prefix = path.stem[:-len(DIRECTORS_SHEET)]
+    elif path.stem.endswith(SHEET_NAME):
+        prefix = path.stem[:-len(SHEET_NAME)]
+    else:
+        raise FileNotFoundError(
+            f'CSV file name must end with {DIRECTORS_SHEET} or {SHEET_NAME}'
+            f': {path.name}')
+    return {name: Path(path.parent, f'{prefix}{name}{path.suffix}')
+            for name in (DIRECTORS_SHEET, SHEET_NAME)}
+
+
+def _csv_date(value: str | None) -> datetime | str | None:
+    """Return value as a datetime if it is a date, otherwise unchanged."""
+    if not value or not value[0].isdigit():
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for date_format in CSV_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return value
+
+
+# OpenDocument namespaces
+TABLE = '{urn:oasis:names:tc:opendocument:xmlns:table:1.0}'
+OFFICE = '{urn:oasis:names:tc:opendocument:xmlns:office:1.0}'
+TEXT = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+ODS_CELLS = (f'{TABLE}table-cell', f'{TABLE}covered-table-cell')
+
+
+def _ods_tables(content: object) -> dict[str, list[tuple]]:
+    """Return the rows of every table in content.xml, by name, each up to
+    the last row that is not empty."""
+    tables = {}
+    rows = width = None
+    blank_rows = 0
+    for event, element in iterparse(content, events=('start', 'end')):
+        if element.tag == f'{TABLE}table':
+            if event == 'start':
+                name = element.get(f'{TABLE}name')
+                rows, width, blank_rows = [], _sheet_width(name), 0
+                tables[name] = rows
+            else:
+                element.clear()
+        elif event == 'end' and element.tag == f'{TABLE}table-row':
+            row = _ods_row(element, width)
+            repeat = int(element.get(f'{TABLE}number-rows-repeated', 1))
+            element.clear()
+            if all(value is None for value in row):
+                # Kept only if a row with values follows
+                blank_rows += repeat
+                continue
+            rows.extend([(None,) * width] * blank_rows)
+            blank_rows = 0
+            rows.extend([row] * repeat)
+    return tables
+
+
+def _ods_row(element: object, width: int) -> tuple:
+    row = []
+    for cell in element:
+        if cell.tag not in ODS_CELLS:
+            continue
+        value = _ods_value(cell)
+        repeat = int(cell.get(f'{TABLE}number-columns-repeated', 1))
+        if value is None:
+            # Trailing blank cells are repeated to the sheet's full width
+            repeat = min(repeat, max(width - len(row), 0))
+        row.extend([value] * repeat)
+    row.extend([None] * (width - len(row)))
+    return tuple(row)
+
+
+def _ods_value(cell: object) -> object:
+    value_type = cell.get(f'{OFFICE}value-type')
+    if value_type is None:
+        return None
+    if value_type == 'date':
+        return datetime.fromisoformat(cell.get(f'{OFFICE}date-value'))
+    if value_type in ('float', 'percentage', 'currency'):
+        number = float(cell.get(f'{OFFICE}value'))
+        return int(number) if number.is_integer() else number
+    if value_type == 'boolean':
+        return cell.get(f'{OFFICE}boolean-value') == 'true'
+    paragraphs = cell.findall(f'{TEXT}p')
+    return '\n'.join(''.join(p.itertext()) for p in paragraphs) or None
+
+
+# Excel (SpreadsheetML) parts
+MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+DOC_RELS = ('{http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships}')
+PACKAGE_RELS = ('{http://schemas.openxmlformats.org/package/2006/'
+                'relationships}')
+EXCEL_EPOCH = datetime(1899, 12, 30)
+EXCEL_1904_EPOCH = datetime(1904, 1, 1)
+DATE_FORMAT_IDS = set(range(14, 23)) | {45, 46, 47}
+DATE_FORMAT_CODE = re.compile(r'[dmyhs]', re.IGNORECASE)
+FORMAT_CODE_LITERALS = re.compile(r'"[^"]*"|\\.|\[[^\]]*\]')
+CELL_REFERENCE = re.compile(r'([A-Z]+)')
+
+
+def _xlsx_sheets(xlsx: zipfile.ZipFile) -> tuple[dict[str, str], datetime]:
+    """Return the zip member of each sheet, by name, and the date epoch."""
+    targets = {}
+    with xlsx.open('xl/_rels/workbook.xml.rels') as rels:
+        for _, element in iterparse(rels):
+            if element.tag == f'{PACKAGE_RELS}Relationship':
+                target = element.get('Target')
+                if target.startswith('/'):
+                    target = target[1:]
+                else:
+                    target = posixpath.normpath(posixpath.join('xl', target))
+                targets[element.get('Id')] = target
+
+    sheet_parts = {}
+    epoch = EXCEL_EPOCH
+    with xlsx.open('xl/workbook.xml') as workbook:
+        for _, element in iterparse(workbook):
+            if element.tag == f'{MAIN}sheet':
+                sheet_parts[element.get('name')] = targets[
+                    element.get(f'{DOC_RELS}id')]
+            elif element.tag == f'{MAIN}workbookPr':
+                if element.get('date1904') in ('1', 'true'):
+                    epoch = EXCEL_1904_EPOCH
+    return sheet_parts, epoch
+
+
+def _xlsx_sheet_signatures(xlsx: zipfile.ZipFile,
+                           sheet_parts: dict[str, str],
+                           epoch: datetime) -> dict[str, tuple]:
+    """Return a signature of each sheet's content, by name.
+
+    A sheet's dates depend on its own XML, the styles and the epoch, so
+    editing another sheet leaves its signature unchanged. Strings are
+    never dates, so the shared strings are left out.
+    """
+    parts = {info.filename: (info.CRC, info.file_size)
+             for info in xlsx.infolist()}
+    styles = parts.get('xl/styles.xml', ())
+    return {name: (*parts.get(part, ()), *styles, epoch.year)
+            for name, part in sheet_parts.items()}
+
+
+def _xlsx_shared_strings(xlsx: zipfile.ZipFile) -> list[str]:
+    if 'xl/sharedStrings.xml' not in xlsx.namelist():
+        return []
+    strings = []
+    with xlsx.open('xl/sharedStrings.xml') as shared_strings:
+        for _, element in iterparse(shared_strings):
+            if element.tag == f'{MAIN}si':
+                strings.append(_xlsx_text(element))
+                element.clear()
+    return strings
+
+
+def _xlsx_text(element: object) -> str:
+    """Return the text of a string item, ignoring phonetic runs."""
+    text = element.find(f'{MAIN}t')
+    if text is not None:
+        return text.text or ''
+    return ''.join(run.findtext(f'{MAIN}t', '')
+                   for run in element.iter(f'{MAIN}r'))
+
+
+def _xlsx_date_styles(xlsx: zipfile.ZipFile) -> set[int]:
+    """Return the indexes of the cell styles that format dates."""
+    if 'xl/styles.xml' not in xlsx.namelist():
+        return set()
+    custom_formats = {}
+    cell_formats = []
+    with xlsx.open('xl/styles.xml') as styles:
+        for _, element in iterparse(styles):
+            if element.tag == f'{MAIN}numFmt':
+                custom_formats[int(element.get('numFmtId'))] = element.get(
+                    'formatCode', '')
+            elif element.tag == f'{MAIN}cellXfs':
+                cell_formats = [int(xf.get('numFmtId', 0))
+                                for xf in element.iter(f'{MAIN}xf')]
+    return {
+        index for index, format_id in enumerate(cell_formats)
+        if _is_date_format(format_id, custom_formats.get(format_id))
+    }
+
+
+def _is_date_format(format_id: int, format_code: str | None) -> bool:
+    if format_code is None:
+        return format_id in DATE_FORMAT_IDS
+    code = FORMAT_CODE_LITERALS.sub('', format_code)
+    return bool(DATE_FORMAT_CODE.search(code))
+
+
+def _xlsx_rows(sheet: object, reader: NativeXlsxReader, width: int) -> object:
+    """Yield the rows of a sheet's XML as tuples of values, with a blank
+    row for each row missing from the XML."""
+    number = 0
+    for _, element in iterparse(sheet):
+        if element.tag != f'{MAIN}row':
+            continue
+        number += 1
+        row_number = int(element.get('r', number))
+        for _ in range(row_number - number):
+            yield (None,) * width
+        number = row_number
+        row = [None] * width
+        column = -1
+        for cell in element.iter(f'{MAIN}c'):
+            # A cell without a reference follows the one before it
+            column = _column_index(cell.get('r'), column + 1)
+            if column >= len(row):
+                row.extend([None] * (column + 1 - len(row)))
+            row[column] = _xlsx_value(cell, reader)
+        element.clear()
+        yield tuple(row)
+
+
+def _column_index(reference: str | None, default: int) -> int:
+    """Return the zero based column of a cell reference such as 'AB12'."""
+    if not reference:
+        return default
+    index = 0
+    for letter in CELL_REFERENCE.match(reference).group(1):
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+
+def _xlsx_value(cell: object, reader: NativeXlsxReader) -> object:
+    cell_type = cell.get('t', 'n')
+    if cell_type == 'inlineStr':
+        inline = cell.find(f'{MAIN}is')
+        return None if inline is None else _xlsx_text(inline)
+
+    value = cell.findtext(f'{MAIN}v')
+    if value is None:
+        return None
+    if cell_type == 's':
+        return reader.shared_strings[int(value)]
+    if cell_type in ('str', 'e'):
+        return value
+    if cell_type == 'b':
+        return value == '1'
+    if cell_type == 'd':
+        return datetime.fromisoformat(value)
+
+    number = float(value) if '.' in value or 'E' in value else int(value)
+    if int(cell.get('s', 0)) in reader.date_styles:
+        return _excel_date(number, reader.epoch)
+    return number
+
+
+def _excel_date(serial: float, epoch: datetime) -> datetime:
+    """Return an Excel date serial as a datetime, to the millisecond."""
+    milliseconds = round(serial * 86_400_000)
+    return epoch + timedelta(milliseconds=milliseconds)
@@ -0,0 +1,203 @@
+"""Reconcile the BBO payouts against a BBO transaction export.
+
+Each transaction is matched to a director through hash indexes on
+username, email and initials, so the whole export is checked in one pass
+however many periods it covers.
+"""
+
+import csv
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+from psiutils.errors import ErrorMsg
+
+from directors_reimbursements.common import (
+    Dates, DateDelta, get_period_dates)
+from directors_reimbursements.config import config
+from directors_reimbursements.process import Director
+from directors_reimbursements import logger
+
+RECIPIENT_HEADINGS = ('username', 'user', 'recipient', 'to', 'email',
+                      'initials', 'player')
+AMOUNT_HEADINGS = ('amount', 'bbo$', 'dollars', 'value')
+DATE_HEADINGS = ('date', 'time', 'timestamp', 'transaction date')
+EXPORT_DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d',
+                       '%d/%m/%Y %H:%M', '%d/%m/%Y', '%m/%d/%Y')
+AMOUNT_TOLERANCE = 0.005
+
+MISSING = 'Missing'
+DUPLICATE = 'Duplicate'
+MISMATCHED = 'Mismatched'
+UNEXPECTED = 'Unexpected'
+
+
+class Transaction(NamedTuple):
+    recipient: str
+    amount: float
+    date: datetime | None
+    line: int
+
+
+class Discrepancy(NamedTuple):
+    issue: str
+    username: str
+    expected: float
+    paid: float
+    lines: str
+
+
+class DirectorIndex():
+    """The directors keyed on lower case username, email and initials."""
+    def __init__(self, directors: dict[str, Director]) -> None:
+        self.by_username = {}
+        self.by_email = {}
+        self.by_initials = {}
+        for director in directors.values():
+            _index(self.by_username, director.username, director)
+            _index(self.by_email, director.email, director)
+            _index(self.by_initials, director.initials, director)
+
+    def find(self, recipient: str) -> Director | None:
+        key = recipient.strip().lower()
+        return (self.by_username.get(key)
+                or self.by_email.get(key)
+                or self.by_initials.get(key))
+
+
+def _index(index: dict, key: str | None, director: Director) -> None:
+    if key:
+        index.setdefault(str(key).strip().lower(), director)
+
+
+def read_transactions(path: Path) -> list[Transaction] | ErrorMsg:
+    """Return the transactions in a BBO export (csv) file."""
+    try:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f_export:
+            reader = csv.reader(f_export)
+            headings = [heading.strip().lower()
+                        for heading in next(reader, [])]
+            recipient_col = _column(headings, RECIPIENT_HEADINGS)
+            amount_col = _column(headings, AMOUNT_HEADINGS)
+            date_col = _column(headings, DATE_HEADINGS)
+            if recipient_col is None or amount_col is None:
+                return ErrorMsg(
+                    header='Transaction export',
+                    message=('The export has no recipient or '
+                             f'amount column: {Path(path).name}'))
+
+            transactions = []
+            for line, row in enumerate(reader, start=2):
+                if len(row) <= max(recipient_col, amount_col):
+                    continue
+                recipient = row[recipient_col].strip()
+                amount = _amount(row[amount_col])
+                if not recipient or amount is None:
+                    continue
+                date = None
+                if date_col is not None and date_col < len(row):
+                    date = _date(row[date_col])
+                transactions.append(
+                    Transaction(recipient, amount, date, line))
+    except (FileNotFoundError, UnicodeDecodeError, csv.Error) as error:
+        logger.warning(f'Cannot read transaction export: {error}')
+        return ErrorMsg(
+            header='Transaction export',
+            message=f'Cannot read the export file: {error}')
+
+    logger.info(f'Read {len(transactions)} transactions from {path}')
+    return transactions
+
+
+def _column(headings: list[str], names: tuple[str]) -> int | None:
+    for name in names:
+        if name in headings:
+            return headings.index(name)
+    return None
+
+
+def _amount(text: str) -> float | None:
+    """Return the amount, keeping its sign so refunds reduce the total."""
+    text = text.strip().replace('$', '').replace(',', '')
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _date(text: str) -> datetime | None:
+    text = text.strip()
+    for date_format in EXPORT_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            pass
+    return None
+
+
+def payment_window(dates: Dates) -> tuple[datetime, datetime]:
+    """Return the dates between which the period's payouts are made.
+
+    The window runs from the period's payment date to the next period's,
+    so each payout is matched to the last period due when it was made.
+    """
+    # pylint: disable=no-member)
+    following = get_period_dates(
+        dates.payment_date + DateDelta(months=config.period_months))
+    return dates.payment_date, following.payment_date
+
+
+def reconcile(
+        output: list[tuple[str, float]],
+        directors: dict[str, Director],
+        transactions: list[Transaction],
+        dates: Dates | None = None) -> list[Discrepancy]:
+    """Return the discrepancies between the payouts and the transactions.
+
+    Transactions dated outside the period's payment window are ignored;
+    undated transactions are always considered.
+    """
+    index = DirectorIndex(directors)
+    expected = {username: float(dollars) for username, dollars in output}
+    window = payment_window(dates) if dates else None
+
+    paid = {}
+    unexpected = {}
+    for transaction in transactions:
+        if window and transaction.date and not (
+                window[0] <= transaction.date < window[1]):
+            continue
+        director = index.find(transaction.recipient)
+        if director and director.username in expected:
+            paid.setdefault(director.username, []).append(transaction)
+        else:
+            key = director.username if director else transaction.recipient
+            unexpected.setdefault(key, []).append(transaction)
+
+    discrepancies = []
+    for username, dollars in expected.items():
+        payments = paid.get(username, [])
+        total = sum(payment.amount for payment in payments)
+        lines = _lines(payments)
+        if not payments:
+            discrepancies.append(
+                Discrepancy(MISSING, username, dollars, 0, ''))
+        elif len(payments) > 1:
+            discrepancies.append(
+                Discrepancy(DUPLICATE, username, dollars, total, lines))
+        elif abs(total - dollars) > AMOUNT_TOLERANCE:
+            discrepancies.append(
+                Discrepancy(MISMATCHED, username, dollars, total, lines))
+
+    for recipient, payments in unexpected.items():
+        total = sum(payment.amount for payment in payments)
+        discrepancies.append(
+            Discrepancy(UNEXPECTED, recipient, 0, total, _lines(payments)))
+
+    logger.info(f'Reconciled {len(transactions)} transactions: '
+                f'{len(discrepancies)} discrepancies')
+    return discrepancies
+
+
+def _lines(transactions: list[Transaction]) -> str:
+    return ', '.join(str(transaction.line) for transaction in transactions)
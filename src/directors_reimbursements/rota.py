@@ -0,0 +1,140 @@
+"""Load the director's rota and keep it warm between runs.
+
+The opened rota is cached against the modification time and size of the
+files it is read from, so a workbook that has been pre-loaded (e.g. by the
+WorkbookWatcher) is not parsed again when the calculation is run.
+"""
+
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from directors_reimbursements.common import Dates, get_period_dates
+from directors_reimbursements.config import config
+from directors_reimbursements.preview import PeriodPreview
+from directors_reimbursements.readers import (
+    RotaReader, open_reader, rota_sources)
+from directors_reimbursements.rota_index import file_signature
+from directors_reimbursements import logger, numpy_scan
+
+
+class LoadedRota():
+    """An opened rota and the signature of the files it was read from."""
+    def __init__(self, path: Path, signature: tuple, reader: RotaReader):
+        self.path = path
+        self.signature = signature
+        self.reader = reader
+        self._session_arrays = {}
+        self._period_previews = {}
+
+    def __repr__(self) -> str:
+        return f'LoadedRota({self.path})'
+
+    def session_arrays(self, dates: Dates | None = None) -> object:
+        """Return the session sheets read for the period as NumPy arrays.
+
+        The arrays are built once per load for each set of sheets, so
+        periods in the same sheets share them.
+        """
+        key = self.reader.session_sources(dates)
+        if key not in self._session_arrays:
+            self._session_arrays[key] = numpy_scan.SessionArrays(
+                self.reader.numbered_session_rows(dates))
+        return self._session_arrays[key]
+
+    def period_preview(self, dates: Dates | None = None) -> PeriodPreview:
+        """Return the session index of the sheets read for the period,
+        built once per load for each set of sheets."""
+        key = self.reader.session_sources(dates)
+        if key not in self._period_previews:
+            self._period_previews[key] = PeriodPreview(
+                self.reader.session_rows(dates))
+        return self._period_previews[key]
+
+
+_lock = threading.Lock()  # held while parsing
+_cache_lock = threading.Lock()  # never held while parsing
+_cache: dict[Path, LoadedRota] = {}
+_failures: dict[Path, tuple[tuple | None, Exception]] = {}
+
+
+def rota_path() -> Path:
+    """Return the path to the rota workbook defined in config."""
+    # pylint: disable=no-member)
+    return Path(os.path.expanduser('~'), config.workbook_path)
+
+
+def rota_signature(path: Path) -> tuple | None:
+    """Return a tuple that changes whenever any of the rota's files do."""
+    signatures = tuple(file_signature(source) for source in rota_sources(path))
+    if None in signatures:
+        return None
+    return signatures
+
+
+def load_rota(path: Path) -> LoadedRota:
+    """Return the opened rota at path, reading it again only if it changed.
+
+    The lock is held while parsing, so a caller that arrives while the
+    workbook is being pre-loaded waits for that parse rather than
+    starting another.
+    """
+    path = Path(path)
+    with _lock:
+        signature = rota_signature(path)
+        rota = _cache.get(path)
+        if rota and signature and rota.signature == signature:
+            return rota
+
+        rota = LoadedRota(path, signature, open_reader(path))
+        with _cache_lock:
+            _cache[path] = rota
+        logger.info(f'Loaded rota {path.name}')
+        return rota
+
+
+def cached_rota(path: Path) -> LoadedRota | None:
+    """Return the parsed workbook at path if it is loaded and current."""
+    path = Path(path)
+    rota = _cache.get(path)
+    if rota and rota.signature == rota_signature(path):
+        return rota
+    return None
+
+
+def forget_rota(path: Path) -> None:
+    """Drop the parsed workbook at path, e.g. when another is chosen.
+
+    This does not wait for a parse in progress.
+    """
+    path = Path(path)
+    with _cache_lock:
+        _cache.pop(path, None)
+        _failures.pop(path, None)
+
+
+def prewarm_rota(path: Path, dates: Dates | None = None) -> None:
+    """Parse the workbook and build the period index ready for use.
+
+    dates defaults to the current period. If it fails the error is kept
+    for preload_error and raised.
+    """
+    path = Path(path)
+    dates = dates or get_period_dates(datetime.now())
+    try:
+        load_rota(path).period_preview(dates)
+    except Exception as error:
+        _failures[path] = (rota_signature(path), error)
+        raise
+    _failures.pop(path, None)
+
+
+def preload_error(path: Path) -> Exception | None:
+    """Return why the rota at path could not be pre-loaded, unless it has
+    changed since."""
+    path = Path(path)
+    failure = _failures.get(path)
+    if failure and failure[0] == rota_signature(path):
+        return failure[1]
+    return None
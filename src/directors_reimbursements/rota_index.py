@@ -0,0 +1,116 @@
+"""The range of session dates in each rota file, cached between runs.
+
+A file's range is found by reading its sessions once; it is stored with
+the file's signature and read again only when the file changes.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from functools import cache
+from pathlib import Path
+
+from directors_reimbursements.constants import (
+    USER_DATA_DIR, ROTA_INDEX_FILE, MON_DATE_COL, WED_DATE_COL)
+from directors_reimbursements import logger
+
+DateRange = tuple[datetime, datetime] | None
+
+
+def file_signature(path: Path) -> tuple | None:
+    """Return a tuple that changes whenever the file is rewritten."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def session_date_range(rows: object) -> DateRange:
+    """Return the first and last session dates in rows, or None."""
+    first = last = None
+    for row in rows:
+        for date_col in (MON_DATE_COL, WED_DATE_COL):
+            date = row[date_col] if len(row) > date_col else None
+            if isinstance(date, datetime):
+                if first is None or date < first:
+                    first = date
+                if last is None or date > last:
+                    last = date
+    if first is None:
+        return None
+    return (first, last)
+
+
+def overlaps(date_range: DateRange, start: datetime, end: datetime) -> bool:
+    """Return True if date_range has a date in start <= date < end."""
+    return (date_range is not None
+            and date_range[0] < end and date_range[1] >= start)
+
+
+class DateRangeIndex():
+    """Date ranges keyed by file (or file and sheet), saved as JSON."""
+    def __init__(self, path: Path = Path(USER_DATA_DIR, ROTA_INDEX_FILE)):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries = self._read()
+        self._changed = False
+
+    def date_range(self, key: str, signature: tuple | None,
+                   rows: callable) -> DateRange:
+        """Return the date range for key, calling rows() to find it if the
+        stored one is missing or was stored under another signature."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and signature and tuple(entry['signature']) == signature:
+                return _from_json(entry['range'])
+
+        date_range = session_date_range(rows())
+        with self._lock:
+            self._entries[key] = {
+                'signature': list(signature or ()),
+                'range': _to_json(date_range),
+            }
+            self._changed = True
+        return date_range
+
+    def save(self) -> None:
+        """Write the index if any range has been added or updated."""
+        with self._lock:
+            if not self._changed:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f_index:
+                json.dump(self._entries, f_index, indent=2)
+            os.replace(tmp_path, self.path)
+            self._changed = False
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f_index:
+                return json.load(f_index)
+        except FileNotFoundError:
+            return {}
+        except json.decoder.JSONDecodeError:
+            logger.warning(f'Invalid rota index file: {self.path}')
+            return {}
+
+
+@cache
+def shared_index() -> DateRangeIndex:
+    """Return the index shared by the readers in this process."""
+    return DateRangeIndex()
+
+
+def _to_json(date_range: DateRange) -> list[str] | None:
+    if date_range is None:
+        return None
+    return [date.isoformat() for date in date_range]
+
+
+def _from_json(date_range: list[str] | None) -> DateRange:
+    if date_range is None:
+        return None
+    return tuple(datetime.fromisoformat(date) for date in date_range)
@@ -0,0 +1,203 @@
+"""A local HTTP server that serves reimbursements as JSON.
+
+The rota is kept parsed in memory, and re-loaded by a WorkbookWatcher
+when it changes; each period is calculated once and its JSON response
+kept until then. Requests are handled by a pool of threads.
+
+    GET /health
+    GET /reimbursements?month=YYYY-MM
+"""
+
+import argparse
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from directors_reimbursements.async_log import start_logging
+from directors_reimbursements.common import Dates, get_period_dates
+from directors_reimbursements.config import config
+from directors_reimbursements.process import calculate
+from directors_reimbursements.readers import FORMAT_ERRORS
+from directors_reimbursements.rota import prewarm_rota, rota_path
+from directors_reimbursements.validation import RotaValidationError
+from directors_reimbursements.watcher import WorkbookWatcher
+from directors_reimbursements import logger
+
+JSON_TYPE = 'application/json'
+MONTH_FORMAT = '%Y-%m'
+KEEP_ALIVE_TIMEOUT = 5  # seconds
+
+
+class Reimbursements():
+    """The JSON response for each period, calculated once per rota load."""
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._responses: dict[Dates, bytes] = {}
+
+    def response(self, dates: Dates) -> bytes:
+        response = self._responses.get(dates)
+        if response is not None:
+            return response
+        with self._lock:
+            # Another thread may have calculated it while this one waited
+            response = self._responses.get(dates)
+            if response is None:
+                response = _to_json(dates, calculate(dates)[0])
+                self._responses[dates] = response
+        return response
+
+    def rota_changed(self, path: object) -> None:
+        """Re-load the rota and forget the responses calculated from it."""
+        prewarm_rota(path)
+        with self._lock:
+            self._responses.clear()
+
+
+def _to_json(dates: Dates, directors: dict) -> bytes:
+    statements = [
+        {
+            'initials': director.initials,
+            'name': director.name,
+            'username': director.username,
+            'sessions': len(director.dates),
+            'dollars': float(director.dollars),
+            'dates': director.dates,
+        }
+        for director in directors.values()
+        if director.active and director.dollars
+    ]
+    body = {
+        'start_date': dates.start_date.date().isoformat(),
+        'end_date': dates.end_date.date().isoformat(),
+        'payment_date': dates.payment_date.date().isoformat(),
+        'directors': statements,
+        'total_dollars': float(sum(
+            director.dollars for director in directors.values()
+            if director.active)),
+    }
+    return json.dumps(body).encode('utf-8')
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Answer GET requests for reimbursements."""
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, delayed ACKs
+    # hold each keep-alive response back by tens of milliseconds.
+    disable_nagle_algorithm = True
+    # Frees the pool thread held by an idle keep-alive connection
+    timeout = KEEP_ALIVE_TIMEOUT
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        url = urlsplit(self.path)
+        if url.path == '/health':
+            self._send(HTTPStatus.OK, b'{"status": "ok"}')
+        elif url.path == '/reimbursements':
+            self._reimbursements(parse_qs(url.query))
+        else:
+            self._error(HTTPStatus.NOT_FOUND, f'Unknown path: {url.path}')
+
+    def _reimbursements(self, query: dict[str, list[str]]) -> None:
+        try:
+            month = (datetime.strptime(query['month'][0], MONTH_FORMAT)
+                     if 'month' in query else datetime.now())
+        except ValueError:
+            self._error(HTTPStatus.BAD_REQUEST,
+                        'month must be given as YYYY-MM')
+            return
+
+        try:
+            response = self.server.reimbursements.response(
+                get_period_dates(month))
+        except RotaValidationError as error:
+            body = {'error': 'Problems in the rota',
+                    'problems': [problem._asdict()
+                                 for problem in error.problems]}
+            self._send(HTTPStatus.UNPROCESSABLE_ENTITY,
+                       json.dumps(body).encode('utf-8'))
+            return
+        except FORMAT_ERRORS as error:
+            logger.warning(f'Cannot read the rota: {error!r}')
+            self._error(HTTPStatus.UNPROCESSABLE_ENTITY,
+                        f'Cannot read the rota: {error!r}')
+            return
+        except (OSError, KeyError, TypeError, ValueError) as error:
+            logger.warning(f'Reimbursements request failed: {error!r}')
+            self._error(HTTPStatus.INTERNAL_SERVER_ERROR,
+                        f'Cannot calculate reimbursements: {error!r}')
+            return
+        self._send(HTTPStatus.OK, response)
+
+    def _error(self, status: HTTPStatus, message: str) -> None:
+        self._send(status, json.dumps({'error': message}).encode('utf-8'))
+
+    def _send(self, status: HTTPStatus, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', JSON_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # pylint: disable=redefined-builtin
+        logger.debug(format % args)
+
+
+class ReimbursementServer(HTTPServer):
+    """An HTTPServer that handles each connection in a thread pool."""
+    def __init__(self, address: tuple[str, int], workers: int) -> None:
+        super().__init__(address, RequestHandler)
+        self.reimbursements = Reimbursements()
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='http')
+
+    def process_request(self, request: object,
+                        client_address: tuple) -> None:
+        self.executor.submit(self._handle, request, client_address)
+
+    def _handle(self, request: object, client_address: tuple) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:  # pylint: disable=broad-except
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def serve(host: str, port: int, workers: int) -> None:
+    """Serve reimbursements until interrupted."""
+    server = ReimbursementServer((host, port), workers)
+    watcher = WorkbookWatcher(
+        rota_path(), server.reimbursements.rota_changed)
+    watcher.start()
+    logger.info(f'Serving reimbursements on http://{host}:{port}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+        server.server_close()
+
+
+def main() -> None:
+    # pylint: disable=no-member)
+    parser = argparse.ArgumentParser(
+        description='Serve director\'s reimbursements as JSON.')
+    parser.add_argument('--host', default=config.server_host)
+    parser.add_argument('--port', type=int, default=config.server_port)
+    parser.add_argument('--workers', type=int, default=config.server_workers)
+    args = parser.parse_args()
+    start_logging(config)
+    serve(args.host, args.port, args.workers)
+
+
+if __name__ == '__main__':
+    main()
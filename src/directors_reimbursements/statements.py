@@ -0,0 +1,193 @@
+"""Per-director statements of the sessions being paid for.
+
+Statements are rendered as PDF with pycairo, or as HTML if pycairo is not
+installed. A large batch is rendered in a pool of processes.
+"""
+
+import html
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import cairo
+except ImportError:  # pragma: no cover - depends on the environment
+    cairo = None
+
+from directors_reimbursements.config import config
+from directors_reimbursements.constants import DATE_FORMAT
+from directors_reimbursements.process import Director
+from directors_reimbursements import logger
+
+PDF = 'pdf'
+HTML = 'html'
+POOL_THRESHOLD = 16  # statements; fewer are rendered in this process
+CHUNK_SIZE = 8
+MAX_WORKERS = 4
+
+# PDF layout, in points on an A4 page
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+MARGIN = 56
+LINE_HEIGHT = 16
+COLUMN_WIDTH = 160
+TITLE_SIZE = 16
+TEXT_SIZE = 11
+
+
+class Statement(NamedTuple):
+    """What a statement shows; plain values so it can be sent to a worker."""
+    name: str
+    username: str
+    initials: str
+    period: str
+    dates: tuple[str]
+    amounts: tuple[Decimal]
+    dollars: Decimal
+    file_format: str
+
+    @property
+    def file_name(self) -> str:
+        start = datetime.strptime(self.period, DATE_FORMAT)
+        return (f'statement_{start:%Y%m%d}_{self.initials}.'
+                f'{self.file_format}')
+
+
+def statement_format() -> str:
+    """Return the format statements are rendered in."""
+    # pylint: disable=no-member)
+    if config.statement_format == PDF and cairo is None:
+        return HTML
+    return config.statement_format
+
+
+def create_statement(director: Director, start_date: datetime,
+                     file_format: str) -> Statement:
+    # pylint: disable=no-member)
+    return Statement(
+        name=director.name,
+        username=director.username,
+        initials=director.initials,
+        period=start_date.strftime(DATE_FORMAT),
+        dates=tuple(director.dates),
+        amounts=tuple(director.amounts),
+        dollars=director.dollars,
+        file_format=file_format,
+    )
+
+
+def render_statements(directors: list[Director],
+                      start_date: datetime) -> dict[str, tuple[str, bytes]]:
+    """Return each director's statement as {initials: (file name, data)}."""
+    file_format = statement_format()
+    statements = [create_statement(director, start_date, file_format)
+                  for director in directors]
+    if len(statements) < POOL_THRESHOLD:
+        rendered = map(render_statement, statements)
+    else:
+        # Spawned, not forked, workers: the GUI and the sink threads must
+        # not be copied into them
+        with ProcessPoolExecutor(
+                max_workers=min(MAX_WORKERS, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context('spawn')) as executor:
+            rendered = list(executor.map(
+                render_statement, statements, chunksize=CHUNK_SIZE))
+    result = {
+        statement.initials: (statement.file_name, data)
+        for statement, data in zip(statements, rendered)
+    }
+    logger.info(f'Rendered {len(result)} {file_format} statements')
+    return result
+
+
+def render_statement(statement: Statement) -> bytes:
+    if statement.file_format == PDF:
+        return _render_pdf(statement)
+    return _render_html(statement)
+
+
+def _statement_lines(statement: Statement) -> list[str]:
+    rates = set(statement.amounts)
+    rate = f'BBO${rates.pop()}' if len(rates) == 1 else 'see sessions'
+    return [
+        f'Name: {statement.name} ({statement.username})',
+        f'Period beginning: {statement.period}',
+        f'Rate per session: {rate}',
+        f'Sessions directed: {len(statement.dates)}',
+    ]
+
+
+def _render_html(statement: Statement) -> bytes:
+    details = ''.join(f'<p>{html.escape(line)}</p>'
+                      for line in _statement_lines(statement))
+    rows = ''.join(
+        f'<tr><td>{html.escape(date)}</td><td>{amount}</td></tr>'
+        for date, amount in zip(statement.dates, statement.amounts))
+    document = (
+        '<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+        f'<title>Statement {html.escape(statement.period)}</title></head>'
+        '<body><h1>Director\'s statement</h1>'
+        f'{details}'
+        '<table><tr><th>Session</th><th>BBO$</th></tr>'
+        f'{rows}'
+        f'<tr><th>Total</th><th>{statement.dollars}</th></tr>'
+        '</table></body></html>\n')
+    return document.encode('utf-8')
+
+
+def _render_pdf(statement: Statement) -> bytes:
+    buffer = io.BytesIO()
+    surface = cairo.PDFSurface(buffer, PAGE_WIDTH, PAGE_HEIGHT)
+    context = cairo.Context(surface)
+    context.select_font_face(
+        'Sans', cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_NORMAL)
+    position = _Position(context)
+
+    position.line('Director\'s statement', TITLE_SIZE)
+    position.skip()
+    for line in _statement_lines(statement):
+        position.line(line)
+    position.skip()
+    for date, amount in zip(statement.dates, statement.amounts):
+        position.row(date, f'BBO${amount}')
+    position.skip()
+    position.row('Total', f'BBO${statement.dollars}')
+
+    surface.finish()
+    return buffer.getvalue()
+
+
+class _Position():
+    """Write lines down the page, starting a new page when it is full."""
+    def __init__(self, context: object) -> None:
+        self.context = context
+        self.y = MARGIN
+
+    def line(self, text: str, size: int = TEXT_SIZE) -> None:
+        self.row(text, size=size)
+
+    def row(self, *columns: str, size: int = TEXT_SIZE) -> None:
+        if self.y > PAGE_HEIGHT - MARGIN:
+            self.context.show_page()
+            self.y = MARGIN
+        self.context.set_font_size(size)
+        for index, column in enumerate(columns):
+            self.context.move_to(MARGIN + index * COLUMN_WIDTH, self.y)
+            self.context.show_text(column)
+        self.y += LINE_HEIGHT * size / TEXT_SIZE
+
+    def skip(self) -> None:
+        self.y += LINE_HEIGHT
+
+
+def save_statements(statements: dict[str, tuple[str, bytes]],
+                    directory: Path) -> None:
+    """Write the rendered statements into directory."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for file_name, data in statements.values():
+        Path(directory, file_name).write_bytes(data)
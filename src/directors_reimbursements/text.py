@@ -9,38 +9,49 @@ Usage:
     print(txt.DELETE_PROMPT)
 """
 
-from dataclasses import dataclass, field
+from functools import cache
+from types import MappingProxyType
 from psiutils.text import Text as PsiText
 
 strings = {
     'DIRECTORS': 'Director\'s',
     'TITLE': 'Director\'s Reimbursements',
     'OUTPUT': 'Output',
+    'RECONCILE': 'Reconcile',
 }
 
 
-@dataclass
-class Text:
-    """Combines package-level (psiutils) and project-level strings.
+@cache
+def string_table() -> MappingProxyType:
+    """Return the merged, read-only string table.
 
-    Attributes from `psiutils.text.strings` are loaded first, then overridden
-    or extended by the local `strings` dictionary.
+    Strings from `psiutils.text.strings` are loaded first, then overridden
+    or extended by the local `strings` dictionary. The table is built on
+    first use and shared by every Text instance.
     """
+    return MappingProxyType({**PsiText().strings, **strings})
 
-    display: bool = field(default=False, repr=False)
 
-    def __post_init__(self) -> None:
-        """Populate the dataclass instance with string attributes."""
-        # Load psiutils strings
-        psi_text = PsiText()
-        psi_strings = psi_text.strings
-        for key, string in psi_strings.items():
-            setattr(self, key, string)
+class Text():
+    """Combines package-level (psiutils) and project-level strings.
 
-        # Override or add project-level strings
-        for key, string in strings.items():
-            setattr(self, key, string)
+    Instances are cheap, immutable views of the shared string table.
+    """
+    __slots__ = ()
 
+    def __init__(self, display: bool = False) -> None:
         # Optionally display contents of `text`
-        if self.display:
-            psi_text.display(strings)
+        if display:
+            PsiText().display(strings)
+
+    def __getattr__(self, key: str) -> str:
+        try:
+            return string_table()[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __setattr__(self, key: str, value: object) -> None:
+        raise AttributeError(f'Text is read only: {key}')
+
+    def __dir__(self) -> list[str]:
+        return sorted(string_table())
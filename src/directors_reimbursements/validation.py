@@ -0,0 +1,33 @@
+"""Problems found in the rota while it is read for a calculation."""
+
+from typing import NamedTuple
+
+
+class RotaProblem(NamedTuple):
+    """Something in the rota that stops it being calculated."""
+    sheet: str
+    row: int
+    message: str
+
+    def __str__(self) -> str:
+        return f'{self.sheet} row {self.row}: {self.message}'
+
+
+def is_heading(value: object) -> bool:
+    """Return True if a session date cell holds heading text, e.g. 'Date'.
+
+    A date typed as text has digits in it, so it is a problem, not a
+    heading, wherever the heading row is on the sheet.
+    """
+    return isinstance(value, str) and not any(
+        char.isdigit() for char in value)
+
+
+class RotaValidationError(Exception):
+    """Raised with every problem found in the rota, once it is read."""
+    def __init__(self, problems: list[RotaProblem]) -> None:
+        super().__init__(f'{len(problems)} problems in the rota')
+        self.problems = problems
+
+    def __str__(self) -> str:
+        return '\n'.join(str(problem) for problem in self.problems)
@@ -0,0 +1,162 @@
+"""Watch the rota workbook and pre-load it in the background.
+
+On Linux the directory holding the rota's files is watched with inotify;
+elsewhere, or if inotify cannot be used, the files' signature is polled.
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+
+from directors_reimbursements.rota import forget_rota, rota_signature
+from directors_reimbursements.readers import (
+    is_rota_glob, rota_exists, rota_sources)
+from directors_reimbursements import logger
+
+POLL_INTERVAL = 1.0
+SETTLE_TIME = 0.5
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class WorkbookWatcher():
+    """Call on_change, in a background thread, whenever the workbook changes.
+
+    on_change is also called once when the watcher starts, so the workbook
+    is warm before the user first asks for it.
+    """
+    def __init__(self, path: Path, on_change: callable) -> None:
+        self.path = Path(path)
+        self.on_change = on_change
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name='workbook-watcher', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching, without waiting for an on_change in progress."""
+        self._stop.set()
+
+    def _run(self) -> None:
+        self._notify()
+        directory = self.path if self.path.is_dir() else self.path.parent
+        if is_rota_glob(directory):
+            # Only the last part of the path may be a pattern
+            self._poll()
+            return
+        inotify_fd = _inotify_watch(directory)
+        if inotify_fd is None:
+            self._poll()
+            return
+        try:
+            self._watch(inotify_fd)
+        finally:
+            os.close(inotify_fd)
+
+    def _watch(self, inotify_fd: int) -> None:
+        while not self._stop.is_set():
+            ready, _, _ = select.select([inotify_fd], [], [], POLL_INTERVAL)
+            if not ready:
+                continue
+            names = _event_names(os.read(inotify_fd, 64 * 1024))
+            sources = {source.name for source in rota_sources(self.path)}
+            if (self.path.is_dir() or names & sources
+                    or is_rota_glob(self.path)
+                    and fnmatch.filter(names, self.path.name)):
+                self._settle()
+                self._notify()
+
+    def _poll(self) -> None:
+        signature = rota_signature(self.path)
+        while not self._stop.wait(POLL_INTERVAL):
+            current = rota_signature(self.path)
+            if current != signature:
+                self._settle()
+                signature = rota_signature(self.path)
+                self._notify()
+
+    def _settle(self) -> None:
+        """Wait until the file has stopped changing."""
+        signature = rota_signature(self.path)
+        while not self._stop.wait(SETTLE_TIME):
+            current = rota_signature(self.path)
+            if current == signature:
+                return
+            signature = current
+
+    def _notify(self) -> None:
+        if self._stop.is_set() or not rota_exists(self.path):
+            return
+        try:
+            self.on_change(self.path)
+        except Exception as error:  # pylint: disable=broad-except
+            # A half written or invalid workbook must not kill the watcher
+            logger.warning(f'Workbook pre-load failed: {error}')
+        if self._stop.is_set():
+            # Stopped while loading: whoever stopped it has dropped the
+            # rota, so drop what this load cached too
+            forget_rota(self.path)
+
+
+def follow_rota(watcher: WorkbookWatcher, path: Path) -> WorkbookWatcher:
+    """Return a started watcher for path.
+
+    If watcher is watching another rota it is stopped, that rota is
+    dropped from the cache and a new watcher is started for path.
+    """
+    path = Path(path)
+    if watcher.path == path:
+        return watcher
+    watcher.stop()
+    forget_rota(watcher.path)
+    logger.info(f'Watching rota {path}')
+    watcher = WorkbookWatcher(path, watcher.on_change)
+    watcher.start()
+    return watcher
+
+
+def _inotify_watch(directory: Path) -> int | None:
+    """Return an inotify file descriptor watching directory, or None."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        inotify_fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if inotify_fd < 0:
+        return None
+    mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    watch = libc.inotify_add_watch(
+        inotify_fd, os.fsencode(directory), mask)
+    if watch < 0:
+        os.close(inotify_fd)
+        return None
+    return inotify_fd
+
+
+def _event_names(buffer: bytes) -> set[str]:
+    """Return the file names in a buffer of inotify events."""
+    names = set()
+    offset = 0
+    while offset + EVENT_HEADER.size <= len(buffer):
+        _, _, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+        offset += EVENT_HEADER.size
+        name = buffer[offset:offset + length].rstrip(b'\0')
+        names.add(os.fsdecode(name))
+        offset += length
+    return names
@@ -0,0 +1,87 @@
+import gzip
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+from directors_reimbursements.archive import StatementArchive
+from directors_reimbursements.process import Director
+
+
+def _director(initials, name):
+    return Director(initials, name, f'{initials.lower()}@example.com',
+                    f'user_{initials}', ['06 Jan 2025'], True)
+
+
+def test_runs_appended_and_found(tmp_path):
+    archive = StatementArchive(tmp_path)
+    first, second = _director('AB', 'Anne Bee'), _director('CD', 'Cy Dee')
+    archive.add_run(datetime(2025, 1, 1), [
+        (first, 'January to March for AB', ('ab.html', b'<p>AB</p>')),
+        (second, 'January to March for CD', None),
+    ], run_at=datetime(2025, 4, 2, 10))
+    archive.add_run(datetime(2025, 4, 1), [
+        (first, 'April to June for AB', None),
+    ], run_at=datetime(2025, 7, 3, 9))
+
+    entries = archive.find(director='ab')
+    assert [entry.period for entry in entries] == ['2025-01-01',
+                                                   '2025-04-01']
+    assert archive.text(entries[1]) == 'April to June for AB'
+    assert archive.document(entries[0]) == b'<p>AB</p>'
+    assert archive.document(entries[1]) is None
+
+    assert len(archive.find(email='CD@example.com')) == 1
+    assert len(archive.find(director='Bee', run='2025-04')) == 1
+    assert archive.find(period='2024') == []
+
+    # The archive as a whole is one gzip stream of every member
+    with gzip.open(archive.path) as f_archive:
+        assert b'April to June for AB' in f_archive.read()
+
+
+def test_exact_director_matches_the_whole_name(tmp_path):
+    archive = StatementArchive(tmp_path)
+    archive.add_run(datetime(2025, 1, 1), [
+        (_director('AB', 'Anne Bee'), 'For AB', None),
+        (_director('CD', 'Cy Dee'), 'For CD', None),
+    ])
+
+    assert len(archive.find(director='ee')) == 2
+    assert archive.find(director='ee', exact=True) == []
+    assert [entry.initials for entry in archive.find(
+        director='cy dee', exact=True)] == ['CD']
+    assert len(archive.find(director='ab', exact=True)) == 1
+
+
+def test_wildcards_match_themselves(tmp_path):
+    archive = StatementArchive(tmp_path)
+    archive.add_run(datetime(2025, 1, 1), [
+        (_director('AB', 'Anne Bee'), 'For AB', None),
+        (_director('CD', '100% Dee'), 'For CD', None),
+    ], run_at=datetime(2025, 4, 2, 10))
+
+    assert archive.find(director='_') == []
+    assert [entry.initials for entry in archive.find(
+        director='0%')] == ['CD']
+    assert archive.find(director='!') == []
+    assert archive.find(period='2025_01') == []
+    assert archive.find(run='2025%') == []
+    assert len(archive.find(period='2025-01')) == 2
+
+
+def test_schema_created_once_per_archive(tmp_path):
+    archive = StatementArchive(tmp_path)
+    archive.add_run(datetime(2025, 1, 1), [
+        (_director('AB', 'Anne Bee'), 'For AB', None)])
+    with closing(sqlite3.connect(archive.index_path)) as connection:
+        connection.execute('DROP INDEX statements_run_at')
+
+    archive.add_run(datetime(2025, 4, 1), [
+        (_director('AB', 'Anne Bee'), 'For AB', None)])
+    assert len(archive.find(director='AB')) == 2
+
+    with closing(sqlite3.connect(archive.index_path)) as connection:
+        indexes = {name for (name,) in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert 'statements_run_at' not in indexes
+    assert 'statements_initials' in indexes
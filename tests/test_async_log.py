@@ -0,0 +1,53 @@
+import logging
+from types import SimpleNamespace
+
+from directors_reimbursements.async_log import (
+    disable_async_logging, enable_async_logging, start_logging)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_records_are_flushed_on_disable():
+    disable_async_logging()
+    root_logger = logging.getLogger()
+    handlers = list(root_logger.handlers)
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+    sink = ListHandler()
+    root_logger.addHandler(sink)
+    try:
+        async_logging = enable_async_logging(queue_size=1000)
+        for index in range(100):
+            logging.getLogger('test').warning('record %d', index)
+        disable_async_logging()
+
+        assert async_logging.handler.dropped == 0
+        assert sink.messages == [f'record {index}' for index in range(100)]
+        assert root_logger.handlers == [sink]
+    finally:
+        root_logger.removeHandler(sink)
+        for handler in handlers:
+            root_logger.addHandler(handler)
+
+
+def test_logging_is_started_only_if_configured():
+    disable_async_logging()
+    root_logger = logging.getLogger()
+    handlers = list(root_logger.handlers)
+    assert start_logging(SimpleNamespace(async_logging=False)) is None
+    assert root_logger.handlers == handlers
+
+    async_logging = start_logging(SimpleNamespace(
+        async_logging=True, log_queue_size=10, log_format='text'))
+    try:
+        assert root_logger.handlers == [async_logging.handler]
+    finally:
+        disable_async_logging()
+    assert root_logger.handlers == handlers
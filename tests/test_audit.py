@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from directors_reimbursements.audit import (
+    NEVER_PAID, PAID_TWICE, audit_sessions)
+from directors_reimbursements.history import PaidPeriod, RunHistory
+
+
+def _period(start, end):
+    return PaidPeriod(start, end, 1, 3, datetime(2025, 1, 1))
+
+
+def test_overlaps_and_gaps_are_found():
+    periods = [
+        _period(datetime(2024, 1, 1), datetime(2024, 3, 31)),
+        # period_months changed from 3 to 2 part way through
+        _period(datetime(2024, 3, 1), datetime(2024, 4, 30)),
+        _period(datetime(2024, 6, 1), datetime(2024, 7, 31)),
+    ]
+    sessions = [
+        (datetime(2023, 12, 4), 'AB'),
+        (datetime(2024, 2, 5), 'AB'),
+        (datetime(2024, 3, 4), 'CD'),
+        (datetime(2024, 5, 6), 'AB'),
+        (datetime(2024, 6, 3), 'CD'),
+        (datetime(2024, 9, 2), 'AB'),
+    ]
+
+    findings = audit_sessions(sessions, periods)
+
+    assert [(item.date, item.director, item.issue) for item in findings] == [
+        ('04 Mar 2024', 'CD', PAID_TWICE),
+        ('06 May 2024', 'AB', NEVER_PAID),
+    ]
+    assert findings[0].periods == ('01 Jan 2024 to 31 Mar 2024, '
+                                   '01 Mar 2024 to 30 Apr 2024')
+
+
+def test_history_keeps_one_record_per_period(tmp_path):
+    class Dates():
+        start_date = datetime(2024, 1, 1)
+        end_date = datetime(2024, 3, 31)
+
+    history = RunHistory(tmp_path / 'history.json')
+    history.record(Dates())
+    history.record(Dates())
+
+    periods = RunHistory(tmp_path / 'history.json').periods
+    assert [(item.start_date, item.end_date) for item in periods] == [
+        (Dates.start_date, Dates.end_date)]
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+from directors_reimbursements import debounce
+from directors_reimbursements.debounce import (
+    Debouncer, GeometrySaver, forget_file, is_file)
+
+
+class FakeRoot():
+    """Stands in for a tk widget: after jobs run only when told to."""
+    def __init__(self) -> None:
+        self.jobs = {}
+        self.size = '400x300+0+0'
+
+    def after(self, delay_ms, func):
+        job = f'after#{len(self.jobs)}'
+        self.jobs[job] = func
+        return job
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+    def run_pending(self):
+        jobs, self.jobs = self.jobs, {}
+        for func in jobs.values():
+            func()
+
+    def geometry(self):
+        return self.size
+
+
+def test_debouncer_calls_once_with_the_last_arguments():
+    root, calls = FakeRoot(), []
+    debouncer = Debouncer(root, 150, calls.append)
+
+    for value in 'abc':
+        debouncer(value)
+    assert len(root.jobs) == 1
+    root.run_pending()
+
+    assert calls == ['c']
+
+
+def test_debouncer_flush_and_cancel():
+    root, calls = FakeRoot(), []
+    debouncer = Debouncer(root, 150, calls.append)
+
+    debouncer('a')
+    debouncer.flush()
+    debouncer.flush()
+    debouncer('b')
+    debouncer.cancel()
+    root.run_pending()
+
+    assert calls == ['a']
+    assert not root.jobs
+
+
+def test_geometry_saved_once_it_settles_and_changes(monkeypatch):
+    saved = []
+    monkeypatch.setattr(debounce, 'window_resize',
+                        lambda form, file: saved.append(form.root.size))
+    form = SimpleNamespace(root=FakeRoot())
+    saver = GeometrySaver(form, 'frm_test.py')
+
+    saver(SimpleNamespace(widget='a child widget'))
+    assert not form.root.jobs
+    for _ in range(3):
+        saver(SimpleNamespace(widget=form.root))
+    form.root.run_pending()
+    saver()
+    form.root.run_pending()
+    form.root.size = '500x300+0+0'
+    saver()
+    saver.flush()
+
+    assert saved == ['400x300+0+0', '500x300+0+0']
+
+
+def test_is_file_stats_again_once_stale_or_forgotten(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(debounce, 'time',
+                        SimpleNamespace(monotonic=lambda: now[0]))
+    path = tmp_path / 'rota.xlsx'
+    path.write_text('rota')
+
+    assert is_file(path)
+    path.unlink()
+    assert is_file(path)
+    now[0] += debounce.FILE_CHECK_TTL
+    assert not is_file(path)
+
+    path.write_text('rota')
+    forget_file(path)
+    assert is_file(path)
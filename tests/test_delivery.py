@@ -0,0 +1,110 @@
+import smtplib
+import socket
+from email.mime.text import MIMEText
+from types import SimpleNamespace
+
+import pytest
+
+from directors_reimbursements import delivery
+from directors_reimbursements.delivery import (
+    DeliveryError, SmtpDelivery, TokenBucket, _is_permanent, _is_transient)
+from directors_reimbursements.outbox import Outbox, deliver_pending
+
+CONFIG = SimpleNamespace(
+    smtp_rate=100, smtp_burst=5, smtp_connect_timeout=1,
+    smtp_command_timeout=1, smtp_max_retries=3, smtp_backoff=0.1)
+
+
+class FakeSmtp():
+    replies = []
+    connections = 0
+
+    def __init__(self, *args, **kwargs):
+        FakeSmtp.connections += 1
+        self.sock = SimpleNamespace(settimeout=lambda timeout: None)
+
+    def login(self, *args):
+        pass
+
+    def sendmail(self, *args):
+        reply = FakeSmtp.replies.pop(0)
+        if reply:
+            raise reply
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture(name='smtp')
+def fixture_smtp(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(delivery.smtplib, 'SMTP_SSL', FakeSmtp)
+    monkeypatch.setattr(delivery.time, 'sleep', sleeps.append)
+    FakeSmtp.connections = 0
+    return sleeps
+
+
+def _message():
+    msg = MIMEText('body')
+    msg['To'] = 'director@example.com'
+    return msg
+
+
+def test_classification():
+    assert _is_permanent(smtplib.SMTPDataError(550, b'No such user'))
+    assert not _is_permanent(smtplib.SMTPDataError(451, b'Try later'))
+    assert not _is_permanent(smtplib.SMTPServerDisconnected())
+    assert not _is_permanent(socket.timeout())
+    assert not _is_permanent(socket.gaierror())
+    assert not _is_permanent(
+        smtplib.SMTPSenderRefused(550, b'Bad sender', 'club@example.com'))
+    assert not _is_permanent(smtplib.SMTPConnectError(554, b'No service'))
+    assert not _is_transient(socket.gaierror())
+    assert not _is_transient(smtplib.SMTPHeloError(501, b'Bad HELO'))
+
+
+def test_transient_failure_is_retried_with_backoff(smtp):
+    FakeSmtp.replies = [smtplib.SMTPDataError(421, b'Slow down'),
+                        smtplib.SMTPServerDisconnected(), None]
+    with SmtpDelivery(CONFIG) as sender:
+        sender.send(_message())
+        assert sender.bucket.rate < CONFIG.smtp_rate
+    assert len(smtp) == 2
+    assert smtp[1] > smtp[0]
+    assert FakeSmtp.connections == 2
+
+
+def test_permanent_failure_is_not_retried(smtp):
+    FakeSmtp.replies = [smtplib.SMTPDataError(550, b'No such user')]
+    with SmtpDelivery(CONFIG) as sender:
+        with pytest.raises(DeliveryError) as error:
+            sender.send(_message())
+    assert error.value.permanent
+    assert not smtp
+
+
+def test_token_bucket_waits_when_empty(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(delivery.time, 'sleep', sleeps.append)
+    monkeypatch.setattr(delivery.time, 'monotonic', lambda: 0.0)
+    bucket = TokenBucket(rate=2, burst=2)
+    for _ in range(3):
+        bucket.acquire()
+    assert sleeps == [0.5]
+
+
+class OfflineSmtp():
+    def __init__(self, *args, **kwargs):
+        raise socket.gaierror(-3, 'Temporary failure in name resolution')
+
+
+def test_offline_leaves_the_outbox_pending(smtp, monkeypatch, tmp_path):
+    monkeypatch.setattr(delivery.smtplib, 'SMTP_SSL', OfflineSmtp)
+    outbox = Outbox(tmp_path)
+    for _ in range(3):
+        outbox.add(_message())
+
+    assert deliver_pending(outbox) == (0, 3)
+    assert len(outbox.pending()) == 3
+    assert not list(outbox.failed.iterdir())
+    assert not smtp
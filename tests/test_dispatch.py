@@ -0,0 +1,139 @@
+from datetime import datetime
+
+from psiutils.errors import ErrorMsg
+
+from directors_reimbursements import dispatch, emails
+from directors_reimbursements.archive import StatementArchive
+from directors_reimbursements.fingerprints import StatementFingerprints
+from directors_reimbursements.process import Director
+
+START_DATE = datetime(2025, 1, 1)
+
+
+class ListSink(dispatch.Sink):
+    name = 'List'
+
+    def __init__(self, directory, fail_on=None):
+        super().__init__(START_DATE)
+        self.fingerprints = StatementFingerprints(
+            START_DATE, self.kind, directory)
+        self.emails = []
+        self.fail_on = fail_on
+
+    def deliver(self, email):
+        if email.director.initials == self.fail_on:
+            return ErrorMsg(header='Email error', message='Refused')
+        self.emails.append(email)
+        return None
+
+
+def _directors():
+    directors = {
+        f'D{index}': Director(f'D{index}', f'Name {index}',
+                              f'd{index}@example.com', f'user{index}',
+                              ['06 Jan 2025'], True)
+        for index in range(3)
+    }
+    directors['D2'].dates, directors['D2'].amounts = [], []
+    return directors
+
+
+def test_emails_rendered_once_for_every_sink(monkeypatch, tmp_path):
+    monkeypatch.setattr(dispatch, 'email_template',
+                        lambda path: 'Dear <first name>, <dollars>')
+    monkeypatch.setattr(dispatch, 'render_statements',
+                        lambda directors, start_date: {})
+    first = ListSink(tmp_path / 'first')
+    second = ListSink(tmp_path / 'second', fail_on='D1')
+    archive = StatementArchive(tmp_path / 'archive')
+    file_sink = dispatch.FileSink(
+        START_DATE, tmp_path / 'emails.txt', archive)
+    file_sink.fingerprints = StatementFingerprints(
+        START_DATE, file_sink.kind, tmp_path / 'file')
+
+    results = dispatch.dispatch(
+        START_DATE, _directors(), [first, second, file_sink])
+
+    assert [result.delivered for result in results] == [2, 1, 2]
+    assert results[1].error.message == 'Refused'
+    assert first.emails[0] is second.emails[0]
+    assert 'Dear Name, 3' in (tmp_path / 'emails.txt').read_text()
+    assert [entry.initials for entry in archive.find()] == ['D0', 'D1']
+
+    again = ListSink(tmp_path / 'first')
+    results = dispatch.dispatch(START_DATE, _directors(), [again],
+                                changed_only=True)
+    assert results[0].delivered == 0
+
+
+def test_template_read_again_only_when_changed(tmp_path):
+    template_path = tmp_path / 'template.txt'
+    template_path.write_text('First')
+    assert emails.email_template(template_path) == 'First'
+    template_path.write_text('Second version')
+    assert emails.email_template(template_path) == 'Second version'
+    assert emails.email_template(template_path) == 'Second version'
+
+
+class BrokenSink(ListSink):
+    name = 'Broken'
+
+    def deliver(self, email):
+        if self.emails:
+            raise PermissionError('Outbox is read only')
+        return super().deliver(email)
+
+
+def test_sink_exception_is_its_result(monkeypatch, tmp_path):
+    monkeypatch.setattr(dispatch, 'email_template', lambda path: 'Body')
+    monkeypatch.setattr(dispatch, 'render_statements',
+                        lambda directors, start_date: {})
+    broken = BrokenSink(tmp_path / 'broken')
+    other = ListSink(tmp_path / 'other')
+
+    results = dispatch.dispatch(START_DATE, _directors(), [broken, other])
+
+    assert 'Outbox is read only' in results[0].error.message
+    assert results[0].delivered == 1
+    assert results[1].delivered == 2
+    assert StatementFingerprints(
+        START_DATE, broken.kind, tmp_path / 'broken').fingerprints
+
+
+def test_nothing_delivered_after_a_setup_error(monkeypatch, tmp_path):
+    monkeypatch.setattr(dispatch, 'email_template', lambda path: 'Body')
+    monkeypatch.setattr(dispatch, 'render_statements',
+                        lambda directors, start_date: {})
+    messages = []
+
+    def create_message(subject, body, recipient, attachment):
+        if messages:
+            raise TypeError('No sender')
+        messages.append(recipient)
+        return recipient
+
+    monkeypatch.setattr(dispatch, 'create_message', create_message)
+    sink = ListSink(tmp_path)
+
+    result = dispatch.dispatch(START_DATE, _directors(), [sink])
+
+    assert result.message == 'Email setup error.'
+    assert not sink.emails
+
+
+def test_emails_file_kept_when_nobody_is_selected(monkeypatch, tmp_path):
+    monkeypatch.setattr(dispatch, 'email_template', lambda path: 'Body')
+    email_file = tmp_path / 'emails.txt'
+    email_file.write_text('Earlier run', encoding='utf-8')
+    file_sink = dispatch.FileSink(START_DATE, email_file)
+    file_sink.fingerprints = StatementFingerprints(
+        START_DATE, file_sink.kind, tmp_path / 'file')
+    for director in _directors().values():
+        file_sink.fingerprints.record(director)
+    file_sink.fingerprints.save()
+
+    results = dispatch.dispatch(START_DATE, _directors(), [file_sink],
+                                changed_only=True)
+
+    assert results[0].delivered == 0
+    assert email_file.read_text(encoding='utf-8') == 'Earlier run'
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from directors_reimbursements import dispatch
+from directors_reimbursements.fingerprints import (
+    FILED, SENT, StatementFingerprints)
+from directors_reimbursements.process import Director
+
+START_DATE = datetime(2025, 1, 1)
+
+
+def _director(initials, dates):
+    return Director(initials, f'{initials} Name', f'{initials}@example.com',
+                    f'user_{initials}', list(dates), True)
+
+
+def test_only_changed_statements_are_changed(tmp_path):
+    director = _director('AB', ['06 Jan 2025'])
+    fingerprints = StatementFingerprints(START_DATE, SENT, tmp_path)
+    assert fingerprints.changed(director)
+    fingerprints.record(director)
+    fingerprints.save()
+
+    fingerprints = StatementFingerprints(START_DATE, SENT, tmp_path)
+    assert not fingerprints.changed(_director('AB', ['06 Jan 2025']))
+    assert fingerprints.changed(
+        _director('AB', ['06 Jan 2025', '08 Jan 2025']))
+    assert fingerprints.changed(_director('CD', ['06 Jan 2025']))
+
+    # Each kind of output, and each period, has its own fingerprints
+    assert StatementFingerprints(START_DATE, FILED, tmp_path).changed(
+        director)
+    assert StatementFingerprints(datetime(2025, 4, 1), SENT,
+                                 tmp_path).changed(director)
+
+
+def test_invalid_file_is_treated_as_empty(tmp_path):
+    fingerprints = StatementFingerprints(START_DATE, SENT, tmp_path)
+    fingerprints.path.write_text('{not json', encoding='utf-8')
+    assert StatementFingerprints(START_DATE, SENT, tmp_path).fingerprints \
+        == {}
+
+
+class ListSink(dispatch.Sink):
+    name = 'List'
+
+    def __init__(self, directory):
+        super().__init__(START_DATE)
+        self.fingerprints = StatementFingerprints(
+            START_DATE, self.kind, directory)
+        self.emails = []
+
+    def deliver(self, email):
+        self.emails.append(email.director.initials)
+        return None
+
+
+def test_changed_only_dispatch(monkeypatch, tmp_path):
+    monkeypatch.setattr(dispatch, 'email_template', lambda path: 'Body')
+    directors = {initials: _director(initials, ['06 Jan 2025'])
+                 for initials in ('AB', 'CD')}
+    dispatch.dispatch(START_DATE, directors, [ListSink(tmp_path)])
+
+    directors['CD'] = _director('CD', ['06 Jan 2025', '13 Jan 2025'])
+    sink = ListSink(tmp_path)
+    results = dispatch.dispatch(START_DATE, directors, [sink],
+                                changed_only=True)
+    assert sink.emails == ['CD']
+    assert results[0].delivered == 1
+
+    sink = ListSink(tmp_path)
+    dispatch.dispatch(START_DATE, directors, [sink])
+    assert sink.emails == ['AB', 'CD']
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import pytest
+
+from directors_reimbursements.common import Dates
+from directors_reimbursements.process import Director, _get_dates_directed
+from directors_reimbursements import numpy_scan
+
+pytest.importorskip('numpy')
+
+ROWS = [
+    ('Date', 'Director', 'Alternate', 'Date', 'Director', 'Alternate'),
+    (datetime(2024, 12, 30), 'AB', None, datetime(2025, 1, 1), 'CD', None),
+    (datetime(2025, 1, 6), 'AB', 'CD', datetime(2025, 1, 8), None, None),
+    (datetime(2025, 2, 3, 19), 'CD', None, datetime(2025, 2, 5), 'AB', 'EF'),
+    (None, 'AB', None, datetime(2025, 2, 12), 'CD', None),
+    (datetime(2025, 3, 31), 'AB', None, datetime(2025, 3, 30), 'EF', None),
+    (datetime(2025, 4, 7), 'AB', None, datetime(2025, 4, 9), 'CD', None),
+]
+
+DATES = Dates(datetime(2025, 1, 1), datetime(2025, 3, 31),
+              datetime(2025, 4, 1))
+
+
+def _numbered(rows):
+    return (('Main', number, row)
+            for number, row in enumerate(rows, start=1))
+
+
+class Reader():
+    def numbered_session_rows(self, dates=None):
+        return _numbered(ROWS)
+
+
+def _directors() -> dict[str, Director]:
+    return {
+        initials: Director(initials, f'{initials} Name', '', initials, [],
+                           True)
+        for initials in ('AB', 'CD', 'EF')
+    }
+
+
+def test_matches_row_scan():
+    expected = _directors()
+    expected_directed = _get_dates_directed(DATES, Reader(), expected)
+
+    directors = _directors()
+    sessions = numpy_scan.SessionArrays(_numbered(ROWS))
+    directed = numpy_scan.get_dates_directed(DATES, sessions, directors)
+
+    assert directed == expected_directed
+    for initials, director in expected.items():
+        assert directors[initials].dates == director.dates
+        assert directors[initials].amounts == director.amounts
+
+
+def test_unknown_initials_raise_key_error():
+    directors = _directors()
+    del directors['EF']
+    sessions = numpy_scan.SessionArrays(_numbered(ROWS))
+    with pytest.raises(KeyError):
+        numpy_scan.get_dates_directed(DATES, sessions, directors)
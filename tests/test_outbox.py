@@ -0,0 +1,79 @@
+import smtplib
+from email.mime.text import MIMEText
+from types import SimpleNamespace
+
+import pytest
+
+from directors_reimbursements import delivery
+from directors_reimbursements.outbox import (
+    DELIVERED_SUFFIX, Outbox, deliver_pending, start_delivery)
+
+
+class FakeSmtp():
+    down = False
+    sent = []
+
+    def __init__(self, *args, **kwargs):
+        self.sock = SimpleNamespace(settimeout=lambda timeout: None)
+
+    def login(self, *args):
+        pass
+
+    def sendmail(self, sender, recipient, message):
+        if FakeSmtp.down:
+            raise smtplib.SMTPServerDisconnected('Connection lost')
+        FakeSmtp.sent.append(recipient)
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture(name='outbox')
+def fixture_outbox(tmp_path, monkeypatch):
+    monkeypatch.setattr(delivery.smtplib, 'SMTP_SSL', FakeSmtp)
+    monkeypatch.setattr(delivery.time, 'sleep', lambda delay: None)
+    FakeSmtp.down = False
+    FakeSmtp.sent = []
+    outbox = Outbox(tmp_path)
+    for index in range(3):
+        msg = MIMEText('body')
+        msg['To'] = f'd{index}@example.com'
+        outbox.add(msg)
+    return outbox
+
+
+def test_delivered_messages_move_to_cur(outbox):
+    assert deliver_pending(outbox) == (3, 0)
+
+    assert FakeSmtp.sent == ['d0@example.com', 'd1@example.com',
+                             'd2@example.com']
+    assert not outbox.pending()
+    delivered = sorted(path.name for path in outbox.cur.iterdir())
+    assert len(delivered) == 3
+    assert all(name.endswith(DELIVERED_SUFFIX) and ':' not in name
+               for name in delivered)
+
+
+def test_transient_failure_leaves_messages_pending(outbox):
+    FakeSmtp.down = True
+    assert deliver_pending(outbox) == (0, 3)
+    assert len(outbox.pending()) == 3
+    assert not list(outbox.cur.iterdir())
+    assert not list(outbox.failed.iterdir())
+
+
+def test_restart_resumes_delivery(outbox):
+    FakeSmtp.down = True
+    deliver_pending(outbox)
+
+    # A message left half written in tmp by a crash is never sent
+    (outbox.tmp / 'partial').write_bytes(b'To: d9@exa')
+
+    FakeSmtp.down = False
+    worker = start_delivery(outbox)
+    worker.join(timeout=10)
+
+    assert FakeSmtp.sent == ['d0@example.com', 'd1@example.com',
+                             'd2@example.com']
+    assert not outbox.pending()
+    assert start_delivery(outbox) is None
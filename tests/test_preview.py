@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from directors_reimbursements.common import Dates
+from directors_reimbursements.config import config
+from directors_reimbursements.preview import PeriodPreview, PeriodSummary
+
+ROWS = [
+    ('Date', 'Director', 'Alternate', 'Date', 'Director', 'Alternate'),
+    (datetime(2025, 4, 7), 'CD', None, None, None, None),
+    (datetime(2025, 1, 6), 'AB', None, datetime(2025, 1, 8), 'CD', 'AB'),
+    (None, None, None, None, None, None),
+    (datetime(2025, 1, 13), None, None, '15 Jan', 'CD', None),
+    (datetime(2025, 3, 31), 'EF', None, None, None, None),
+]
+DATES = Dates(datetime(2025, 1, 1), datetime(2025, 3, 31),
+              datetime(2025, 4, 1))
+
+
+def test_sessions_in_date_order_with_alternates():
+    preview = PeriodPreview(ROWS)
+    assert preview.sessions() == [
+        (datetime(2025, 1, 6), 'AB'),
+        (datetime(2025, 1, 8), 'AB'),
+        (datetime(2025, 3, 31), 'EF'),
+        (datetime(2025, 4, 7), 'CD'),
+    ]
+
+
+def test_summary_of_the_period(monkeypatch):
+    monkeypatch.setattr(config, 'payment_rates', {'2025-01-07': 4})
+    monkeypatch.setattr(config, 'payment_bbo', 3)
+    preview = PeriodPreview(ROWS)
+
+    # The end date is not in the period, as in the calculation
+    assert preview.summary(DATES) == PeriodSummary(
+        sessions=2, directors=1, dollars=7)
+
+    later = Dates(datetime(2025, 4, 1), datetime(2025, 6, 30),
+                  datetime(2025, 7, 1))
+    assert preview.summary(later) == PeriodSummary(1, 1, 4)
+
+
+def test_summary_follows_a_rate_change(monkeypatch):
+    monkeypatch.setattr(config, 'payment_rates', {})
+    monkeypatch.setattr(config, 'payment_bbo', 3)
+    preview = PeriodPreview(ROWS)
+    assert preview.summary(DATES).dollars == 6
+
+    monkeypatch.setattr(config, 'payment_bbo', 4)
+    assert preview.summary(DATES).dollars == 8
+    monkeypatch.setattr(config, 'payment_rates', {'2025-01-07': 5})
+    assert preview.summary(DATES).dollars == 9
@@ -0,0 +1,65 @@
+from datetime import datetime
+from decimal import Decimal
+
+from directors_reimbursements.common import Dates
+from directors_reimbursements.process import Director, _get_dates_directed
+from directors_reimbursements.rates import RATES_TABLE, RateTimeline
+from directors_reimbursements.validation import RotaProblem
+
+RATES = {
+    '2025-02-01': 4,
+    '2025-03-01': 5,
+    '2025-03-01_Wed': 6,
+    '2025-13-01': 9,
+}
+
+
+def test_rate_in_effect_on_each_date():
+    rates = RateTimeline(RATES, 3)
+    assert rates.problems == [RotaProblem(
+        RATES_TABLE, 4, 'Invalid payment rate date: 2025-13-01')]
+    assert rates.rate(datetime(2025, 1, 6)) == 3
+    assert rates.rate(datetime(2025, 2, 1)) == 4
+    assert rates.rate(datetime(2025, 2, 26)) == 4
+    assert rates.rate(datetime(2025, 3, 3)) == 5
+    assert rates.rate(datetime(2025, 3, 5)) == 6
+
+
+class Reader():
+    def numbered_session_rows(self, dates=None):
+        rows = [
+            (datetime(2025, 1, 6), 'AB', None, datetime(2025, 1, 8), 'AB',
+             None),
+            (datetime(2025, 3, 3), 'AB', None, datetime(2025, 3, 5), 'CD',
+             'AB'),
+        ]
+        return (('Main', number, row)
+                for number, row in enumerate(rows, start=1))
+
+
+def test_sessions_priced_at_their_date():
+    directors = {
+        initials: Director(initials, initials, '', initials, [], True)
+        for initials in ('AB', 'CD')
+    }
+    dates = Dates(datetime(2025, 1, 1), datetime(2025, 3, 31),
+                  datetime(2025, 4, 1))
+    _get_dates_directed(dates, Reader(), directors, rates=RateTimeline(
+        RATES, 3))
+    assert directors['AB'].amounts == [3, 3, 5, 6]
+    assert directors['AB'].dollars == 17
+    assert directors['CD'].dollars == 0
+
+
+def test_rates_are_exact_and_bad_ones_reported():
+    rates = RateTimeline({'2025-01-01': 0.1, '2025-02-01': 'three',
+                          '2025-03-01': -1, '2025-04-01_Fun': 2}, 3.3)
+    assert rates.rate(datetime(2024, 12, 2)) == Decimal('3.3')
+    assert sum(rates.rate(datetime(2025, 1, day)) for day in (6, 7, 8)) \
+        == Decimal('0.3')
+    assert rates.rate(datetime(2025, 3, 3)) == Decimal('0.1')
+    assert [problem.row for problem in rates.problems] == [2, 3, 4]
+
+    rates = RateTimeline({}, 'nan')
+    assert rates.default == 0
+    assert rates.problems[0].sheet == 'payment_bbo'
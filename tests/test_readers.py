@@ -0,0 +1,279 @@
+import csv
+import io
+import zipfile
+from datetime import datetime
+from types import SimpleNamespace
+
+from openpyxl import Workbook
+
+from directors_reimbursements import readers
+from directors_reimbursements.common import Dates
+from directors_reimbursements.config import config
+from directors_reimbursements.readers import (
+    CsvReader, MultiRotaReader, NativeXlsxReader, OdsReader, XlsxReader,
+    open_reader)
+from directors_reimbursements.rota import LoadedRota
+from directors_reimbursements.rota_index import DateRangeIndex
+
+DIRECTORS = [
+    ('Initials', 'Name', 'Email', 'Username', 'Active'),
+    ('AB', 'Ann Bee', 'ann@example.com', 'annb', 'y'),
+    ('CD', 'Cy Dee', 'cy@example.com', 'cyd', None),
+]
+SESSIONS = [
+    ('Date', 'Director', 'Alternate', 'Date', 'Director', 'Alternate'),
+    (datetime(2025, 1, 6), 'AB', None, datetime(2025, 1, 8), 'CD', 'AB'),
+    (datetime(2025, 1, 13), 'CD', None, None, None, None),
+]
+
+
+def _write_xlsx(path):
+    workbook = Workbook()
+    workbook.active.title = 'Directors'
+    for row in DIRECTORS:
+        workbook['Directors'].append(row)
+    workbook.create_sheet('Main')
+    for row in SESSIONS:
+        workbook['Main'].append(row)
+    workbook.save(path)
+
+
+def _write_csv(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f_csv:
+        writer = csv.writer(f_csv)
+        for row in rows:
+            writer.writerow([
+                value.strftime('%d/%m/%Y') if isinstance(value, datetime)
+                else '' if value is None else value
+                for value in row])
+
+
+def _ods_cell(value):
+    if value is None:
+        return '<table:table-cell/>'
+    if isinstance(value, datetime):
+        return (f'<table:table-cell office:value-type="date" '
+                f'office:date-value="{value:%Y-%m-%d}"/>')
+    return (f'<table:table-cell office:value-type="string">'
+            f'<text:p>{value}</text:p></table:table-cell>')
+
+
+def _write_ods(path):
+    tables = []
+    for name, rows in (('Directors', DIRECTORS), ('Main', SESSIONS)):
+        xml_rows = ''.join(
+            f'<table:table-row>{"".join(_ods_cell(v) for v in row)}'
+            f'<table:table-cell table:number-columns-repeated="1000"/>'
+            f'</table:table-row>' for row in rows)
+        blank = ('<table:table-row table:number-rows-repeated="1000000">'
+                 '<table:table-cell/></table:table-row>')
+        tables.append(
+            f'<table:table table:name="{name}">{xml_rows}{blank}'
+            f'</table:table>')
+    content = (
+        '<office:document-content '
+        'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+        'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+        'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">'
+        f'<office:body><office:spreadsheet>{"".join(tables)}'
+        '</office:spreadsheet></office:body></office:document-content>')
+    with zipfile.ZipFile(path, 'w') as ods:
+        ods.writestr('content.xml', content)
+
+
+def test_readers_agree(tmp_path):
+    _write_xlsx(tmp_path / 'rota.xlsx')
+    _write_csv(tmp_path / 'rota - Directors.csv', DIRECTORS)
+    _write_csv(tmp_path / 'rota - Main.csv', SESSIONS)
+    _write_ods(tmp_path / 'rota.ods')
+
+    xlsx = XlsxReader(tmp_path / 'rota.xlsx')
+    expected = (list(xlsx.director_rows()), list(xlsx.session_rows()))
+    assert expected == (DIRECTORS, SESSIONS)
+
+    for path in (tmp_path / 'rota.xlsx', tmp_path / 'rota - Main.csv',
+                 tmp_path, tmp_path / 'rota.ods'):
+        reader = open_reader(path)
+        assert isinstance(reader, (NativeXlsxReader, CsvReader, OdsReader))
+        assert list(reader.director_rows()) == DIRECTORS
+        assert list(reader.session_rows()) == SESSIONS
+
+
+def test_native_xlsx_values(tmp_path):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = 'Main'
+    sheet.append((datetime(2025, 1, 6, 19, 30), 2.5, 3, True, None, 'x'))
+    sheet['AA1'] = 'far'
+    workbook.save(tmp_path / 'values.xlsx')
+
+    native = NativeXlsxReader(tmp_path / 'values.xlsx')
+    expected = list(XlsxReader(tmp_path / 'values.xlsx').sheet_rows('Main'))
+    assert list(native.sheet_rows('Main')) == expected
+
+
+def _rename_workbook_part(path):
+    """Move xl/workbook.xml to xl/book.xml, which openpyxl follows through
+    the package relationships but the native reader does not."""
+    with zipfile.ZipFile(path) as xlsx:
+        parts = {name: xlsx.read(name) for name in xlsx.namelist()}
+    parts['xl/book.xml'] = parts.pop('xl/workbook.xml')
+    parts['xl/_rels/book.xml.rels'] = parts.pop('xl/_rels/workbook.xml.rels')
+    for name in ('[Content_Types].xml', '_rels/.rels'):
+        parts[name] = parts[name].replace(b'/workbook.xml', b'/book.xml')
+    with zipfile.ZipFile(path, 'w') as xlsx:
+        for name, data in parts.items():
+            xlsx.writestr(name, data)
+
+
+def test_openpyxl_reads_what_the_native_reader_rejects(tmp_path):
+    path = tmp_path / 'rota.xlsx'
+    _write_xlsx(path)
+    _rename_workbook_part(path)
+
+    reader = open_reader(path)
+    assert isinstance(reader, XlsxReader)
+    assert list(reader.director_rows()) == DIRECTORS
+    assert list(reader.session_rows()) == SESSIONS
+
+
+def test_sheet_the_native_reader_cannot_parse(tmp_path, monkeypatch):
+    path = tmp_path / 'rota.xlsx'
+    _write_xlsx(path)
+
+    def broken_rows(sheet, reader, width):
+        yield (None,) * width
+        raise readers.ParseError('not well-formed')
+
+    monkeypatch.setattr(readers, '_xlsx_rows', broken_rows)
+    reader = NativeXlsxReader(path)
+    assert list(reader.session_rows()) == SESSIONS
+
+
+def test_cells_without_references_follow_the_cell_before():
+    main = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+    sheet = io.BytesIO(
+        f'<worksheet xmlns="{main}"><sheetData><row r="1">'
+        '<c r="A1"><v>1</v></c><c r="C1"><v>3</v></c><c><v>4</v></c>'
+        '</row><row><c><v>5</v></c></row></sheetData></worksheet>'
+        .encode('utf-8'))
+    reader = SimpleNamespace(shared_strings=[], date_styles=set())
+    assert list(readers._xlsx_rows(sheet, reader, 4)) == [
+        (1, None, 3, 4), (5, None, None, None)]
+
+
+def test_ods_content_is_parsed_once(tmp_path, monkeypatch):
+    _write_ods(tmp_path / 'rota.ods')
+    calls = []
+    parse = readers._ods_tables
+
+    def counted(content):
+        calls.append(content)
+        return parse(content)
+
+    monkeypatch.setattr(readers, '_ods_tables', counted)
+    reader = OdsReader(tmp_path / 'rota.ods')
+    assert reader.sheet_names() == ['Directors', 'Main']
+    assert list(reader.director_rows()) == DIRECTORS
+    assert list(reader.session_rows()) == SESSIONS
+    assert len(calls) == 1
+
+
+def test_workbooks_for_the_period_are_merged(tmp_path, monkeypatch):
+    monkeypatch.setattr(readers, 'shared_index',
+                        lambda: DateRangeIndex(tmp_path / 'index.json'))
+    years = {
+        2024: [(datetime(2024, 12, 2), 'AB', None, None, None, None),
+               (datetime(2024, 12, 30), 'CD', None,
+                datetime(2025, 1, 1), 'AB', None)],
+        2025: [(datetime(2025, 1, 6), 'AB', None,
+                datetime(2025, 1, 8), 'CD', None)],
+        2026: [(datetime(2026, 1, 5), 'CD', None, None, None, None)],
+    }
+    for year, sessions in years.items():
+        workbook = Workbook()
+        workbook.active.title = 'Directors'
+        for row in DIRECTORS:
+            workbook['Directors'].append(row)
+        workbook.create_sheet('Main')
+        for row in [SESSIONS[0]] + sessions:
+            workbook['Main'].append(row)
+        workbook.save(tmp_path / f'rota-{year}.xlsx')
+
+    # The first reader builds the index; the second is served by it
+    MultiRotaReader(tmp_path / 'rota-*.xlsx',
+                    DateRangeIndex(tmp_path / 'index.json'))
+    reader = MultiRotaReader(tmp_path / 'rota-*.xlsx',
+                             DateRangeIndex(tmp_path / 'index.json'))
+    assert not reader._readers
+    dates = Dates(datetime(2024, 12, 15), datetime(2025, 1, 7),
+                  datetime(2025, 1, 8))
+    rows = list(reader.session_rows(dates))
+
+    # Each workbook's heading row is kept, sorted before its sessions
+    assert rows == [SESSIONS[0]] * 2 + years[2024] + years[2025]
+    assert set(reader._readers) == {tmp_path / 'rota-2024.xlsx',
+                                    tmp_path / 'rota-2025.xlsx'}
+    assert isinstance(open_reader(tmp_path), MultiRotaReader)
+
+
+def _write_yearly_sheets(tmp_path, monkeypatch, extra=()):
+    monkeypatch.setattr(config, 'session_sheet_pattern', 'Main*')
+    monkeypatch.setattr(readers, 'shared_index',
+                        lambda: DateRangeIndex(tmp_path / 'index.json'))
+    workbook = Workbook()
+    workbook.active.title = 'Directors'
+    for year in (2024, 2025):
+        sheet = workbook.create_sheet(f'Main {year}')
+        sheet.append(SESSIONS[0])
+        sheet.append((datetime(year, 1, 6), 'AB', None, None, None, None))
+    for row in extra:
+        workbook['Main 2025'].append(row)
+    workbook.save(tmp_path / 'rota.xlsx')
+
+
+def test_session_sheets_outside_the_period_are_skipped(tmp_path, monkeypatch):
+    _write_yearly_sheets(tmp_path, monkeypatch)
+
+    reader = NativeXlsxReader(tmp_path / 'rota.xlsx')
+    assert reader.session_sheets() == ['Main 2024', 'Main 2025']
+    assert len(list(reader.session_rows())) == 4
+
+    dates = Dates(datetime(2025, 1, 1), datetime(2025, 3, 31),
+                  datetime(2025, 4, 1))
+    reader = NativeXlsxReader(tmp_path / 'rota.xlsx')
+    rows = list(reader.session_rows(dates))
+    assert rows[1][0] == datetime(2025, 1, 6)
+    assert list(reader._rows) == ['Main 2025']
+
+
+def test_preview_reads_only_the_period_sheets(tmp_path, monkeypatch):
+    _write_yearly_sheets(tmp_path, monkeypatch)
+    path = tmp_path / 'rota.xlsx'
+    NativeXlsxReader(path).session_sources()
+    rota = LoadedRota(path, None, NativeXlsxReader(path))
+    first = Dates(datetime(2025, 1, 1), datetime(2025, 3, 31),
+                  datetime(2025, 4, 1))
+    second = Dates(datetime(2025, 1, 6), datetime(2025, 2, 28),
+                   datetime(2025, 3, 1))
+
+    preview = rota.period_preview(first)
+    assert preview.sessions() == [(datetime(2025, 1, 6), 'AB')]
+    assert list(rota.reader._rows) == ['Main 2025']
+    assert rota.period_preview(second) is preview
+    assert len(rota.period_preview().sessions()) == 2
+
+
+def test_unchanged_sheets_keep_their_range(tmp_path, monkeypatch):
+    _write_yearly_sheets(tmp_path, monkeypatch)
+    path = tmp_path / 'rota.xlsx'
+    NativeXlsxReader(path).session_sources()
+
+    # Editing the 2025 sheet leaves the 2024 sheet's range in the index
+    _write_yearly_sheets(tmp_path, monkeypatch, extra=[
+        (datetime(2025, 1, 13), 'CD', None, None, None, None)])
+    reader = NativeXlsxReader(path)
+    dates = Dates(datetime(2025, 1, 1), datetime(2025, 3, 31),
+                  datetime(2025, 4, 1))
+    assert reader.session_sources(dates) == ('Main 2025',)
+    assert list(reader._rows) == ['Main 2025']
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+from directors_reimbursements.common import Dates
+from directors_reimbursements.config import config
+from directors_reimbursements.process import Director
+from directors_reimbursements.reconcile import (
+    DUPLICATE, MISMATCHED, MISSING, UNEXPECTED, read_transactions, reconcile)
+
+DATES = Dates(datetime(2025, 1, 1), datetime(2025, 3, 31),
+              datetime(2025, 4, 1))
+
+EXPORT = '''Date,Username,Amount
+2025-04-02 10:00:00,annb,$10.00
+2025-04-02 10:01:00,CYD@example.com,-4
+2025-04-02 10:02:00,ed,5
+2025-04-02 10:03:00,ed,5
+2025-04-02 10:04:00,stranger,3
+2024-12-02 10:04:00,fay,6
+'''
+
+
+def _directors():
+    rows = [('AB', 'Ann Bee', 'ann@example.com', 'annb'),
+            ('CD', 'Cy Dee', 'cyd@example.com', 'cyd'),
+            ('ED', 'Ed Eff', 'ed@example.com', 'ed'),
+            ('FG', 'Fay Gee', 'fay@example.com', 'fay')]
+    return {row[0]: Director(*row, [], True) for row in rows}
+
+
+def test_reconcile(tmp_path):
+    export = tmp_path / 'export.csv'
+    export.write_text(EXPORT, encoding='utf-8')
+    transactions = read_transactions(export)
+    assert len(transactions) == 6
+
+    output = [('annb', 10), ('cyd', 6), ('ed', 5), ('fay', 6)]
+    discrepancies = reconcile(output, _directors(), transactions, DATES)
+
+    issues = {(item.issue, item.username) for item in discrepancies}
+    assert issues == {(MISMATCHED, 'cyd'), (DUPLICATE, 'ed'),
+                      (MISSING, 'fay'), (UNEXPECTED, 'stranger')}
+
+
+def test_back_to_back_periods(tmp_path):
+    export = tmp_path / 'export.csv'
+    export.write_text('Date,Username,Amount\n'
+                      '2025-01-02 10:00:00,annb,7\n'
+                      '2025-04-02 10:00:00,annb,10\n', encoding='utf-8')
+    transactions = read_transactions(export)
+    previous = Dates(datetime(2024, 10, 1), datetime(2024, 12, 31),
+                     datetime(2025, 1, 1))
+
+    assert reconcile([('annb', 7)], _directors(), transactions,
+                     previous) == []
+    assert reconcile([('annb', 10)], _directors(), transactions,
+                     DATES) == []
+
+
+def test_monthly_period(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'period_months', 1)
+    export = tmp_path / 'export.csv'
+    export.write_text('Date,Username,Amount\n'
+                      '2025-02-02 10:00:00,annb,7\n'
+                      '2025-04-01 10:00:00,annb,10\n', encoding='utf-8')
+    transactions = read_transactions(export)
+    january = Dates(datetime(2025, 1, 1), datetime(2025, 1, 31),
+                    datetime(2025, 2, 1))
+    march = Dates(datetime(2025, 3, 1), datetime(2025, 3, 31),
+                  datetime(2025, 4, 1))
+
+    assert reconcile([('annb', 7)], _directors(), transactions,
+                     january) == []
+    assert reconcile([('annb', 10)], _directors(), transactions,
+                     march) == []
+
+
+def test_refund_is_not_a_payment(tmp_path):
+    export = tmp_path / 'export.csv'
+    export.write_text('Date,Username,Amount\n'
+                      '2025-04-02 10:00:00,annb,-$10.00\n', encoding='utf-8')
+    transactions = read_transactions(export)
+    assert transactions[0].amount == -10
+
+    discrepancies = reconcile([('annb', 10)], _directors(), transactions,
+                              DATES)
+    assert [(item.issue, item.paid) for item in discrepancies] == [
+        (MISMATCHED, -10)]
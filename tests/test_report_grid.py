@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from directors_reimbursements.forms.report_grid import GridColumn, GridView
+
+
+def _first_date(dates):
+    return datetime.strptime(dates.split(', ')[0], '%d %b %Y')
+
+
+COLUMNS = [
+    GridColumn('Name', 20),
+    GridColumn('Sessions', 8),
+    GridColumn('Dates directed', 60, sort_key=_first_date),
+]
+ROWS = [
+    ('cy Dee', 2, '13 Jan 2025, 15 Jan 2025'),
+    ('Ann Bee', 10, '08 Jan 2025'),
+    ('Bo Cee', 9, '06 Jan 2025, 20 Jan 2025'),
+]
+
+
+def _names(view):
+    return [ROWS[index][0] for index in view.indexes]
+
+
+@pytest.mark.parametrize('column, names', [
+    (0, ['Ann Bee', 'Bo Cee', 'cy Dee']),
+    (1, ['cy Dee', 'Bo Cee', 'Ann Bee']),
+    (2, ['Bo Cee', 'Ann Bee', 'cy Dee']),
+])
+def test_sort_by_each_column(column, names):
+    view = GridView(COLUMNS, ROWS)
+
+    view.sort(column)
+    assert _names(view) == names
+    view.sort(column, reverse=True)
+    assert _names(view) == names[::-1]
+
+
+def test_unsorted_rows_keep_their_order():
+    assert _names(GridView(COLUMNS, ROWS)) == ['cy Dee', 'Ann Bee', 'Bo Cee']
+
+
+def test_filter_keeps_the_sort_order():
+    view = GridView(COLUMNS, ROWS)
+    view.sort(0)
+
+    view.set_filter('JAN 2025, ')
+    assert _names(view) == ['Bo Cee', 'cy Dee']
+    view.set_filter('jan 2025, 1')
+    assert _names(view) == ['cy Dee']
+    view.set_filter('')
+    assert _names(view) == ['Ann Bee', 'Bo Cee', 'cy Dee']
+    view.set_filter('nobody')
+    assert view.indexes == []
@@ -0,0 +1,146 @@
+import os
+import zipfile
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook
+
+from directors_reimbursements import readers, rota as rota_module, watcher
+from directors_reimbursements.rota import (
+    cached_rota, forget_rota, load_rota, preload_error, prewarm_rota)
+from directors_reimbursements.rota_index import DateRangeIndex
+from directors_reimbursements.watcher import WorkbookWatcher
+
+WAIT = 10  # seconds
+
+
+def _write_rota(path, session_dates):
+    workbook = Workbook()
+    workbook.active.title = 'Directors'
+    workbook['Directors'].append(
+        ('Initials', 'Name', 'Email', 'Username', 'Active'))
+    workbook.create_sheet('Main')
+    workbook['Main'].append(('Date', 'Director', 'Alternate'))
+    for date in session_dates:
+        workbook['Main'].append((date, 'AB', None))
+    workbook.save(path)
+
+
+def _touch(path, seconds):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns,
+                       stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_rota_loaded_again_only_when_changed(tmp_path, monkeypatch):
+    monkeypatch.setattr(readers, 'shared_index',
+                        lambda: DateRangeIndex(tmp_path / 'index.json'))
+    path = tmp_path / 'rota.xlsx'
+    _write_rota(path, [datetime(2025, 1, 6)])
+
+    rota = load_rota(path)
+    assert load_rota(path) is rota
+    assert cached_rota(path) is rota
+
+    _write_rota(path, [datetime(2025, 1, 6), datetime(2025, 1, 13)])
+    _touch(path, 1)
+    assert cached_rota(path) is None
+    changed = load_rota(path)
+    assert changed is not rota
+    assert len(changed.period_preview().sessions()) == 2
+
+    forget_rota(path)
+    assert cached_rota(path) is None
+
+
+def test_preload_error_kept_until_the_rota_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(readers, 'shared_index',
+                        lambda: DateRangeIndex(tmp_path / 'index.json'))
+    path = tmp_path / 'rota.xlsx'
+    path.write_bytes(b'not a workbook')
+
+    with pytest.raises(zipfile.BadZipFile):
+        prewarm_rota(path)
+    assert isinstance(preload_error(path), zipfile.BadZipFile)
+
+    _write_rota(path, [datetime(2025, 1, 6)])
+    assert preload_error(path) is None
+    prewarm_rota(path)
+    assert cached_rota(path)
+    forget_rota(path)
+
+
+def test_forget_does_not_wait_for_a_parse(tmp_path, monkeypatch):
+    monkeypatch.setattr(readers, 'shared_index',
+                        lambda: DateRangeIndex(tmp_path / 'index.json'))
+    path = tmp_path / 'rota.xlsx'
+    _write_rota(path, [datetime(2025, 1, 6)])
+    parsing, release = threading.Event(), threading.Event()
+    open_reader = rota_module.open_reader
+
+    def slow_open_reader(reader_path):
+        parsing.set()
+        assert release.wait(WAIT)
+        return open_reader(reader_path)
+
+    monkeypatch.setattr(rota_module, 'open_reader', slow_open_reader)
+    loader = threading.Thread(target=load_rota, args=(path,))
+    loader.start()
+    try:
+        assert parsing.wait(WAIT)
+        started = time.monotonic()
+        forget_rota(path)
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+        loader.join(WAIT)
+    forget_rota(path)
+
+
+def test_stop_does_not_wait_for_on_change(tmp_path):
+    path = tmp_path / 'rota.xlsx'
+    _write_rota(path, [datetime(2025, 1, 6)])
+    loading, release = threading.Event(), threading.Event()
+
+    def on_change(changed):
+        loading.set()
+        release.wait(WAIT)
+
+    workbook_watcher = WorkbookWatcher(path, on_change)
+    workbook_watcher.start()
+    try:
+        assert loading.wait(WAIT)
+        started = time.monotonic()
+        workbook_watcher.stop()
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+
+
+def test_watcher_calls_on_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(watcher, '_inotify_watch', lambda directory: None)
+    monkeypatch.setattr(watcher, 'POLL_INTERVAL', 0.05)
+    monkeypatch.setattr(watcher, 'SETTLE_TIME', 0.05)
+    path = tmp_path / 'rota.xlsx'
+    _write_rota(path, [datetime(2025, 1, 6)])
+    calls = []
+    called = threading.Event()
+
+    def on_change(changed):
+        calls.append(changed)
+        called.set()
+
+    workbook_watcher = WorkbookWatcher(path, on_change)
+    workbook_watcher.start()
+    try:
+        # Called once on start, to pre-load the workbook
+        assert called.wait(WAIT)
+        called.clear()
+        _write_rota(path, [datetime(2025, 1, 13)])
+        _touch(path, 1)
+        assert called.wait(WAIT)
+    finally:
+        workbook_watcher.stop()
+    assert calls == [path, path]
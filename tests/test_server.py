@@ -0,0 +1,72 @@
+import json
+import threading
+from datetime import datetime
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from openpyxl import Workbook
+
+from directors_reimbursements.config import config
+from directors_reimbursements.server import ReimbursementServer
+
+
+def _write_rota(path):
+    workbook = Workbook()
+    workbook.active.title = 'Directors'
+    workbook['Directors'].append(('Initials', 'Name', 'Email', 'Username',
+                                  'Active'))
+    workbook['Directors'].append(('AB', 'Ann Bee', 'a@example.com', 'annb',
+                                  'y'))
+    workbook.create_sheet('Main')
+    workbook['Main'].append(('Date', 'Director', 'Alternate') * 2)
+    workbook['Main'].append((datetime(2025, 1, 6), 'AB', None,
+                             datetime(2025, 1, 8), 'AB', None))
+    workbook.save(path)
+
+
+def test_serves_reimbursements(tmp_path, monkeypatch):
+    _write_rota(tmp_path / 'rota.xlsx')
+    monkeypatch.setattr(config, 'workbook_path', str(tmp_path / 'rota.xlsx'))
+    monkeypatch.setattr(config, 'period_start_month', 1)
+    monkeypatch.setattr(config, 'period_months', 3)
+
+    server = ReimbursementServer(('127.0.0.1', 0), 2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        with urlopen(f'{url}/reimbursements?month=2025-04') as response:
+            body = json.load(response)
+        assert body['start_date'] == '2025-01-01'
+        assert [item['dates'] for item in body['directors']] == [
+            ['06 Jan 2025', '08 Jan 2025']]
+        assert body['total_dollars'] == 2 * config.payment_bbo
+
+        with urlopen(f'{url}/health') as response:
+            assert json.load(response) == {'status': 'ok'}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.parametrize('xlsx_reader', ['native', 'openpyxl'])
+def test_corrupt_workbook_is_a_json_error(tmp_path, monkeypatch, xlsx_reader):
+    (tmp_path / 'rota.xlsx').write_bytes(b'not a workbook')
+    monkeypatch.setattr(config, 'workbook_path', str(tmp_path / 'rota.xlsx'))
+    monkeypatch.setattr(config, 'xlsx_reader', xlsx_reader)
+
+    server = ReimbursementServer(('127.0.0.1', 0), 2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        with pytest.raises(HTTPError) as error:
+            urlopen(f'{url}/reimbursements?month=2025-04')
+        assert error.value.code == 422
+        assert json.load(error.value)['error'].startswith(
+            'Cannot read the rota: BadZipFile')
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,73 @@
+import importlib
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook
+
+from directors_reimbursements.common import Dates
+from directors_reimbursements.config import config, refresh_config
+from directors_reimbursements.process import calculate
+from directors_reimbursements.rota import _cache, prewarm_rota, rota_path
+from directors_reimbursements.watcher import WorkbookWatcher, follow_rota
+
+# config is the object here; its module holds CONFIG_PATH
+config_module = importlib.import_module('directors_reimbursements.config')
+
+FIRST = Dates(datetime(2025, 1, 1), datetime(2025, 3, 31),
+              datetime(2025, 4, 1))
+SECOND = Dates(datetime(2025, 4, 1), datetime(2025, 6, 30),
+               datetime(2025, 7, 1))
+
+
+@pytest.fixture(name='config_file')
+def fixture_config_file(tmp_path, monkeypatch):
+    path = tmp_path / 'config.toml'
+    monkeypatch.setattr(config_module, 'CONFIG_PATH', path)
+    saved = dict(config.__dict__)
+    yield path
+    config.__dict__.clear()
+    config.__dict__.update(saved)
+
+
+def _write_rota(path, initials, session_dates):
+    workbook = Workbook()
+    workbook.active.title = 'Directors'
+    workbook['Directors'].append(
+        ('Initials', 'Name', 'Email', 'Username', 'Active'))
+    workbook['Directors'].append(
+        (initials, f'{initials} Name', f'{initials}@example.com',
+         f'user_{initials}', 'y'))
+    workbook.create_sheet('Main')
+    workbook['Main'].append(('Date', 'Director', 'Alternate'))
+    for date in session_dates:
+        workbook['Main'].append((date, initials, None))
+    workbook.save(path)
+
+
+def _use_workbook(config_file, path):
+    config_file.write_text(
+        f'workbook_path = "{path}"\nscan_engine = "python"\n',
+        encoding='utf-8')
+    refresh_config()
+
+
+def test_workbook_changed_between_periods(tmp_path, config_file):
+    first, second = tmp_path / 'first.xlsx', tmp_path / 'second.xlsx'
+    _write_rota(first, 'AB', [datetime(2025, 1, 6)])
+    _write_rota(second, 'CD', [datetime(2025, 4, 7), datetime(2025, 4, 9)])
+
+    _use_workbook(config_file, first)
+    watcher = WorkbookWatcher(rota_path(), prewarm_rota)
+    watcher.start()
+    try:
+        output = calculate(FIRST)[3]
+        assert output == [('user_AB', 3)]
+
+        _use_workbook(config_file, second)
+        watcher = follow_rota(watcher, rota_path())
+        output = calculate(SECOND)[3]
+        assert output == [('user_CD', 6)]
+        assert watcher.path == second
+        assert first not in _cache
+    finally:
+        watcher.stop()
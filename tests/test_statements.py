@@ -0,0 +1,63 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from directors_reimbursements.config import config
+from directors_reimbursements.emails import create_message
+from directors_reimbursements.process import Director
+from directors_reimbursements import statements
+
+
+def _directors(count):
+    return [Director(f'D{index}', f'Name {index}', f'd{index}@example.com',
+                     f'user{index}', ['06 Jan 2025', '08 Jan 2025'], True)
+            for index in range(count)]
+
+
+def test_pool_and_inline_rendering_agree(monkeypatch):
+    monkeypatch.setattr(statements, 'statement_format',
+                        lambda: statements.HTML)
+    pools = []
+
+    class SpyPool(ProcessPoolExecutor):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            pools.append(kwargs)
+
+    monkeypatch.setattr(statements, 'ProcessPoolExecutor', SpyPool)
+    start_date = datetime(2025, 1, 1)
+    directors = _directors(statements.POOL_THRESHOLD)
+    pooled = statements.render_statements(directors, start_date)
+    assert len(pools) == 1
+    assert pools[0]['mp_context'].get_start_method() == 'spawn'
+    inline = statements.render_statements(directors[:2], start_date)
+    assert len(pools) == 1
+
+    assert len(pooled) == statements.POOL_THRESHOLD
+    assert inline['D1'] == pooled['D1']
+    file_name, data = pooled['D1']
+    assert file_name == 'statement_20250101_D1.html'
+    assert b'08 Jan 2025' in data
+
+
+def test_pdf_statement(monkeypatch):
+    pytest.importorskip('cairo')
+    monkeypatch.setattr(config, 'statement_format', statements.PDF)
+    assert statements.statement_format() == statements.PDF
+
+    rendered = statements.render_statements(
+        _directors(2), datetime(2025, 1, 1))
+
+    file_name, data = rendered['D1']
+    assert file_name == 'statement_20250101_D1.pdf'
+    assert data.startswith(b'%PDF')
+
+
+def test_statement_is_attached():
+    msg = create_message('Subject', 'Body', 'd1@example.com',
+                         ('statement_20250101_D1.pdf', b'%PDF-1.5'))
+    parts = msg.get_payload()
+    assert parts[0].get_payload() == 'Body'
+    assert parts[1].get_filename() == 'statement_20250101_D1.pdf'
+    assert parts[1].get_payload(decode=True) == b'%PDF-1.5'
@@ -0,0 +1,132 @@
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook
+
+from directors_reimbursements import readers
+from directors_reimbursements.common import Dates
+from directors_reimbursements.config import config
+from directors_reimbursements.process import calculate
+from directors_reimbursements.rota_index import DateRangeIndex
+from directors_reimbursements.validation import (
+    RotaProblem, RotaValidationError)
+
+DIRECTORS = [
+    ('Initials', 'Name', 'Email', 'Username', 'Active'),
+    ('AB', 'Ann Bee', 'ann@example.com', 'annb', 'y'),
+    ('CD', 'Cy Dee', None, 'cyd', 'y'),
+    ('AB', 'Ann Bee', 'ann@example.com', 'annb', 'y'),
+]
+SESSIONS = [
+    ('Date', 'Director', 'Alternate', 'Date', 'Director', 'Alternate'),
+    (datetime(2025, 1, 6), 'AB', None, datetime(2025, 1, 8), 'XY', None),
+    (None, None, None, None, None, None),
+    (datetime(2025, 1, 13), 'AB', 'ZZ', '15/01/2025', 'CD', None),
+    ('20 Jan', 'CD', None, None, None, None),
+    (datetime(2024, 1, 8), 'QQ', None, None, None, None),
+]
+DATES = Dates(datetime(2025, 1, 1), datetime(2025, 3, 31),
+              datetime(2025, 4, 1))
+
+
+@pytest.mark.parametrize('scan_engine', ['python', 'numpy'])
+def test_every_problem_is_reported(tmp_path, monkeypatch, scan_engine):
+    if scan_engine == 'numpy':
+        pytest.importorskip('numpy')
+    workbook = Workbook()
+    workbook.active.title = 'Directors'
+    for row in DIRECTORS:
+        workbook['Directors'].append(row)
+    workbook.create_sheet('Main')
+    for row in SESSIONS:
+        workbook['Main'].append(row)
+    workbook.save(tmp_path / 'rota.xlsx')
+    monkeypatch.setattr(config, 'workbook_path', str(tmp_path / 'rota.xlsx'))
+    monkeypatch.setattr(config, 'scan_engine', scan_engine)
+
+    with pytest.raises(RotaValidationError) as error:
+        calculate(DATES)
+
+    assert error.value.problems == [
+        RotaProblem('Directors', 3, 'No email for CD'),
+        RotaProblem('Directors', 4, 'Director AB is also on row 2'),
+        RotaProblem('Main', 2, 'Initials not in Directors: XY'),
+        RotaProblem('Main', 4, 'Initials not in Directors: ZZ'),
+        RotaProblem('Main', 4, "Not a date: '15/01/2025'"),
+        RotaProblem('Main', 5, "Not a date: '20 Jan'"),
+    ]
+
+
+@pytest.mark.parametrize('scan_engine', ['python', 'numpy'])
+@pytest.mark.parametrize('layout', ['workbook', 'workbooks'])
+def test_engines_and_readers_report_the_same(
+        tmp_path, monkeypatch, scan_engine, layout):
+    if scan_engine == 'numpy':
+        pytest.importorskip('numpy')
+    monkeypatch.setattr(readers, 'shared_index',
+                        lambda: DateRangeIndex(tmp_path / 'index.json'))
+    sessions = [SESSIONS[0], (datetime(2025, 1, 6), 'AB', None),
+                ('20 Jan', 'AB', None)]
+    workbook = Workbook()
+    workbook.active.title = 'Directors'
+    for row in DIRECTORS[:2]:
+        workbook['Directors'].append(row)
+    workbook.create_sheet('Main')
+    for row in sessions:
+        workbook['Main'].append(row)
+    workbook.save(tmp_path / 'rota-2025.xlsx')
+    path = tmp_path / 'rota-2025.xlsx'
+    sheet = 'Main'
+    if layout == 'workbooks':
+        path = tmp_path / 'rota-*.xlsx'
+        sheet = 'rota-2025.xlsx: Main'
+    monkeypatch.setattr(config, 'workbook_path', str(path))
+    monkeypatch.setattr(config, 'scan_engine', scan_engine)
+
+    with pytest.raises(RotaValidationError) as error:
+        calculate(DATES)
+
+    assert error.value.problems == [
+        RotaProblem(sheet, 3, "Not a date: '20 Jan'")]
+
+
+@pytest.mark.parametrize('scan_engine', ['python', 'numpy'])
+def test_heading_below_a_title_row(tmp_path, monkeypatch, scan_engine):
+    if scan_engine == 'numpy':
+        pytest.importorskip('numpy')
+    workbook = Workbook()
+    workbook.active.title = 'Directors'
+    for row in DIRECTORS[:2]:
+        workbook['Directors'].append(row)
+    workbook.create_sheet('Main')
+    for row in (('Phoenix rota 2025',), SESSIONS[0],
+                (datetime(2025, 1, 6), 'AB', None), ('20 Jan', 'AB', None)):
+        workbook['Main'].append(row)
+    workbook.save(tmp_path / 'rota.xlsx')
+    monkeypatch.setattr(config, 'workbook_path', str(tmp_path / 'rota.xlsx'))
+    monkeypatch.setattr(config, 'scan_engine', scan_engine)
+
+    with pytest.raises(RotaValidationError) as error:
+        calculate(DATES)
+
+    assert error.value.problems == [
+        RotaProblem('Main', 4, "Not a date: '20 Jan'")]
+
+
+def test_invalid_rates_are_reported(tmp_path, monkeypatch):
+    workbook = Workbook()
+    workbook.active.title = 'Directors'
+    for row in DIRECTORS[:2]:
+        workbook['Directors'].append(row)
+    workbook.create_sheet('Main')
+    for row in SESSIONS[0], (datetime(2025, 1, 6), 'AB', None):
+        workbook['Main'].append(row)
+    workbook.save(tmp_path / 'rota.xlsx')
+    monkeypatch.setattr(config, 'workbook_path', str(tmp_path / 'rota.xlsx'))
+    monkeypatch.setattr(config, 'payment_rates', {'2025-01-01': '3,50'})
+
+    with pytest.raises(RotaValidationError) as error:
+        calculate(DATES)
+
+    assert error.value.problems == [RotaProblem(
+        'payment_rates', 1, "Invalid payment rate: 2025-01-01 = '3,50'")]